@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Measures the per call time of some GLib/Gio functions with and without
+argument checks in the generated code (see pgi.set_checks()).
+"""
+
+import os
+import sys
+import subprocess
+
+
+WORKLOAD = """
+import sys
+from timeit import default_timer as timer
+import pgi
+pgi.set_backend(%(backend)r)
+from pgi.repository import GLib, Gio
+
+action = Gio.SimpleAction(name="foo")
+group = Gio.SimpleActionGroup()
+
+def bench_func():
+    GLib.random_int_range(0, 10)
+    GLib.unichar_isalpha("a")
+    GLib.unichar_digit_value("4")
+
+def bench_method():
+    action.set_enabled(True)
+    action.get_enabled()
+    group.insert(action)
+    group.remove("foo")
+
+for bench in [bench_func, bench_method]:
+    n = 20000
+    times = []
+    for i in range(5):
+        t = timer()
+        for i in range(n):
+            bench()
+        times.append((timer() - t) / n)
+    sys.stdout.write("%%s %%.9f\\n" %% (bench.__name__, min(times)))
+"""
+
+
+def _run_child(backend, checks):
+    env = dict(os.environ)
+    env.pop("PGI_NO_CHECKS", None)
+    if not checks:
+        env["PGI_NO_CHECKS"] = "1"
+    code = WORKLOAD % {"backend": backend}
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    result = []
+    for line in output.decode("ascii").splitlines():
+        name, value = line.split()
+        result.append((name, float(value)))
+    return result
+
+
+def run(backend="ctypes"):
+    print(("### PGI checks (%s) " % backend + "#" * 100)[:80])
+
+    with_checks = _run_child(backend, True)
+    without_checks = _run_child(backend, False)
+    for (name, checked), (name, trusted) in zip(with_checks, without_checks):
+        print("%20s: %6.2f µs -> %6.2f µs without checks" % (
+            name, checked * (10 ** 6), trusted * (10 ** 6)))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Measures how many functions per second the code generation handles for
+all functions and methods in GLib, GObject and Gio, once for the backends
+alone and once through generate_function() with an empty template cache.
+"""
+
+import os
+import sys
+import subprocess
+
+
+WORKLOAD = """
+import sys, time
+import pgi
+pgi.set_backend(%(backend)r)
+from pgi.repository import GLib, GObject, Gio
+from pgi.clib.gir import GIRepository, GIInfoType
+from pgi.codegen.funcgen import generate_function, _generate_with_backends
+from pgi.codegen.templates import template_cache
+
+items = []
+repo = GIRepository()
+for namespace in ["GLib", "GObject", "Gio"]:
+    for info in repo.get_infos(namespace):
+        type_ = info.type.value
+        if type_ in (GIInfoType.OBJECT, GIInfoType.INTERFACE,
+                     GIInfoType.STRUCT, GIInfoType.UNION):
+            items.extend((m, m.is_method) for m in info.get_methods())
+        elif type_ == GIInfoType.FUNCTION:
+            items.append((info, False))
+
+prepared = []
+for info, method in items:
+    arg_infos = list(info.get_args())
+    prepared.append((info, arg_infos, [a.get_type() for a in arg_infos],
+                     info.get_return_type(), method))
+
+def raw():
+    for args in prepared:
+        try:
+            _generate_with_backends(*args)
+        except NotImplementedError:
+            pass
+
+def full():
+    template_cache.clear()
+    for info, method in items:
+        try:
+            generate_function(info, method)
+        except NotImplementedError:
+            pass
+
+for func in [raw, full]:
+    times = []
+    for i in range(3):
+        t = time.time()
+        func()
+        times.append(time.time() - t)
+    sys.stdout.write("%%f " %% (len(items) / min(times)))
+"""
+
+
+def run(backend="ctypes"):
+    print(("### PGI codegen (%s) " % backend + "#" * 100)[:80])
+
+    env = dict(os.environ)
+    env.pop("PGI_CACHE_DIR", None)
+    code = WORKLOAD % {"backend": backend}
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    raw, full = [float(v) for v in output.split()]
+
+    print("%20s: %6.0f funcs/s" % ("backends", raw))
+    print("%20s: %6.0f funcs/s" % ("generate_function", full))
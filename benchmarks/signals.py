@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Measures the time for emitting a signal with one handler compared to
+calling that handler directly, and for connecting and disconnecting one.
+"""
+
+import sys
+import subprocess
+
+
+WORKLOAD = """
+import sys
+from timeit import default_timer as timer
+import pgi
+pgi.set_backend(%(backend)r)
+from pgi.repository import Gio
+
+menu = Gio.Menu()
+
+def handler(menu, position, removed, added):
+    pass
+
+menu.connect("items-changed", handler)
+
+def bench_call():
+    handler(menu, 0, 0, 1)
+
+def bench_emit():
+    menu.emit("items-changed", 0, 0, 1)
+
+def bench_connect():
+    menu.disconnect(menu.connect("items-changed", handler))
+
+for bench in [bench_call, bench_emit, bench_connect]:
+    n = 20000
+    times = []
+    for i in range(5):
+        t = timer()
+        for i in range(n):
+            bench()
+        times.append((timer() - t) / n)
+    sys.stdout.write("%%s %%.9f\\n" %% (bench.__name__, min(times)))
+"""
+
+
+def run(backend="ctypes"):
+    print(("### PGI signals (%s) " % backend + "#" * 100)[:80])
+
+    code = WORKLOAD % {"backend": backend}
+    output = subprocess.check_output([sys.executable, "-c", code])
+    for line in output.decode("ascii").splitlines():
+        name, value = line.split()
+        print("%20s: %6.2f µs" % (name, float(value) * (10 ** 6)))
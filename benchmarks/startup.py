@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Measures the time a new process needs to import Gio and access all
+methods of its classes, without the on-disk function cache, with an empty
+cache, with a populated one and with modules created by pgi-compile.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+
+WORKLOAD = """
+import sys, time
+t = time.time()
+import pgi
+pgi.set_backend(%(backend)r)
+from pgi.repository import Gio
+for name in dir(Gio):
+    cls = getattr(Gio, name, None)
+    if not isinstance(cls, type):
+        continue
+    for attr in list(vars(cls)):
+        try:
+            getattr(cls, attr)
+        except Exception:
+            pass
+sys.stdout.write("%%f" %% (time.time() - t))
+"""
+
+
+def _run_child(backend, cache_dir, compiled_dir=None):
+    env = dict(os.environ)
+    env.pop("PGI_CACHE_DIR", None)
+    if cache_dir is not None:
+        env["PGI_CACHE_DIR"] = cache_dir
+    if compiled_dir is not None:
+        env["PYTHONPATH"] = os.pathsep.join(
+            [compiled_dir] + env.get("PYTHONPATH", "").split(os.pathsep))
+    code = WORKLOAD % {"backend": backend}
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    return float(output.strip())
+
+
+def run(backend="ctypes"):
+    print(("### PGI startup (%s) " % backend + "#" * 100)[:80])
+
+    cache_dir = tempfile.mkdtemp()
+    compiled_dir = tempfile.mkdtemp()
+    try:
+        for name, path in [("no cache", None), ("cold cache", cache_dir),
+                           ("warm cache", cache_dir)]:
+            t = _run_child(backend, path)
+            print("%20s: %6.2f ms" % (name, t * (10 ** 3)))
+
+        subprocess.check_call(
+            [sys.executable, "-c", "import pgi.compiler as c; c.main()",
+             "-o", compiled_dir, "-b", backend,
+             "GLib-2.0", "GObject-2.0", "Gio-2.0"],
+            stdout=subprocess.PIPE)
+        t = _run_child(backend, None, compiled_dir)
+        print("%20s: %6.2f ms" % ("pgi-compile", t * (10 ** 3)))
+    finally:
+        shutil.rmtree(cache_dir)
+        shutil.rmtree(compiled_dir)
@@ -8,7 +8,10 @@
 from . import const
 from ._compat import iterkeys, string_types
 from .importer import require_version, get_required_version
-from .codegen import set_backend
+from .codegen import set_backend, set_checks, set_cache_dir
+from .codegen import set_array_return, set_lazy_lists
+from .codegen import record_profile, replay_profile
+from .obj import warmup, start_warmup
 from .foreign import require_foreign
 from .util import PyGIDeprecationWarning, PyGIWarning
 
@@ -16,6 +19,14 @@ from .util import PyGIDeprecationWarning, PyGIWarning
 require_version = require_version
 get_required_version = get_required_version
 set_backend = set_backend
+set_checks = set_checks
+set_array_return = set_array_return
+set_lazy_lists = set_lazy_lists
+set_cache_dir = set_cache_dir
+record_profile = record_profile
+replay_profile = replay_profile
+warmup = warmup
+start_warmup = start_warmup
 require_foreign = require_foreign
 PyGIDeprecationWarning = PyGIDeprecationWarning
 PyGIWarning = PyGIWarning
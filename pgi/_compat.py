@@ -72,3 +72,9 @@ elif PY2:
     builtins = builtins
 else:
     assert 0
+
+
+def with_metaclass(meta, *bases):
+    """Returns a base class to inherit from for using meta as metaclass"""
+
+    return meta("NewBase", bases, {})
@@ -254,6 +254,120 @@ _methods = [
 wrap_class(_glib, GList, GListPtr, "g_list_", _methods)
 
 
+class GArray(Structure):
+    _fields_ = [
+        ("data", gpointer),
+        ("len", guint),
+    ]
+
+
+class GArrayPtr(POINTER(GArray)):
+    _type_ = GArray
+
+_methods = [
+    ("sized_new", GArrayPtr, [gboolean, gboolean, guint, guint]),
+    ("append_vals", GArrayPtr, [GArrayPtr, gconstpointer, guint]),
+    ("ref", GArrayPtr, [GArrayPtr]),
+    ("unref", None, [GArrayPtr]),
+    ("get_element_size", guint, [GArrayPtr]),
+]
+
+wrap_class(_glib, GArray, GArrayPtr, "g_array_", _methods)
+
+
+class GByteArray(Structure):
+    _fields_ = [
+        ("data", gpointer),
+        ("len", guint),
+    ]
+
+
+class GByteArrayPtr(POINTER(GByteArray)):
+    _type_ = GByteArray
+
+_methods = [
+    ("sized_new", GByteArrayPtr, [guint]),
+    ("append", GByteArrayPtr, [GByteArrayPtr, gconstpointer, guint]),
+    ("ref", GByteArrayPtr, [GByteArrayPtr]),
+    ("unref", None, [GByteArrayPtr]),
+]
+
+wrap_class(_glib, GByteArray, GByteArrayPtr, "g_byte_array_", _methods)
+
+
+class GPtrArray(Structure):
+    _fields_ = [
+        ("pdata", POINTER(gpointer)),
+        ("len", guint),
+    ]
+
+
+class GPtrArrayPtr(POINTER(GPtrArray)):
+    _type_ = GPtrArray
+
+_methods = [
+    ("sized_new", GPtrArrayPtr, [guint]),
+    ("new_full", GPtrArrayPtr, [guint, gpointer]),
+    ("add", None, [GPtrArrayPtr, gpointer]),
+    ("ref", GPtrArrayPtr, [GPtrArrayPtr]),
+    ("unref", None, [GPtrArrayPtr]),
+]
+
+wrap_class(_glib, GPtrArray, GPtrArrayPtr, "g_ptr_array_", _methods)
+
+
+# function pointers for creating hash tables
+g_str_hash = cast(_glib.g_str_hash, gpointer)
+g_str_equal = cast(_glib.g_str_equal, gpointer)
+g_direct_hash = cast(_glib.g_direct_hash, gpointer)
+g_direct_equal = cast(_glib.g_direct_equal, gpointer)
+g_free_ptr = cast(_glib.g_free, gpointer)
+
+
+class GHashTable(Structure):
+    pass
+
+
+class GHashTablePtr(POINTER(GHashTable)):
+    _type_ = GHashTable
+
+_methods = [
+    ("new_full", GHashTablePtr, [gpointer, gpointer, gpointer, gpointer]),
+    ("insert", gboolean, [GHashTablePtr, gpointer, gpointer]),
+    ("lookup_extended", gboolean,
+     [GHashTablePtr, gconstpointer, POINTER(gpointer), POINTER(gpointer)]),
+    ("size", guint, [GHashTablePtr]),
+    ("ref", GHashTablePtr, [GHashTablePtr]),
+    ("unref", None, [GHashTablePtr]),
+]
+
+wrap_class(_glib, GHashTable, GHashTablePtr, "g_hash_table_", _methods)
+
+
+class GHashTableIter(Structure):
+    _fields_ = [
+        ("dummy1", gpointer),
+        ("dummy2", gpointer),
+        ("dummy3", gpointer),
+        ("dummy4", gint),
+        ("dummy5", gboolean),
+        ("dummy6", gpointer),
+    ]
+
+
+class GHashTableIterPtr(POINTER(GHashTableIter)):
+    _type_ = GHashTableIter
+
+_methods = [
+    ("init", None, [GHashTableIterPtr, GHashTablePtr]),
+    ("next", gboolean,
+     [GHashTableIterPtr, POINTER(gpointer), POINTER(gpointer)]),
+]
+
+wrap_class(_glib, GHashTableIter, GHashTableIterPtr, "g_hash_table_iter_",
+           _methods)
+
+
 class GErrorError(Exception):
 
     def __init__(self, gerror):
@@ -333,4 +447,8 @@ __all__ = ["gchar_p", "guint", "gpointer", "gint32", "guint32", "gint",
            "GMappedFile", "GMappedFilePtr", "gconstpointer", "g_malloc0",
            "GOptionGroup", "GOptionGroupPtr", "gunichar",
            "GSList", "GSListPtr", "GErrorError", "gerror", "unpack_glist",
-           "GList", "GListPtr"]
+           "GList", "GListPtr", "GArray", "GArrayPtr", "GByteArray",
+           "GByteArrayPtr", "GPtrArray", "GPtrArrayPtr", "GHashTable",
+           "GHashTablePtr", "GHashTableIter", "GHashTableIterPtr",
+           "g_str_hash", "g_str_equal", "g_direct_hash", "g_direct_equal",
+           "g_free_ptr"]
@@ -8,8 +8,9 @@
 from ctypes import POINTER, Structure, CFUNCTYPE
 
 from .glib import Flags, gulong, gchar_p, guint, gboolean, gpointer, guint32
+from .glib import gint8
 from .glib import guint64, gchar, guchar, gint, glong, gint64, gfloat
-from .glib import gdouble
+from .glib import gdouble, GQuark
 from ._utils import find_library, wrap_class
 
 _gobject = find_library("gobject-2.0")
@@ -262,6 +263,66 @@ _methods = [
 wrap_class(_gobject, GValue, GValuePtr, "g_value_", _methods)
 
 
+def _get_value_function(name, restype, argtypes):
+    # a new function object, so the GValuePtr methods keep their argtypes
+    func = _gobject["g_value_" + name]
+    func.argtypes = argtypes
+    func.restype = restype
+    return func
+
+
+# Accessors taking the GValue address, by fundamental type name
+_values = [
+    ("gchar", "schar", gint8),
+    ("guchar", "uchar", guchar),
+    ("gboolean", "boolean", gboolean),
+    ("gint", "int", gint),
+    ("guint", "uint", guint),
+    ("glong", "long", glong),
+    ("gulong", "ulong", gulong),
+    ("gint64", "int64", gint64),
+    ("guint64", "uint64", guint64),
+    ("gfloat", "float", gfloat),
+    ("gdouble", "double", gdouble),
+    ("GEnum", "enum", gint),
+    ("GFlags", "flags", guint),
+    ("gchararray", "string", gchar_p),
+]
+
+value_getters = {}
+value_setters = {}
+for _name, _suffix, _type in _values:
+    value_getters[_name] = _get_value_function(
+        "get_" + _suffix, _type, [gpointer])
+    value_setters[_name] = _get_value_function(
+        "set_" + _suffix, None, [gpointer, _type])
+
+value_peek_pointer = _get_value_function("peek_pointer", gpointer, [gpointer])
+for _name, _suffix in [("gpointer", "pointer"), ("GBoxed", "boxed"),
+                       ("GParam", "param"), ("GObject", "object"),
+                       ("GInterface", "object"), ("GVariant", "variant")]:
+    value_getters[_name] = value_peek_pointer
+    value_setters[_name] = _get_value_function(
+        "set_" + _suffix, None, [gpointer, gpointer])
+
+value_init = _get_value_function("init", gpointer, [gpointer, GType])
+value_unset = _get_value_function("unset", None, [gpointer])
+value_get_gtype = _get_value_function("get_gtype", GType, [gpointer])
+value_set_gtype = _get_value_function("set_gtype", None, [gpointer, GType])
+value_dup_boxed = _get_value_function("dup_boxed", gpointer, [gpointer])
+value_dup_variant = _get_value_function("dup_variant", gpointer, [gpointer])
+
+del _name, _suffix, _type, _values
+
+
+object_set_property = _gobject["g_object_set_property"]
+object_set_property.argtypes = [gpointer, gchar_p, gpointer]
+object_set_property.restype = None
+
+object_get_property = _gobject["g_object_get_property"]
+object_get_property.argtypes = [gpointer, gchar_p, gpointer]
+object_get_property.restype = None
+
 set_property = _gobject.g_object_set_property
 set_property.argtypes = [gpointer, gchar_p, GValuePtr]
 set_property.restype = None
@@ -300,6 +361,8 @@ class GParameterPtr(POINTER(GParameter)):
     _type_ = GParameter
 
 
+GDestroyNotify = CFUNCTYPE(None, gpointer)
+
 _methods = [
     ("newv", gpointer, [GType, guint, GParameterPtr]),
     ("new", gpointer, []),
@@ -307,6 +370,10 @@ _methods = [
     ("ref_sink", gpointer, [gpointer]),
     ("ref", gpointer, [gpointer]),
     ("is_floating", gboolean, [gpointer]),
+    ("get_qdata", gpointer, [gpointer, GQuark]),
+    ("set_qdata_full", None, [gpointer, GQuark, gpointer, GDestroyNotify]),
+    ("freeze_notify", None, [gpointer]),
+    ("thaw_notify", None, [gpointer]),
 ]
 
 for (name, ret, args) in _methods:
@@ -315,6 +382,18 @@ for (name, ret, args) in _methods:
     h.restype = ret
     globals()[name] = h
 
+try:
+    object_getv = _gobject["g_object_getv"]
+    object_setv = _gobject["g_object_setv"]
+except AttributeError:
+    # GLib < 2.54
+    object_getv = object_setv = None
+else:
+    object_getv.argtypes = [gpointer, guint, POINTER(gchar_p), gpointer]
+    object_getv.restype = None
+    object_setv.argtypes = [gpointer, guint, POINTER(gchar_p), gpointer]
+    object_setv.restype = None
+
 
 _methods = [
     ("find_property", GParamSpecPtr, [GObjectClassPtr, gchar_p]),
@@ -361,10 +440,44 @@ signal_connect_data.argtypes = [gpointer, gchar_p, GCallback, gpointer,
                                 GClosureNotify, GConnectFlags]
 signal_connect_data.restype = gulong
 
+
+class GClosure(Structure):
+    _fields_ = [
+        ("flags", guint32),
+        ("marshal", gpointer),
+        ("data", gpointer),
+        ("notifiers", gpointer),
+    ]
+
+
+GClosureMarshal = CFUNCTYPE(
+    None, gpointer, gpointer, guint, gpointer, gpointer, gpointer)
+
+closure_new_simple = _gobject.g_closure_new_simple
+closure_new_simple.argtypes = [guint, gpointer]
+closure_new_simple.restype = gpointer
+
+closure_set_marshal = _gobject.g_closure_set_marshal
+closure_set_marshal.argtypes = [gpointer, GClosureMarshal]
+closure_set_marshal.restype = None
+
+closure_add_finalize_notifier = _gobject.g_closure_add_finalize_notifier
+closure_add_finalize_notifier.argtypes = [gpointer, gpointer, GClosureNotify]
+closure_add_finalize_notifier.restype = None
+
+signal_connect_closure_by_id = _gobject.g_signal_connect_closure_by_id
+signal_connect_closure_by_id.argtypes = [gpointer, guint, GQuark, gpointer,
+                                         gboolean]
+signal_connect_closure_by_id.restype = gulong
+
 signal_handler_disconnect = _gobject.g_signal_handler_disconnect
 signal_handler_disconnect.argtypes = [gpointer, gulong]
 signal_handler_disconnect.restype = None
 
+signal_handler_is_connected = _gobject.g_signal_handler_is_connected
+signal_handler_is_connected.argtypes = [gpointer, gulong]
+signal_handler_is_connected.restype = gboolean
+
 signal_handler_block = _gobject.g_signal_handler_block
 signal_handler_block.argtypes = [gpointer, gulong]
 signal_handler_block.restype = None
@@ -373,6 +486,10 @@ signal_handler_unblock = _gobject.g_signal_handler_unblock
 signal_handler_unblock.argtypes = [gpointer, gulong]
 signal_handler_unblock.restype = None
 
+signal_emitv = _gobject.g_signal_emitv
+signal_emitv.argtypes = [gpointer, guint, GQuark, gpointer]
+signal_emitv.restype = None
+
 signal_lookup = _gobject.g_signal_lookup
 signal_lookup.argtypes = [gchar_p, GType]
 signal_lookup.restype = guint
@@ -385,7 +502,7 @@ boxed_type_register_static.restype = GType
 
 strv_get_type = _gobject.g_strv_get_type
 strv_get_type.argtypes = []
-signal_lookup.restype = GType
+strv_get_type.restype = GType
 
 g_type_init()
 strv_get_type()
@@ -395,11 +512,19 @@ __all__ = ["GType", "g_type_init", "GParamFlags", "GValue", "GValuePtr",
            "GTypeFundamentalFlags", "GObjectPtr", "GParamSpec",
            "GParamSpecPtr", "GObjectClassPtr", "G_TYPE_FROM_INSTANCE",
            "GParameterPtr", "signal_connect_data", "GCallback",
+           "signal_connect_closure_by_id", "GClosure",
+           "GClosureMarshal", "closure_new_simple", "closure_set_marshal",
+           "closure_add_finalize_notifier", "signal_handler_is_connected",
+           "value_getters", "value_setters", "value_peek_pointer",
+           "value_init", "value_unset", "signal_emitv", "value_get_gtype",
+           "value_set_gtype", "value_dup_boxed", "value_dup_variant",
+           "object_set_property", "object_get_property", "object_getv",
+           "object_setv",
            "GClosureNotify", "signal_handler_disconnect", "GConnectFlags",
            "signal_handler_unblock", "signal_handler_block", "signal_lookup",
            "GTypeInterface", "GTypeInterfacePtr", "boxed_type_register_static",
            "GBoxedCopyFunc", "GBoxedFreeFunc", "GEnumClassPtr", "GEnumValue",
            "GEnumClass", "GEnumValue", "GFlagsClass", "GFlagsClassPtr",
            "GFlagsValue", "GFlagsValuePtr", "signal_query",
-           "GSignalQuery",
+           "GSignalQuery", "GDestroyNotify",
            ]
@@ -0,0 +1,241 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Signal marshalling between Python and GValues.
+
+Every handler gets a plain GClosure using the one marshaller below. The
+Python function is looked up by the closure address and dropped once GLib
+finalizes the closure, e.g. on disconnect or when the instance goes away.
+
+emit() goes the other way and packs the Python arguments into GValues for
+g_signal_emitv().
+"""
+
+import ctypes
+
+from .clib.gobject import GClosure, GClosureMarshal, GClosureNotify, GValue
+from .clib.gobject import GSignalQuery, GType, signal_query, signal_emitv
+from .clib.gobject import closure_new_simple, closure_set_marshal
+from .clib.gobject import closure_add_finalize_notifier
+from .clib.gobject import value_getters, value_setters, value_peek_pointer
+from .clib.gobject import value_init, value_unset
+from .codegen.ctypes_backend.utils import typeinfo_to_ctypes
+from .gtype import PGType
+from .gvalue import get_packer, get_unpacker
+from .wrapper import get_wrapper, _keep_alive
+
+
+_VALUE_SIZE = ctypes.sizeof(GValue)
+_CLOSURE_SIZE = ctypes.sizeof(GClosure)
+# G_SIGNAL_TYPE_STATIC_SCOPE
+_STATIC_SCOPE = 1
+
+# closure address -> (function, converters, setter)
+_handlers = {}
+# signal id -> (converters, setter)
+_marshallers = {}
+# signal id -> GSignalQuery
+_queries = {}
+# signal id -> (instance type, packers, return type, unpacker)
+_emitters = {}
+
+
+def _get_query(signal_id):
+    try:
+        return _queries[signal_id]
+    except KeyError:
+        query = GSignalQuery()
+        signal_query(signal_id, query)
+        return _queries.setdefault(signal_id, query)
+
+
+def _get_converter(gtype, ctype):
+    """Returns a function taking a GValue address and returning what a
+    ctypes callback with an argument of ctype would get.
+    """
+
+    name = PGType(GType(gtype)).fundamental.name
+    try:
+        getter = value_getters[name]
+    except KeyError:
+        raise NotImplementedError("%r signal argument not supported" % name)
+
+    if ctype is None or ctype.__bases__[0] is ctypes._SimpleCData:
+        return getter
+    elif issubclass(ctype, ctypes._SimpleCData):
+        return lambda address: ctype(getter(address))
+    else:
+        return lambda address: ctypes.cast(getter(address), ctype)
+
+
+def _get_unpacker(gtype):
+    """Like get_unpacker(), but objects don't get a new reference, like
+    for signals with introspection info.
+    """
+
+    name = PGType(GType(gtype)).fundamental.name
+    if name in ("GObject", "GInterface"):
+        def unpack(address):
+            value = value_peek_pointer(address)
+            if value:
+                return get_wrapper(value)
+        return unpack
+    return get_unpacker(gtype)
+
+
+def get_marshaller(signal_id, info):
+    """Returns the argument converters and the return value setter for
+    a signal.
+
+    If info is None the arguments get converted to Python values using
+    the GTypes of the signal, otherwise to what the callback generated for
+    info expects.
+
+    Can raise NotImplementedError.
+    """
+
+    try:
+        return _marshallers[signal_id]
+    except KeyError:
+        pass
+
+    query = _get_query(signal_id)
+
+    converters = []
+    if info is None:
+        for i in range(query.n_params):
+            gtype = query.param_types[i].value & ~_STATIC_SCOPE
+            # the first value is the instance
+            offset = (i + 1) * _VALUE_SIZE
+            converters.append((offset, _get_unpacker(gtype)))
+    else:
+        arg_types = [
+            typeinfo_to_ctypes(a.get_type()) for a in info.get_args()]
+        if len(arg_types) != query.n_params:
+            raise NotImplementedError("signal arguments don't match")
+
+        for i, ctype in enumerate(arg_types):
+            gtype = query.param_types[i].value & ~_STATIC_SCOPE
+            offset = (i + 1) * _VALUE_SIZE
+            converters.append((offset, _get_converter(gtype, ctype)))
+
+    setter = None
+    return_gtype = PGType(GType(query.return_type.value & ~_STATIC_SCOPE))
+    if return_gtype.name != "void":
+        if info is None:
+            setter = get_packer(return_gtype._type.value)
+        else:
+            name = return_gtype.fundamental.name
+            try:
+                setter = value_setters[name]
+            except KeyError:
+                raise NotImplementedError(
+                    "%r signal return not supported" % name)
+
+    marshaller = (tuple(converters), setter)
+    return _marshallers.setdefault(signal_id, marshaller)
+
+
+def _marshal(closure, return_value, n_param_values, param_values, hint,
+             data):
+    func, converters, setter = _handlers[closure]
+    args = [convert(param_values + offset) for offset, convert in converters]
+    result = func(value_peek_pointer(param_values), *args)
+    if setter is not None and return_value and result is not None:
+        setter(return_value, result)
+
+
+_marshal = _keep_alive(GClosureMarshal(_marshal))
+
+
+def _finalize(data, closure, _pop=_handlers.pop):
+    # can get called at exit, after the module globals are cleared
+    _pop(closure, None)
+
+
+_finalize = _keep_alive(GClosureNotify(_finalize))
+
+
+def new_closure(func, marshaller):
+    """Returns a new floating GClosure address which calls func with the
+    instance address and the converted signal arguments. marshaller is
+    the result of get_marshaller().
+    """
+
+    closure = closure_new_simple(_CLOSURE_SIZE, None)
+    converters, setter = marshaller
+    _handlers[closure] = (func, converters, setter)
+    closure_set_marshal(closure, _marshal)
+    closure_add_finalize_notifier(closure, None, _finalize)
+    return closure
+
+
+def _get_emitter(signal_id):
+    try:
+        return _emitters[signal_id]
+    except KeyError:
+        pass
+
+    query = _get_query(signal_id)
+    packers = []
+    for i in range(query.n_params):
+        gtype = query.param_types[i].value & ~_STATIC_SCOPE
+        packers.append((GType(gtype), get_packer(gtype)))
+
+    return_type = GType(query.return_type.value & ~_STATIC_SCOPE)
+    unpacker = get_unpacker(return_type.value)
+    emitter = (query.itype, tuple(packers), return_type, unpacker)
+    return _emitters.setdefault(signal_id, emitter)
+
+
+def emit(instance, signal_id, detail, args):
+    """Emits the signal on the GObject at address instance and returns the
+    return value of the emission.
+
+    Raises TypeError in case the arguments don't match and
+    NotImplementedError in case a type isn't supported.
+    """
+
+    itype, packers, return_type, unpacker = _get_emitter(signal_id)
+    if len(args) != len(packers):
+        raise TypeError("%s() takes exactly %d argument(s) (%d given)" % (
+            _get_query(signal_id).signal_name.decode("utf-8"),
+            len(packers), len(args)))
+
+    values = (GValue * (len(packers) + 1))()
+    base = address = ctypes.addressof(values)
+    try:
+        value_init(address, itype)
+        value_setters["GObject"](address, instance)
+        for (gtype, pack), arg in zip(packers, args):
+            address += _VALUE_SIZE
+            value_init(address, gtype)
+            pack(address, arg)
+
+        if unpacker is None:
+            signal_emitv(base, signal_id, detail, None)
+            return
+
+        result = GValue()
+        result_address = ctypes.addressof(result)
+        value_init(result_address, return_type)
+        try:
+            signal_emitv(base, signal_id, detail, result_address)
+            return unpacker(result_address)
+        finally:
+            value_unset(result_address)
+    finally:
+        # only unset the ones we got to initialize
+        for i, value in enumerate(values):
+            if value.g_type.value:
+                value_unset(base + i * _VALUE_SIZE)
+
+
+def get_handler_count():
+    """Returns the number of alive closures"""
+
+    return len(_handlers)
@@ -5,16 +5,28 @@
 # License as published by the Free Software Foundation; either
 # version 2.1 of the License, or (at your option) any later version.
 
-from .backend import set_backend
+from .backend import set_backend, set_checks, set_array_return
+from .backend import set_lazy_lists
+from .cache import set_cache_dir
+from .profile import record_profile, replay_profile
 from .funcgen import generate_function, generate_dummy_callable
+from .funcgen import generate_functions
 from .construct import generate_constructor
 from .siggen import generate_signal_callback, generate_callback_wrapper
 from .fieldgen import generate_field_getter, generate_field_setter
 from .fieldgen import get_field_type
+from .propgen import generate_property_getter, generate_property_setter
 
 
 set_backend = set_backend
+set_checks = set_checks
+set_array_return = set_array_return
+set_lazy_lists = set_lazy_lists
+set_cache_dir = set_cache_dir
+record_profile = record_profile
+replay_profile = replay_profile
 generate_function = generate_function
+generate_functions = generate_functions
 generate_constructor = generate_constructor
 generate_signal_callback = generate_signal_callback
 generate_callback_wrapper = generate_callback_wrapper
@@ -22,6 +34,8 @@ get_field_type = get_field_type
 generate_dummy_callable = generate_dummy_callable
 generate_field_setter = generate_field_setter
 generate_field_getter = generate_field_getter
+generate_property_getter = generate_property_getter
+generate_property_setter = generate_property_setter
 
 from .backend import init_backends
 init_backends()
@@ -10,7 +10,6 @@ from pgi.clib.gir import GITransfer
 from pgi.clib.gobject import GCallback
 from pgi.gtype import PGType
 from pgi.gerror import PGError
-from pgi.util import import_attribute
 from pgi import _compat
 
 
@@ -203,17 +202,45 @@ class ArrayArgument(GIArgument):
 
 
 class GArrayArgument(ArrayArgument):
-    pass
 
+    def pre_call(self):
+        if self.is_direction_inout() or self.is_caller_allocates():
+            raise NotImplementedError("inout or caller allocated array")
 
-class ByteArrayArgument(ArrayArgument):
-    pass
+        var = self.get_type()
+        if self.is_direction_in():
+            self.call_var = var.pack(var.check(self.name))
+        else:
+            self._data = var.new()
+            self.call_var = var.get_reference(self._data)
+        return var.block
+
+    def post_call(self):
+        var = self.get_type()
+        if self.is_direction_in():
+            if self.transfer_nothing():
+                var.free(self.call_var)
+        else:
+            self.out_var = var.unpack(self._data, not self.transfer_nothing())
+        return var.block
 
 
-class PtrArrayArgument(ArrayArgument):
+class ByteArrayArgument(GArrayArgument):
     pass
 
 
+class PtrArrayArgument(GArrayArgument):
+
+    def pre_call(self):
+        if not self.is_direction_in() or self.is_direction_inout():
+            return super(PtrArrayArgument, self).pre_call()
+
+        var = self.get_type()
+        self.call_var = var.pack(
+            var.check(self.name), self.transfer_everything())
+        return var.block
+
+
 class CArrayArgument(ArrayArgument):
 
     def setup(self):
@@ -239,10 +266,14 @@ class CArrayArgument(ArrayArgument):
         elif self.is_direction_in():
             checked = var.check(self.name)
             if self.type.array_length != -1:
-                self.call_var, length = var.pack_in(checked, self._aux.type)
+                self.call_var, length = var.pack_in(
+                    checked, self._aux.type, buffer=self.transfer_nothing())
                 self._aux.call_var = length
             else:
-                self.call_var, dummy = var.pack_in(checked, None)
+                self.call_var, dummy = var.pack_in(
+                    checked, None, buffer=self.transfer_nothing())
+            if not self.transfer_nothing():
+                self.call_var = var.dup(checked, self.call_var)
             return var.block
         else:
             if self.type.array_length != -1:
@@ -258,10 +289,13 @@ class CArrayArgument(ArrayArgument):
             return
 
         var = self.get_type()
+        # fixed size arrays get allocated by us
+        own = not self.transfer_nothing() and \
+            self.type.array_fixed_size == -1
         if self.type.array_length != -1:
-            self.out_var = var.unpack(self._data, self._length)
+            self.out_var = var.unpack(self._data, self._length, own)
         else:
-            self.out_var = var.unpack(self._data, None)
+            self.out_var = var.unpack(self._data, None, own)
         return var.block
 
 
@@ -270,12 +304,10 @@ class BaseInterfaceArgument(GIArgument):
     py_type = object
 
     def setup(self):
+        # only used for docs, use the name so we don't have to import
+        # the class here
         iface = self.type.get_interface()
-        try:
-            self.py_type = import_attribute(iface.namespace, iface.name)
-        except ImportError:
-            # fall back to object
-            pass
+        self.py_type = "%s.%s" % (iface.namespace, iface.name)
 
     @classmethod
     def get_class(cls, type_):
@@ -539,27 +571,28 @@ class GListArgument(GIArgument):
         self.py_type = [self.get_param_type(0).py_type]
 
     def pre_call(self):
+        var = self.get_type()
         if self.is_direction_in():
-            var = self.get_type()
             self.call_var = var.pack(self.name)
-            return var.block
         else:
-            # FIXME
-            return
+            self._data = var.new()
+            self.call_var = var.get_reference(self._data)
+        return var.block
 
     def post_call(self):
         var = self.get_type()
-        if self.transfer_nothing():
-            var.free(self.call_var)
+        if self.is_direction_in():
+            if self.transfer_nothing():
+                var.free(self.call_var)
+        else:
+            self.out_var = var.unpack(
+                self._data, not self.transfer_nothing(),
+                self.transfer_everything())
         return var.block
 
 
-class GSListArgument(GIArgument):
+class GSListArgument(GListArgument):
     TAG = GITypeTag.GSLIST
-    py_type = list
-
-    def setup(self):
-        self.py_type = [self.get_param_type(0).py_type]
 
 
 class GHashArgument(GIArgument):
@@ -570,6 +603,27 @@ class GHashArgument(GIArgument):
         self.py_type = {
             self.get_param_type(0).py_type: self.get_param_type(1).py_type}
 
+    def pre_call(self):
+        if self.is_direction_inout() or self.is_caller_allocates():
+            raise NotImplementedError("inout or caller allocated hash table")
+
+        var = self.get_type()
+        if self.is_direction_in():
+            self.call_var = var.pack(var.check(self.name))
+        else:
+            self._data = var.new()
+            self.call_var = var.get_reference(self._data)
+        return var.block
+
+    def post_call(self):
+        var = self.get_type()
+        if self.is_direction_in():
+            if self.transfer_nothing():
+                var.free(self.call_var)
+        else:
+            self.out_var = var.unpack(self._data, not self.transfer_nothing())
+        return var.block
+
 
 class Utf8Argument(GIArgument):
     TAG = GITypeTag.UTF8
@@ -5,8 +5,19 @@
 # License as published by the Free Software Foundation; either
 # version 2.1 of the License, or (at your option) any later version.
 
+import os
+
+
 _BACKENDS = []
 _ACTIVE_BACKENDS = []
+# backend class -> list of unused instances
+_POOL = {}
+# namespace (None for the default) -> if argument checks get generated
+_CHECKS = {None: True}
+# how numeric C arrays get returned: "list", "memoryview" or "array"
+_ARRAY_RETURN = ["list"]
+# if owned GList/GSList results get converted on access
+_LAZY_LISTS = [False]
 
 
 def init_backends():
@@ -75,15 +86,114 @@ def set_backend(name=None):
     _ACTIVE_BACKENDS[:] = possible
 
 
+def set_checks(enabled, namespace=None):
+    """Enables or disables argument checks in the generated code.
+
+    set_checks(False) -- no checks for all namespaces
+    set_checks(False, "Gtk") -- no checks for Gtk only
+    set_checks(True, "Gtk") -- checks for Gtk, regardless of the default
+
+    Without checks, passing numbers out of range, arrays of the wrong
+    length or strings, enums and callbacks of the wrong type can lead to
+    wrong results or other errors instead of a TypeError/OverflowError.
+    Objects and structs always get checked, since passing the wrong one
+    to C isn't memory safe. Only affects functions generated after the
+    call.
+    """
+
+    _CHECKS[namespace] = bool(enabled)
+
+
+def get_checks(namespace):
+    """Returns if code for namespace should include argument checks"""
+
+    return _CHECKS.get(namespace, _CHECKS[None])
+
+
+def set_array_return(kind):
+    """Sets how returned C arrays of numbers get converted.
+
+    "list" -- a list of Python numbers (default)
+    "memoryview" -- a read-only memoryview over the array memory
+    "array" -- an array.array with a copy of the items
+
+    Arrays of other types and arrays without a known length are always
+    returned as a list. Takes effect for all functions, including ones
+    already generated.
+    """
+
+    if kind not in ("list", "memoryview", "array"):
+        raise ValueError("unknown array return type: %r" % kind)
+    _ARRAY_RETURN[0] = kind
+
+
+def get_array_return():
+    """Returns the current array return type, see set_array_return()"""
+
+    return _ARRAY_RETURN[0]
+
+
+def set_lazy_lists(enabled):
+    """If enabled, returned GList and GSList values we own get wrapped in a
+    sequence which converts items on access instead of a list.
+
+    Takes effect for all functions, including ones already generated.
+    """
+
+    _LAZY_LISTS[0] = bool(enabled)
+
+
+def get_lazy_lists():
+    """Returns if lazy lists are enabled, see set_lazy_lists()"""
+
+    return _LAZY_LISTS[0]
+
+
+def acquire_backend(backend):
+    """Returns an unused instance of the backend class.
+
+    Pass it to release_backend() once done and the code generated with it
+    doesn't need the instance anymore.
+    """
+
+    try:
+        return _POOL[backend].pop()
+    except (KeyError, IndexError):
+        return backend()
+
+
+def release_backend(instance):
+    """Resets the instance and makes it available to acquire_backend()"""
+
+    instance.reset()
+    _POOL.setdefault(type(instance), []).append(instance)
+
+
 class Backend(object):
     """The backend interface."""
 
+    checks = True
+    """If the generated code should check arguments, see set_checks()"""
+
+    def reset(self):
+        """Reset all state, for reusing the instance"""
+
+        self.var.reset()
+        self.checks = True
+
     def get_library(self, namespace):
         raise NotImplementedError
 
     def get_function(self, lib, symbol, args, ret, method=False, throws=False):
         raise NotImplementedError
 
+    def rebind_function(self, func, lib, symbol):
+        """Returns a function handle for symbol with the same signature
+        as the handle func returned by get_function()
+        """
+
+        raise NotImplementedError
+
     def get_constructor(self, gtype, args):
         raise NotImplementedError
 
@@ -93,3 +203,17 @@ class Backend(object):
     def get_type(self, type_, desc="", may_be_null=False,
                  may_return_null=False):
         raise NotImplementedError
+
+
+def _init_checks(value):
+    # PGI_NO_CHECKS=1 for all, PGI_NO_CHECKS=Gtk,Gdk for some namespaces
+    if value in ("1", "*"):
+        set_checks(False)
+    else:
+        for namespace in value.split(","):
+            if namespace:
+                set_checks(False, namespace)
+
+
+if "PGI_NO_CHECKS" in os.environ:
+    _init_checks(os.environ["PGI_NO_CHECKS"])
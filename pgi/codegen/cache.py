@@ -0,0 +1,441 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""A persistent on-disk cache for generated functions.
+
+For each namespace we store the code objects of all generated functions
+together with a description of the objects they reference, so a new process
+can recreate the functions without looking at the typelib or calling
+compile().
+
+The cache of a namespace gets invalidated if the typelib file, the namespace
+version, the pgi version, the active backend or the Python version changes.
+"""
+
+import io
+import os
+import sys
+import types
+import atexit
+import pickle
+import marshal
+import tempfile
+import threading
+import importlib
+
+import ctypes
+
+from pgi import const, _compat
+from pgi.clib.gir import GIRepository
+from pgi.util import ResultTuple, import_attribute, encode_cache
+from .utils import CodeBlock
+
+
+_FORMAT = 2
+
+
+class _Unpicklable(Exception):
+    pass
+
+
+def _lookup_qualname(obj):
+    """Returns True if obj can be pickled by reference"""
+
+    module = sys.modules.get(getattr(obj, "__module__", None))
+    if module is None:
+        return False
+    name = getattr(obj, "__qualname__", obj.__name__)
+    found = module
+    for part in name.split("."):
+        found = getattr(found, part, None)
+    return found is obj
+
+
+def _find_library_recipe(func):
+    """Returns a description for the library a ctypes function
+    handle belongs to or None.
+    """
+
+    from pgi.clib import _utils
+    from .ctypes_backend.main import CTypesBackend
+
+    func_lib = getattr(func, "_lib", None)
+
+    for namespace, lib in list(CTypesBackend._libs.items()):
+        if func_lib is lib or type(func) is lib._FuncPtr:
+            return ("ns", namespace)
+
+    for name, lib in list(_utils._internal.items()):
+        if func_lib is lib or type(func) is lib._FuncPtr:
+            return ("clib", name)
+
+
+def _load_library(recipe):
+    from pgi.clib import find_library
+    from .ctypes_backend.main import CTypesBackend
+
+    kind, name = recipe
+    if kind == "ns":
+        return CTypesBackend().get_library(name)
+    return find_library(name)
+
+
+_BASIC_TYPES = tuple(
+    [bool, float, bytes, tuple, list, dict, set, frozenset, type(None)] +
+    list(_compat.string_types) + list(_compat.integer_types))
+
+
+class _Pickler(pickle.Pickler):
+
+    def persistent_id(self, obj):
+        if obj is encode_cache:
+            return ("encodecache",)
+
+        if isinstance(obj, _BASIC_TYPES):
+            return
+
+        if isinstance(obj, types.ModuleType):
+            return ("module", obj.__name__)
+
+        if isinstance(obj, (types.FunctionType, types.BuiltinFunctionType)):
+            if not _lookup_qualname(obj):
+                raise _Unpicklable(obj)
+            return
+
+        if isinstance(obj, type):
+            return self._type_id(obj)
+
+        if isinstance(obj, ctypes._CFuncPtr):
+            recipe = _find_library_recipe(obj)
+            if recipe is not None:
+                return ("cfunc", recipe, obj.__name__,
+                        obj.restype, obj.argtypes)
+
+        from pgi.gtype import PGType
+        if isinstance(obj, PGType):
+            return ("gtype", obj.name)
+
+        raise _Unpicklable(obj)
+
+    def _type_id(self, obj):
+        if _lookup_qualname(obj):
+            return
+
+        if issubclass(obj, ResultTuple):
+            return ("resulttuple", obj._fnames)
+
+        meta = type(obj)
+        if meta is type(ctypes.POINTER(ctypes.c_int)):
+            return ("pointer", obj._type_)
+        elif meta is type(ctypes.c_int * 1):
+            return ("array", obj._type_, obj._length_)
+        elif meta is type(ctypes.CFUNCTYPE(None)):
+            if obj._flags_ == ctypes._FUNCFLAG_CDECL:
+                return ("cfunctype", obj._restype_, obj._argtypes_)
+
+        try:
+            if import_attribute(obj.__module__, obj.__name__) is obj:
+                return ("attr", obj.__module__, obj.__name__)
+        except ImportError:
+            pass
+
+        raise _Unpicklable(obj)
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "module":
+            return importlib.import_module(pid[1])
+        elif kind == "attr":
+            return import_attribute(pid[1], pid[2])
+        elif kind == "resulttuple":
+            return ResultTuple._new_type(pid[1])
+        elif kind == "pointer":
+            return ctypes.POINTER(pid[1])
+        elif kind == "array":
+            return pid[1] * pid[2]
+        elif kind == "cfunctype":
+            return ctypes.CFUNCTYPE(pid[1], *pid[2])
+        elif kind == "cfunc":
+            from .ctypes_backend.main import get_function_pointer
+            recipe, symbol, restype, argtypes = pid[1:]
+            return get_function_pointer(
+                _load_library(recipe), symbol, restype, argtypes)
+        elif kind == "gtype":
+            from pgi.gtype import PGType
+            return PGType.from_name(pid[1])
+        elif kind == "encodecache":
+            return encode_cache
+        raise pickle.UnpicklingError("unknown id: %r" % (pid,))
+
+
+def _dump_globals(deps):
+    file_ = io.BytesIO()
+    _Pickler(file_, 2).dump(deps)
+    return file_.getvalue()
+
+
+def _load_globals(data):
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+def get_namespace_key(namespace, backend_name):
+    """Returns a tuple which changes whenever the generated code
+    for a namespace might change.
+    """
+
+    repo = GIRepository()
+    path = repo.get_typelib_path(namespace)
+    try:
+        mtime = os.path.getmtime(path)
+    except (OSError, TypeError):
+        mtime = None
+
+    return (_FORMAT, path, mtime, repo.get_version(namespace),
+            const.VERSION, backend_name, sys.version)
+
+
+class _NamespaceCache(object):
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self.entries = {}
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as h:
+                key, entries = pickle.load(h)
+        except Exception:
+            return
+        if key == self.key:
+            self.entries = entries
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        # merge with what other processes have written in the meantime
+        current = _NamespaceCache(self.path, self.key)
+        current.load()
+        current.entries.update(self.entries)
+
+        dirname = os.path.dirname(self.path)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd, temp = tempfile.mkstemp(dir=dirname)
+            with os.fdopen(fd, "wb") as h:
+                pickle.dump((self.key, current.entries), h, 2)
+            getattr(os, "replace", os.rename)(temp, self.path)
+        except (OSError, IOError):
+            return
+
+        self.entries = current.entries
+        self.dirty = False
+
+
+class FunctionCache(object):
+    """Maps (symbol, is_method) to code objects and their dependencies
+    per namespace.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._namespaces = {}
+        self._lock = threading.Lock()
+
+    def _get_namespace(self, namespace, backend_name):
+        ns = self._namespaces.get((namespace, backend_name))
+        if ns is None:
+            with self._lock:
+                ns = self._namespaces.get((namespace, backend_name))
+                if ns is None:
+                    key = get_namespace_key(namespace, backend_name)
+                    filename = "%s-%s.%s.cache" % (
+                        namespace, key[3], backend_name)
+                    ns = _NamespaceCache(
+                        os.path.join(self.path, filename), key)
+                    ns.load()
+                    self._namespaces[(namespace, backend_name)] = ns
+        return ns
+
+    def lookup(self, info, method, backend_name):
+        """Returns a new function or None.
+
+        Raises NotImplementedError in case generating failed before.
+        """
+
+        ns = self._get_namespace(info.namespace, backend_name)
+        entry = ns.entries.get((info.symbol, method))
+        if entry is None:
+            return
+        return function_from_entry(entry, info.namespace)
+
+    def store(self, info, method, backend_name, func):
+        """Adds a function generated by _generate_function to the cache"""
+
+        entry = entry_from_function(func)
+        if entry is None:
+            return
+
+        ns = self._get_namespace(info.namespace, backend_name)
+        with self._lock:
+            ns.entries[(info.symbol, method)] = entry
+            ns.dirty = True
+
+    def store_error(self, info, method, backend_name, message):
+        """Remembers that no backend could generate the function"""
+
+        ns = self._get_namespace(info.namespace, backend_name)
+        with self._lock:
+            ns.entries[(info.symbol, method)] = message
+            ns.dirty = True
+
+    def save(self):
+        """Writes all changed namespaces to disk"""
+
+        with self._lock:
+            for ns in self._namespaces.values():
+                ns.save()
+
+
+def entry_from_function(func):
+    """Returns a picklable description of a generated function or None
+    if it references objects which can't be described.
+    """
+
+    block = func._code
+    try:
+        deps = _dump_globals(block.get_dependencies())
+    except (_Unpicklable, pickle.PicklingError, TypeError, AttributeError):
+        return
+
+    return (func.__name__, marshal.dumps(func.__code__), str(block),
+            func.__doc__, deps)
+
+
+def function_from_entry(entry, namespace):
+    """Creates a function from an entry. Returns None if that fails.
+
+    Raises NotImplementedError in case the entry is an error message.
+    """
+
+    if isinstance(entry, _compat.string_types):
+        raise NotImplementedError(entry)
+
+    name, code, source, doc, deps = entry
+    try:
+        deps = _load_globals(deps)
+    except Exception:
+        return
+
+    global_dict = dict(deps)
+    global_dict["__builtins__"] = _compat.builtins
+    func = types.FunctionType(marshal.loads(code), global_dict, name)
+    func._code = _source_block(source, deps)
+    func.__doc__ = doc
+    func.__module__ = namespace
+    return func
+
+
+def _source_block(source, deps):
+    block = CodeBlock()
+    block.write_line(source)
+    for name, obj in _compat.iteritems(deps):
+        block.add_dependency(name, obj)
+    return block
+
+
+_cache = []
+_compiled = {}
+
+
+def add_compiled_entries(namespace, backend_name, entries):
+    """Makes entries from a pgi-compile generated module available for
+    lookup_function()
+    """
+
+    _compiled[(namespace, backend_name)] = entries
+
+
+def lookup_function(info, method, backend_name):
+    """Returns a function from a compiled module or the on-disk cache
+    or None.
+
+    Raises NotImplementedError in case generating failed before.
+    """
+
+    entries = _compiled.get((info.namespace, backend_name))
+    if entries is not None:
+        entry = entries.get((info.symbol, method))
+        if entry is not None:
+            func = function_from_entry(entry, info.namespace)
+            if func is not None:
+                return func
+
+    cache = get_function_cache()
+    if cache is not None:
+        return cache.lookup(info, method, backend_name)
+
+
+def store_function(info, method, backend_name, func):
+    cache = get_function_cache()
+    if cache is not None:
+        cache.store(info, method, backend_name, func)
+
+
+def store_error(info, method, backend_name, message):
+    cache = get_function_cache()
+    if cache is not None:
+        cache.store_error(info, method, backend_name, message)
+
+
+def get_default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pgi")
+
+
+def set_cache_dir(path):
+    """Enables the on-disk function cache using the given directory.
+
+    Pass an empty string to use the default location and None to disable
+    the cache.
+    """
+
+    if _cache:
+        _cache.pop().save()
+
+    if path is None:
+        return
+
+    if not path:
+        path = get_default_cache_dir()
+
+    _cache.append(FunctionCache(path))
+
+
+def get_function_cache():
+    """Returns the active FunctionCache or None"""
+
+    if _cache:
+        return _cache[0]
+
+
+@atexit.register
+def _save_cache():
+    cache = get_function_cache()
+    if cache is not None:
+        cache.save()
+
+
+if "PGI_CACHE_DIR" in os.environ:
+    set_cache_dir(os.environ["PGI_CACHE_DIR"])
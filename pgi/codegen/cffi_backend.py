@@ -11,7 +11,7 @@ from cffi import FFI
 from pgi.clib.gir import GIRepository, GITypeTag, GIInfoType
 from .backend import Backend
 from .utils import CodeBlock, parse_with_objects, VariableFactory
-from .utils import TypeTagRegistry
+from .utils import TypeTagRegistry, VersionDispatchType
 from .. import _compat
 
 
@@ -97,7 +97,7 @@ def get_type(type_, gen, desc, may_be_null, may_return_null):
     return cls(gen, type_, desc, may_be_null, may_return_null)
 
 
-class BaseType(object):
+class BaseType(_compat.with_metaclass(VersionDispatchType, object)):
     GI_TYPE_TAG = None
     type = None
     py_type = None
@@ -135,15 +135,6 @@ class BaseType(object):
     def free(self, name):
         raise NotImplementedError
 
-    def __getattribute__(self, name):
-        try:
-            if _compat.PY3:
-                return object.__getattribute__(self, name + "_py3")
-            else:
-                return object.__getattribute__(self, name + "_py2")
-        except AttributeError:
-            return object.__getattribute__(self, name)
-
 
 class BasicType(BaseType):
 
@@ -12,8 +12,10 @@ Compared to g_object_newv, this saves us two function calls per parameter.
 """
 
 
-from .backend import get_backend
+from .backend import get_backend, acquire_backend, release_backend
 from .utils import CodeBlock
+from . import profile
+from . import stats
 from pgi.clib.gir import GITypeTag, GIInfoType
 from pgi.util import unescape_parameter, import_attribute
 
@@ -218,5 +220,16 @@ def generate_constructor(cls, names):
     elif len(cache) > 3:
         cache.clear()
 
-    backend = get_backend("ctypes")()
-    return _generate_constructor(cls, names, backend)
+    profile.record_constructor(cls, names)
+
+    start = stats.start()
+    backend = acquire_backend(get_backend("ctypes"))
+    try:
+        func = _generate_constructor(cls, names, backend)
+    except NotImplementedError:
+        stats.stop(start, "constructor", cls.__module__, None)
+        raise
+    finally:
+        release_backend(backend)
+    stats.stop(start, "constructor", cls.__module__, backend.NAME)
+    return func
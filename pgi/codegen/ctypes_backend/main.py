@@ -7,6 +7,7 @@
 
 import ctypes
 import textwrap
+import threading
 
 from pgi.clib.gir import GIRepository
 from pgi.clib.gobject import GCallback, GType
@@ -31,6 +32,7 @@ types_other
 class CTypesCodeGen(object):
     def __init__(self, var):
         self.var = var
+        self.checks = True
 
     def parse(self, code, **kwargs):
         assert "_" not in kwargs
@@ -44,9 +46,39 @@ class CTypesCodeGen(object):
         return block, var
 
 
+# (restype, argtypes) -> CFUNCTYPE
+_prototypes = {}
+
+
+def get_prototype(restype, argtypes):
+    """Returns a shared CFUNCTYPE for the signature"""
+
+    key = (restype, tuple(argtypes))
+    try:
+        return _prototypes[key]
+    except KeyError:
+        prototype = ctypes.CFUNCTYPE(restype, *argtypes)
+        return _prototypes.setdefault(key, prototype)
+
+
+def get_function_pointer(lib, symbol, restype, argtypes):
+    """Returns a new function pointer for symbol in lib using a shared
+    prototype, so the library attributes stay untouched.
+
+    Raises AttributeError if the library doesn't provide the symbol.
+    """
+
+    func = get_prototype(restype, argtypes)((symbol, lib))
+    func.__name__ = symbol
+    # for the on-disk cache to find the library again
+    func._lib = lib
+    return func
+
+
 class CTypesBackend(Backend):
     NAME = "ctypes"
     _libs = {}
+    _libs_lock = threading.Lock()
 
     def __init__(self):
         Backend.__init__(self)
@@ -56,6 +88,14 @@ class CTypesBackend(Backend):
     def var(self):
         return self._gen.var
 
+    @property
+    def checks(self):
+        return self._gen.checks
+
+    @checks.setter
+    def checks(self, value):
+        self._gen.checks = value
+
     def get_type(self, type_, desc="", may_be_null=False,
                  may_return_null=False):
         try:
@@ -66,14 +106,20 @@ class CTypesBackend(Backend):
             return cls(self._gen, type_, desc, may_be_null, may_return_null)
 
     def get_library(self, namespace):
-        if namespace not in self._libs:
-            paths = GIRepository().get_shared_library(namespace)
-            if not paths:
-                return
-            path = paths.split(",")[0]
-            lib = load_ctypes_library(path)
-            self._libs[namespace] = lib
-        return self._libs[namespace]
+        try:
+            return self._libs[namespace]
+        except KeyError:
+            pass
+
+        with self._libs_lock:
+            if namespace not in self._libs:
+                paths = GIRepository().get_shared_library(namespace)
+                if not paths:
+                    return
+                path = paths.split(",")[0]
+                lib = load_ctypes_library(path)
+                self._libs[namespace] = lib
+            return self._libs[namespace]
 
     def _get_signature(self, args, ret, method, throws):
         if ret:
@@ -100,14 +146,13 @@ class CTypesBackend(Backend):
         return restype, argtypes
 
     def get_function(self, lib, symbol, args, ret, method=False, throws=False):
+        restype, argtypes = self._get_signature(args, ret, method, throws)
         try:
-            h = getattr(lib, symbol)
+            h = get_function_pointer(lib, symbol, restype, argtypes)
         except AttributeError:
             raise NotImplementedError(
                 "Library doesn't provide symbol: %s" % symbol)
 
-        h.restype, h.argtypes = self._get_signature(args, ret, method, throws)
-
         block, var = self.parse("""
             # args: $args
             # ret: $ret
@@ -116,6 +161,14 @@ class CTypesBackend(Backend):
 
         return block, h
 
+    def rebind_function(self, func, lib, symbol):
+        try:
+            return get_function_pointer(
+                lib, symbol, func.restype, func.argtypes)
+        except AttributeError:
+            raise NotImplementedError(
+                "Library doesn't provide symbol: %s" % symbol)
+
     def get_callback(self, func, args, ret, is_signal=False):
         if func is None:
             return ctypes.cast(None, GCallback)
@@ -125,22 +178,19 @@ class CTypesBackend(Backend):
         if is_signal:
             arg_types.insert(0, ctypes.c_void_p)
         ret_type = typeinfo_to_ctypes(ret.type)
-        cb_object_type = ctypes.CFUNCTYPE(ret_type, *arg_types)
+        cb_object_type = get_prototype(ret_type, arg_types)
         return ctypes.cast(cb_object_type(func), GCallback)
 
     def get_constructor(self, gtype, args):
-        # we need to create a new library, or the argtypes change for all
-        # instances
-        lib = find_library("gobject-2.0", cached=False)
-        h = getattr(lib, "g_object_new")
-
         arg_types = [GType]
         for arg in args:
             arg_types.append(ctypes.c_char_p)
             arg_types.append(typeinfo_to_ctypes(arg.type))
         arg_types.append(ctypes.c_void_p)
-        h.argtypes = arg_types
-        h.restype = ctypes.c_void_p
+
+        lib = find_library("gobject-2.0")
+        h = get_function_pointer(
+            lib, "g_object_new", ctypes.c_void_p, arg_types)
 
         values = []
         for arg in args:
@@ -8,6 +8,7 @@
 from pgi.clib import glib
 from pgi.clib.gir import GITypeTag
 from pgi import _compat
+from pgi.util import encode_cache
 
 from .utils import BaseType, register_type
 
@@ -72,6 +73,9 @@ class Boolean(BasicType):
 class Int8(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             if not $_.isinstance($value, $basestring):
                 $int = $_.int($value)
@@ -165,6 +169,9 @@ class UInt8(BasicType):
 class Int16(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             if not $_.isinstance($value, $basestring):
                 $int = $_.int($value)
@@ -205,6 +212,9 @@ class Int16(BasicType):
 class UInt16(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             if not $_.isinstance($value, $basestring):
                 $int = $_.int($value)
@@ -245,6 +255,9 @@ class UInt16(BasicType):
 class Int32(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             # int32 type/value check
             if not $_.isinstance($value, $basestring):
@@ -285,6 +298,9 @@ class Int32(BasicType):
 class UInt32(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             # uint32 type/value check
             if not $_.isinstance($value, $basestring):
@@ -325,6 +341,9 @@ class UInt32(BasicType):
 class Int64(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             # int64 type/value check
             if not $_.isinstance($value, $basestring):
@@ -366,6 +385,9 @@ class Int64(BasicType):
 class UInt64(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             # uint64 type/value check
             if not $_.isinstance($value, $basestring):
@@ -407,6 +429,11 @@ class UInt64(BasicType):
 class Float(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return self.parse("""
+                $c_float = $ctypes.c_float($value)
+                """, value=name)["c_float"]
+
         return self.parse("""
             # float type/value check
             if $_.isinstance($value, $basestring):
@@ -446,6 +473,11 @@ class Float(BasicType):
 class Double(BasicType):
 
     def _check(self, name):
+        if not self.checks:
+            return self.parse("""
+                $c_double = $ctypes.c_double($value)
+                """, value=name)["c_double"]
+
         return self.parse("""
             # double type/value check
             if $_.isinstance($value, $basestring):
@@ -498,6 +530,11 @@ class UniChar(BasicType):
             """, value=name)["int"]
 
     def _check_py3(self, name):
+        if not self.checks:
+            return self.parse("""
+                $int = $_.ord($value)
+                """, value=name)["int"]
+
         return self.parse("""
             $int = $_.ord($value)
 
@@ -586,6 +623,9 @@ class Void(BaseType):
 class Utf8(BaseType):
 
     def _check_py3(self, name):
+        if not self.checks:
+            return name
+
         if self.may_be_null:
             return self.parse("""
                 if $value is not None:
@@ -636,9 +676,11 @@ class Utf8(BaseType):
         checked = self._check(name)
         return self.parse("""
             $encoded = $value
-            if $value is not None:
+            if $_.type($value) is $_.str:
+                $encoded = $encode_cache[$value]
+            elif $value is not None:
                 $encoded = $value.encode("utf-8")
-            """, value=checked)["encoded"]
+            """, value=checked, encode_cache=encode_cache)["encoded"]
 
     def pack_out_py2(self, name):
         checked = self._check(name)
@@ -649,10 +691,12 @@ class Utf8(BaseType):
     def pack_out_py3(self, name):
         checked = self._check(name)
         return self.parse("""
-            if $value is not None:
+            if $_.type($value) is $_.str:
+                $value = $encode_cache[$value]
+            elif $value is not None:
                 $value = $value.encode("utf-8")
             $c_value = $ctypes.c_char_p($value)
-            """, value=checked)["c_value"]
+            """, value=checked, encode_cache=encode_cache)["c_value"]
 
     def dup(self, name):
         var = self.parse("""
@@ -5,13 +5,319 @@
 # License as published by the Free Software Foundation; either
 # version 2.1 of the License, or (at your option) any later version.
 
+import sys
+import array
 import ctypes
+from collections.abc import Sequence, Mapping
 
-from pgi.clib.gir import GITypeTag, GIArrayType
-from pgi.clib import glib
+from pgi.clib.gir import GITypeTag, GIArrayType, GIInfoType
+from pgi.clib import glib, gobject
+from ..backend import get_array_return, get_lazy_lists
 from .utils import BaseType, registry, typeinfo_to_ctypes
 
 
+# element types which can be passed as a buffer
+_BUFFER_TAGS = [
+    GITypeTag.INT8, GITypeTag.UINT8, GITypeTag.INT16, GITypeTag.UINT16,
+    GITypeTag.INT32, GITypeTag.UINT32, GITypeTag.INT64, GITypeTag.UINT64,
+    GITypeTag.FLOAT, GITypeTag.DOUBLE,
+]
+
+_FLOAT_CODES = ("f", "d")
+
+
+def get_buffer_pointer(obj, ctypes_type):
+    """Takes an object providing the buffer interface and returns a
+    (pointer, length) tuple. The pointer references the memory of obj if it
+    is writable or a bytes object, otherwise a copy.
+
+    Returns None if obj isn't a C contiguous buffer of items matching
+    ctypes_type in size and kind.
+    """
+
+    if isinstance(obj, (list, tuple)):
+        return
+
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return
+
+    format_ = view.format
+    if format_[:1] in ("@", "="):
+        format_ = format_[1:]
+    elif format_[:1] in ("<", ">", "!"):
+        if (format_[0] == "<") != (sys.byteorder == "little"):
+            return
+        format_ = format_[1:]
+
+    if len(format_) != 1 or \
+            (format_ in _FLOAT_CODES) != (ctypes_type._type_ in _FLOAT_CODES):
+        return
+
+    itemsize = ctypes.sizeof(ctypes_type)
+    if view.itemsize != itemsize or \
+            not getattr(view, "c_contiguous", True):
+        return
+
+    length = view.nbytes // itemsize
+    if isinstance(obj, bytes):
+        # ctypes passes a pointer to the content
+        return obj, length
+
+    if format_ != "B":
+        view = view.cast("B")
+    if view.readonly:
+        data = (ctypes.c_char * view.nbytes).from_buffer_copy(view)
+    else:
+        data = (ctypes.c_char * view.nbytes).from_buffer(view)
+    return ctypes.byref(data), length
+
+
+class _Finalizer(object):
+    """Calls func(*args) once collected"""
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __del__(self):
+        self.func(*self.args)
+
+
+def unpack_buffer(value, length, ctypes_type, own):
+    """Returns the C array at value as a memoryview or array.array depending
+    on get_array_return() or None if it should be converted to a list.
+
+    If own is True the memory gets freed once it is no longer needed.
+    """
+
+    kind = get_array_return()
+    if kind == "list":
+        return
+
+    address = ctypes.cast(value, ctypes.c_void_p).value
+    code = ctypes_type._type_
+    if not address or not length:
+        if own and address:
+            glib.free(address)
+        if kind == "array":
+            return array.array(code)
+        return memoryview(b"").cast("B").cast(code)
+
+    if kind == "array":
+        result = array.array(code)
+        result.frombytes(
+            ctypes.string_at(address, length * ctypes.sizeof(ctypes_type)))
+        if own:
+            glib.free(address)
+        return result
+
+    if own:
+        data = (ctypes_type * length).from_address(address)
+        data._owner = _Finalizer(glib.free, address)
+    else:
+        # not ours, so it might go away with its owner
+        data = (ctypes_type * length).from_buffer_copy(
+            (ctypes_type * length).from_address(address))
+
+    return memoryview(data).cast("B").cast(code).toreadonly()
+
+
+def _get_items(obj, ctypes_type):
+    """Returns a (pointer, length) tuple for a buffer or a sequence of
+    numbers
+    """
+
+    result = get_buffer_pointer(obj, ctypes_type)
+    if result is None:
+        items = list(obj)
+        result = (ctypes_type * len(items))(*items), len(items)
+    return result
+
+
+def pack_byte_array(obj):
+    """Returns a new GByteArray containing a copy of obj"""
+
+    data, length = _get_items(obj, glib.guint8)
+    array = glib.GByteArray.sized_new(length)
+    array.append(data, length)
+    return array
+
+
+def pack_garray(obj, ctypes_type):
+    """Returns a new GArray containing a copy of obj"""
+
+    data, length = _get_items(obj, ctypes_type)
+    array = glib.GArray.sized_new(
+        False, False, ctypes.sizeof(ctypes_type), length)
+    array.append_vals(data, length)
+    return array
+
+
+def pack_ptr_array(seq, pack_item, free_func):
+    """Returns a new GPtrArray containing the pointers pack_item() returns
+    for the items of seq. free_func is a function pointer or None and gets
+    called for each item when the array gets freed.
+    """
+
+    items = list(seq)
+    array = glib.GPtrArray.new_full(len(items), free_func)
+    try:
+        for item in items:
+            array.add(pack_item(item))
+    except Exception:
+        array.unref()
+        raise
+    return array
+
+
+def unpack_garray(value, array_type, ctypes_type, own):
+    """Returns a read-only memoryview over the items of a GArray or
+    GByteArray.
+
+    If own is True the reference passed to us gets used and the view keeps
+    it, so the items don't get copied. Otherwise the items get copied.
+    """
+
+    if not value:
+        return
+
+    array = ctypes.cast(value, array_type)
+    code = ctypes_type._type_
+    length = array.contents.len
+    if not length:
+        if own:
+            array.unref()
+        return memoryview(b"").cast("B").cast(code)
+
+    items = (ctypes_type * length).from_address(array.contents.data)
+    if own:
+        data = items
+        data._owner = _Finalizer(array.unref)
+    else:
+        # not ours, the owner can still resize or free the items
+        data = (ctypes_type * length).from_buffer_copy(items)
+    return memoryview(data).cast("B").cast(code).toreadonly()
+
+
+class LazyPtrArray(Sequence):
+    """A read-only sequence wrapping a GPtrArray.
+
+    Items get converted on first access, the array is kept alive until
+    the sequence is gone.
+    """
+
+    def __init__(self, array, unpack_item, own):
+        if not own:
+            array.ref()
+        self._array = array
+        self._unpack_item = unpack_item
+        self._items = {}
+
+    def __del__(self):
+        array = getattr(self, "_array", None)
+        if array is not None:
+            array.unref()
+
+    def __len__(self):
+        return self._array.contents.len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("index out of range")
+
+        try:
+            return self._items[index]
+        except KeyError:
+            item = self._unpack_item(self._array.contents.pdata[index])
+            self._items[index] = item
+            return item
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyPtrArray, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, list(self))
+
+
+class LazyHashTable(Mapping):
+    """A read-only mapping wrapping a GHashTable.
+
+    Looking up a key only converts the matching entry, dict(table) or
+    to_dict() convert all of them. The table is kept alive until the
+    mapping is gone.
+    """
+
+    def __init__(self, table, pack_key, unpack_key, unpack_value, own):
+        if not own:
+            table.ref()
+        self._table = table
+        self._pack_key = pack_key
+        self._unpack_key = unpack_key
+        self._unpack_value = unpack_value
+
+    def __del__(self):
+        table = getattr(self, "_table", None)
+        if table is not None:
+            table.unref()
+
+    def __len__(self):
+        return self._table.size
+
+    def __getitem__(self, key):
+        try:
+            key_ptr = self._pack_key(key)
+        except (TypeError, ValueError, OverflowError):
+            raise KeyError(key)
+
+        value = glib.gpointer()
+        if not self._table.lookup_extended(
+                key_ptr, None, ctypes.byref(value)):
+            raise KeyError(key)
+        return self._unpack_value(value.value)
+
+    def _entries(self):
+        iter_ = glib.GHashTableIter()
+        iter_ptr = glib.GHashTableIterPtr(iter_)
+        iter_ptr.init(self._table)
+        key = glib.gpointer()
+        value = glib.gpointer()
+        while iter_ptr.next(ctypes.byref(key), ctypes.byref(value)):
+            yield key.value, value.value
+
+    def __iter__(self):
+        for key, value in self._entries():
+            yield self._unpack_key(key)
+
+    def to_dict(self):
+        """Returns a dict with all entries converted"""
+
+        unpack_key = self._unpack_key
+        unpack_value = self._unpack_value
+        return dict((unpack_key(k), unpack_value(v))
+                    for k, v in self._entries())
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.to_dict())
+
+
 @registry.register(GITypeTag.ARRAY)
 class BaseArray(BaseType):
 
@@ -21,14 +327,161 @@ class BaseArray(BaseType):
 
         if type_ == GIArrayType.C:
             return CArray
+        elif type_ == GIArrayType.ARRAY:
+            return GArray
+        elif type_ == GIArrayType.BYTE_ARRAY:
+            return GByteArray
+        elif type_ == GIArrayType.PTR_ARRAY:
+            return GPtrArray
 
         raise NotImplementedError("unsupported array type: %r" % type_)
 
 
+class BaseGArray(BaseArray):
+    """Base for the reference counted GLib array types"""
+
+    def new(self):
+        return self.parse("""
+            $array = $ctypes.c_void_p()
+            """)["array"]
+
+    def free(self, name):
+        self.parse("""
+            $array.unref()
+            """, array=name)
+
+    def pack_in(self, name):
+        raise NotImplementedError
+
+    def unpack_return(self, name):
+        return self.unpack(name, False)
+
+
+class GArray(BaseGArray):
+
+    def _get_item_type(self):
+        param_type = self.type.get_param_type(0)
+        if param_type.is_pointer or \
+                param_type.tag.value not in _BUFFER_TAGS:
+            raise NotImplementedError("GArray of non numeric items")
+        return typeinfo_to_ctypes(param_type)
+
+    def check(self, name):
+        return name
+
+    def pack(self, name):
+        return self.parse("""
+            $array = $pack_garray($value, $ctypes_type)
+            """, value=name, pack_garray=pack_garray,
+            ctypes_type=self._get_item_type())["array"]
+
+    def unpack(self, name, own):
+        return self.parse("""
+            $out = $unpack_garray($value, $GArrayPtr, $ctypes_type, $own)
+            """, value=name, unpack_garray=unpack_garray,
+            GArrayPtr=glib.GArrayPtr, ctypes_type=self._get_item_type(),
+            own=own)["out"]
+
+
+class GByteArray(BaseGArray):
+
+    def check(self, name):
+        return name
+
+    def pack(self, name):
+        return self.parse("""
+            $array = $pack_byte_array($value)
+            """, value=name, pack_byte_array=pack_byte_array)["array"]
+
+    def unpack(self, name, own):
+        return self.parse("""
+            $out = $unpack_garray($value, $GByteArrayPtr, $guint8, $own)
+            """, value=name, unpack_garray=unpack_garray,
+            GByteArrayPtr=glib.GByteArrayPtr, guint8=glib.guint8,
+            own=own)["out"]
+
+
+class GPtrArray(BaseGArray):
+
+    def check(self, name):
+        return name
+
+    def pack(self, name, own=False):
+        """If own is True the callee takes ownership of the array and the
+        items, otherwise only of the array.
+        """
+
+        param_type = self.type.get_param_type(0)
+        p = self.get_type(param_type, desc="Element of %s" % self.desc)
+        item_in = self.var()
+
+        tag = param_type.tag.value
+        if tag in (GITypeTag.UTF8, GITypeTag.FILENAME):
+            # the array gets a copy, freed by the array or by the callee
+            encoded = p.pack_in(item_in)
+            item_out = p.parse("""
+                $ptr = $g_strdup($value)
+                """, g_strdup=glib.g_strdup, value=encoded)["ptr"]
+            free_func = "None" if own else "$glib.g_free_ptr"
+        elif tag == GITypeTag.VOID and not own:
+            item_out = p.pack_in(item_in)
+            free_func = "None"
+        else:
+            raise NotImplementedError(
+                "GPtrArray with %s items" % GITypeTag(tag))
+
+        # function pointers get looked up at runtime, they are different
+        # for each process
+        return self.parse("""
+            def $pack_item($item_in):
+                $item_pack
+                return $item_out
+            $array = $pack_ptr_array($seq, $pack_item, %s)
+            """ % free_func, seq=name, pack_ptr_array=pack_ptr_array,
+            glib=glib, item_in=item_in, item_pack=p.block,
+            item_out=item_out)["array"]
+
+    def unpack(self, name, own):
+        param_type = self.type.get_param_type(0)
+        ctypes_type = typeinfo_to_ctypes(param_type)
+
+        p = self.get_type(param_type)
+        item_in = self.var()
+        item_out = p.unpack_return(item_in)
+
+        unpack_item = self.parse("""
+            def $unpack_item($ptr):
+                $item_in = $ctypes_type($ptr or 0).value
+                $item_unpack
+                return $item_out
+            """, ctypes_type=ctypes_type, item_in=item_in,
+            item_unpack=p.block, item_out=item_out)["unpack_item"]
+
+        if not own:
+            # like for hash tables, the callee can still change the items
+            return self.parse("""
+                $out = None
+                if $value:
+                    $out = $_.list($LazyPtrArray(
+                        $ctypes.cast($value, $GPtrArrayPtr), $unpack_item,
+                        False))
+                """, value=name, unpack_item=unpack_item,
+                LazyPtrArray=LazyPtrArray,
+                GPtrArrayPtr=glib.GPtrArrayPtr)["out"]
+
+        return self.parse("""
+            $out = None
+            if $value:
+                $out = $LazyPtrArray(
+                    $ctypes.cast($value, $GPtrArrayPtr), $unpack_item, True)
+            """, value=name, unpack_item=unpack_item,
+            LazyPtrArray=LazyPtrArray, GPtrArrayPtr=glib.GPtrArrayPtr)["out"]
+
+
 class CArray(BaseArray):
 
     def check(self, name):
-        if self.type.array_fixed_size != -1:
+        if self.checks and self.type.array_fixed_size != -1:
             length = self.type.array_fixed_size
             self.parse("""
                 $array_len = $_.len($l)
@@ -42,9 +495,79 @@ class CArray(BaseArray):
     def pack(self, name, length_type):
         return self._pack(name, length_type, True)
 
-    def pack_in(self, name, length_type):
+    def pack_in(self, name, length_type, buffer=False):
+        """If buffer is True, objects providing a matching buffer get passed
+        without converting each item.
+        """
+
+        if buffer and self._can_pass_buffer():
+            return self._pack_buffer(name, length_type)
         return self._pack(name, length_type, False)
 
+    def dup(self, name, array_ptr):
+        """Returns a copy of the packed array allocated with g_malloc,
+        so the ownership can be passed to the callee.
+
+        Only arrays of numbers get copied, for others array_ptr is
+        returned.
+        """
+
+        param_type = self.type.get_param_type(0)
+        if param_type.is_pointer or param_type.tag.value not in _BUFFER_TAGS:
+            return array_ptr
+
+        if self.type.array_fixed_size != -1:
+            length = str(self.type.array_fixed_size)
+        elif self.type.is_zero_terminated:
+            length = self.parse("$len = $_.len($inp) + 1", inp=name)["len"]
+        else:
+            length = self.parse("$len = $_.len($inp)", inp=name)["len"]
+
+        return self.parse("""
+            $copy = $g_memdup($array_ptr, $length * $size)
+            """, g_memdup=glib.g_memdup, array_ptr=array_ptr, length=length,
+            size=ctypes.sizeof(typeinfo_to_ctypes(param_type)))["copy"]
+
+    def _can_pass_buffer(self):
+        if self.type.is_zero_terminated or \
+                self.type.array_fixed_size != -1:
+            return False
+
+        param_type = self.type.get_param_type(0)
+        return not param_type.is_pointer and \
+            param_type.tag.value in _BUFFER_TAGS
+
+    def _pack_buffer(self, name, length_type):
+        # the item by item conversion for sequences and other buffers
+        fallback = self.get_type(self.type, desc=self.desc)
+        fallback_ptr, fallback_length = fallback._pack(
+            name, length_type, False)
+
+        # the length comes from the buffer, so no need to check it
+        if self.type.array_length != -1:
+            length_ctype = typeinfo_to_ctypes(length_type)
+        else:
+            length_ctype = int
+
+        ctypes_type = typeinfo_to_ctypes(self.type.get_param_type(0))
+        var = self.parse("""
+            $buffer = $get_buffer_pointer($name, $ctypes_type)
+            if $buffer is not None:
+                $array_ptr = $buffer[0]
+                $length = $length_ctype($buffer[1])
+            else:
+                $fallback
+                $array_ptr = $fallback_ptr
+                $length = $fallback_length
+            """, name=name, get_buffer_pointer=get_buffer_pointer,
+            ctypes_type=ctypes_type, length_ctype=length_ctype,
+            fallback=fallback.block, fallback_ptr=fallback_ptr,
+            fallback_length=fallback_length or "None")
+
+        if self.type.array_length != -1:
+            return var["array_ptr"], var["length"]
+        return var["array_ptr"], ""
+
     def _pack(self, name, length_type, out=True):
         # length
         if self.type.array_length != -1:
@@ -110,7 +633,40 @@ class CArray(BaseArray):
             param_pack=p.block, ctypes_type=ctypes_type, length=length,
             getref=getref)["array_ptr"], packed_length
 
-    def unpack(self, name, length):
+    def _can_unpack_buffer(self):
+        if self.type.array_length == -1 and \
+                self.type.array_fixed_size == -1:
+            return False
+
+        param_type = self.type.get_param_type(0)
+        return not param_type.is_pointer and \
+            param_type.tag.value in _BUFFER_TAGS
+
+    def unpack(self, name, length, own=False):
+        """If own is True the array memory belongs to us"""
+
+        if self._can_unpack_buffer():
+            ctypes_type = typeinfo_to_ctypes(self.type.get_param_type(0))
+            if self.type.array_length != -1:
+                buffer_length = "%s.value" % length
+            else:
+                buffer_length = self.type.array_fixed_size
+
+            items = self.get_type(self.type, desc=self.desc)
+            items_out = items._unpack(name, length)
+            return self.parse("""
+                $out = $unpack_buffer($value, $length, $ctypes_type, $own)
+                if $out is None:
+                    $unpack_items
+                    $out = $items_out
+                """, value=name, length=buffer_length,
+                unpack_buffer=unpack_buffer, ctypes_type=ctypes_type,
+                own=own, unpack_items=items.block,
+                items_out=items_out)["out"]
+
+        return self._unpack(name, length)
+
+    def _unpack(self, name, length):
         param_type = self.type.get_param_type(0)
         ctypes_type = typeinfo_to_ctypes(param_type)
 
@@ -183,8 +739,231 @@ class CArray(BaseArray):
         raise NotImplementedError
 
 
-@registry.register(GITypeTag.GLIST)
-class GList(BaseType):
+@registry.register(GITypeTag.GHASH)
+class GHashTable(BaseType):
+
+    def _is_string(self, type_info):
+        return type_info.tag.value in (GITypeTag.UTF8, GITypeTag.FILENAME)
+
+    def _pack_item(self, type_info, name, desc):
+        """Returns a block, the pointer and the name of the destroy function
+        for the table
+        """
+
+        p = self.get_type(type_info, desc=desc)
+        if self._is_string(type_info):
+            encoded = p.pack_in(name)
+            ptr = p.parse("""
+                $ptr = $g_strdup($value)
+                """, g_strdup=glib.g_strdup, value=encoded)["ptr"]
+            return p.block, ptr, "g_free_ptr"
+        return p.block, p.pack_pointer(name), None
+
+    def _unpack_item(self, type_info):
+        """Returns a block defining a function for converting an entry"""
+
+        p = self.get_type(type_info)
+        item_in = self.var()
+        item_out = p.unpack_return(item_in)
+        var = self.parse("""
+            def $unpack_item($ptr):
+                $item_in = $ctypes_type($ptr or 0).value
+                $item_unpack
+                return $item_out
+            """, ctypes_type=typeinfo_to_ctypes(type_info), item_in=item_in,
+            item_unpack=p.block, item_out=item_out)
+        return var["unpack_item"]
+
+    def check(self, name):
+        return name
+
+    def pack(self, name):
+        key_type = self.type.get_param_type(0)
+        value_type = self.type.get_param_type(1)
+
+        key_in = self.var()
+        key_block, key_out, key_destroy = self._pack_item(
+            key_type, key_in, "Key of %s" % self.desc)
+        value_in = self.var()
+        value_block, value_out, value_destroy = self._pack_item(
+            value_type, value_in, "Value of %s" % self.desc)
+
+        if self._is_string(key_type):
+            hash_, equal = "g_str_hash", "g_str_equal"
+        else:
+            hash_, equal = "g_direct_hash", "g_direct_equal"
+
+        # function pointers get looked up at runtime, they are different
+        # for each process
+        funcs = ["$glib.%s" % f if f else "None"
+                 for f in (hash_, equal, key_destroy, value_destroy)]
+
+        return self.parse("""
+            $table = $GHashTable.new_full(%s, %s,
+                %s, %s)
+            for $key_in, $value_in in $dict.items():
+                $key_pack
+                $value_pack
+                $table.insert($key_out, $value_out)
+            """ % tuple(funcs), dict=name, GHashTable=glib.GHashTable,
+            glib=glib, key_in=key_in, value_in=value_in, key_pack=key_block,
+            value_pack=value_block, key_out=key_out,
+            value_out=value_out)["table"]
+
+    def unpack(self, name, own):
+        key_type = self.type.get_param_type(0)
+        value_type = self.type.get_param_type(1)
+        unpack_key = self._unpack_item(key_type)
+        unpack_value = self._unpack_item(value_type)
+
+        if not own:
+            # the callee can still change the table or free the entries,
+            # so convert them right away
+            return self.parse("""
+                $out = None
+                if $value:
+                    $out = $LazyHashTable(
+                        $ctypes.cast($value, $GHashTablePtr),
+                        None, $unpack_key, $unpack_value, False).to_dict()
+                """, value=name, LazyHashTable=LazyHashTable,
+                GHashTablePtr=glib.GHashTablePtr, unpack_key=unpack_key,
+                unpack_value=unpack_value)["out"]
+
+        # for lookups, strings don't need a copy
+        k = self.get_type(key_type, desc="Key")
+        key_in = self.var()
+        if self._is_string(key_type):
+            key_out = k.pack_in(key_in)
+        else:
+            key_out = k.pack_pointer(key_in)
+        pack_key = self.parse("""
+            def $pack_key($key_in):
+                $key_pack
+                return $key_out
+            """, key_in=key_in, key_pack=k.block,
+            key_out=key_out)["pack_key"]
+
+        return self.parse("""
+            $out = None
+            if $value:
+                $out = $LazyHashTable($ctypes.cast($value, $GHashTablePtr),
+                    $pack_key, $unpack_key, $unpack_value, True)
+            """, value=name, LazyHashTable=LazyHashTable,
+            GHashTablePtr=glib.GHashTablePtr, pack_key=pack_key,
+            unpack_key=unpack_key, unpack_value=unpack_value)["out"]
+
+    def new(self):
+        return self.parse("""
+            $table = $ctypes.c_void_p()
+            """)["table"]
+
+    def free(self, name):
+        self.parse("""
+            $table.unref()
+            """, table=name)
+
+    def pack_in(self, name):
+        raise NotImplementedError
+
+    def unpack_return(self, name):
+        return self.unpack(name, False)
+
+
+class LazyList(Sequence):
+    """A read-only sequence wrapping a GList or GSList we own.
+
+    Nodes get walked and items converted only when needed, converted items
+    are cached. The list gets freed once the sequence is gone.
+
+    If we own the items as well, free_item gets called with the items
+    which didn't get converted at that point.
+    """
+
+    def __init__(self, head, unpack_item, free_item=None):
+        self._head = head
+        self._unpack_item = unpack_item
+        self._free_item = free_item
+        self._node = head
+        self._data = []
+        self._items = {}
+        self._length = None
+
+    def __del__(self):
+        head = getattr(self, "_head", None)
+        if not head:
+            return
+
+        free_item = self._free_item
+        if free_item is not None:
+            self._walk(len(self))
+            items = self._items
+            for i, data in enumerate(self._data):
+                if data and i not in items:
+                    free_item(data)
+        head.free()
+
+    def __len__(self):
+        if self._length is None:
+            self._length = self._head.length
+        return self._length
+
+    def _walk(self, index):
+        data = self._data
+        node = self._node
+        while len(data) <= index and node:
+            entry = node.contents
+            data.append(entry.data)
+            node = entry.next
+        self._node = node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("index out of range")
+
+        try:
+            return self._items[index]
+        except KeyError:
+            self._walk(index)
+            if index >= len(self._data):
+                raise IndexError("index out of range")
+            item = self._unpack_item(self._data[index])
+            self._items[index] = item
+            return item
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyList, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, list(self))
+
+
+def unpack_lazy_list(value, unpack_item, free_item=None):
+    """Returns a LazyList for the list at value or None if lazy lists are
+    disabled.
+    """
+
+    if get_lazy_lists():
+        return LazyList(value, unpack_item, free_item)
+
+
+class BaseList(BaseType):
+
+    _ptr_type = None
 
     def check(self, name):
         pass
@@ -197,15 +976,41 @@ class GList(BaseType):
         param_out = param_type.pack_pointer(param_type.pack_in(param_in))
 
         return self.parse("""
-            $new = $GListPtr()
+            $new = $ListPtr()
             for $item in $seq:
                 $param_check_pack
                 $new = $new.prepend($item_out)
             $new = $new.reverse()
-            """, seq=name, GListPtr=glib.GListPtr, item=param_in,
+            """, seq=name, ListPtr=self._ptr_type, item=param_in,
             param_check_pack=param_type.block, item_out=param_out)["new"]
 
-    def unpack(self, name):
+    def _get_item_free(self):
+        """Returns a (free_item, free_converted) tuple for items we own.
+
+        free_item frees an item which didn't get converted, or is None if
+        there is nothing to free. If free_converted is True, items need to
+        be freed after converting them as well.
+
+        Raises NotImplementedError if items can't be freed one by one.
+        """
+
+        param_type = self.type.get_param_type(0)
+        tag = param_type.tag.value
+        if tag in (GITypeTag.UTF8, GITypeTag.FILENAME):
+            # converting copies the string
+            return glib.free, True
+        elif tag == GITypeTag.INTERFACE:
+            iface_type = param_type.get_interface().type.value
+            if iface_type in (GIInfoType.OBJECT, GIInfoType.INTERFACE):
+                # the wrapper takes over the reference
+                return gobject.unref, False
+        elif not param_type.is_pointer:
+            return None, False
+
+        raise NotImplementedError(
+            "freeing list items of type %s" % GITypeTag(tag))
+
+    def _unpack_items(self, name, free_item=None):
         param_type = self.type.get_param_type(0)
         ctypes_type = typeinfo_to_ctypes(param_type)
 
@@ -213,6 +1018,11 @@ class GList(BaseType):
         item_in = self.var()
         item_out = p.unpack_return(item_in)
 
+        if free_item is not None:
+            free = "$free_item($entry.data)"
+        else:
+            free = ""
+
         return self.parse("""
             $out = []
             $elm = $in_
@@ -221,9 +1031,72 @@ class GList(BaseType):
                 $item_in = $ctypes_type($entry.data or 0).value
                 $item_unpack
                 $out.append($item_out)
+                %s
                 $elm = $entry.next
-            """, in_=name, ctypes_type=ctypes_type, item_in=item_in,
-            item_out=item_out, item_unpack=p.block)["out"]
+            """ % free, in_=name, ctypes_type=ctypes_type, item_in=item_in,
+            item_out=item_out, item_unpack=p.block,
+            free_item=free_item)["out"]
+
+    def unpack(self, name, own=False, own_items=False):
+        """If own is True the list gets freed after converting or passed
+        to a LazyList. If own_items is True, the items get freed or
+        passed to their wrappers as well.
+        """
+
+        if not own:
+            return self._unpack_items(name)
+
+        free_item = free_converted = None
+        lazy = True
+        if own_items:
+            try:
+                free_item, free_converted = self._get_item_free()
+            except NotImplementedError:
+                # the wrappers take over all items
+                lazy = False
+
+        items = self.get_type(self.type)
+        items_out = items._unpack_items(
+            name, free_item if free_converted else None)
+        items.free(name)
+
+        if not lazy:
+            return self.parse("""
+                $unpack_items
+                $out = $items_out
+                """, unpack_items=items.block, items_out=items_out)["out"]
+
+        param_type = self.type.get_param_type(0)
+        p = self.get_type(param_type)
+        item_in = self.var()
+        item_out = p.unpack_return(item_in)
+        if free_converted:
+            free = "$free_item($ptr)"
+        else:
+            free = ""
+        unpack_item = self.parse("""
+            def $unpack_item($ptr):
+                $item_in = $ctypes_type($ptr or 0).value
+                $item_unpack
+                %s
+                return $item_out
+            """ % free, ctypes_type=typeinfo_to_ctypes(param_type),
+            item_in=item_in, item_unpack=p.block, item_out=item_out,
+            free_item=free_item)["unpack_item"]
+
+        return self.parse("""
+            $out = $unpack_lazy_list($value, $unpack_item, $free_item)
+            if $out is None:
+                $unpack_items
+                $out = $items_out
+            """, value=name, unpack_lazy_list=unpack_lazy_list,
+            unpack_item=unpack_item, free_item=free_item,
+            unpack_items=items.block, items_out=items_out)["out"]
+
+    def new(self):
+        return self.parse("""
+            $list_ = $ListPtr()
+            """, ListPtr=self._ptr_type)["list_"]
 
     def free(self, name):
         return self.parse("""
@@ -231,6 +1104,13 @@ class GList(BaseType):
             """, list_=name)
 
 
+@registry.register(GITypeTag.GLIST)
+class GList(BaseList):
+
+    _ptr_type = glib.GListPtr
+
+
 @registry.register(GITypeTag.GSLIST)
-class GSList(BaseType):
-    pass
+class GSList(BaseList):
+
+    _ptr_type = glib.GSListPtr
@@ -5,14 +5,12 @@
 # License as published by the Free Software Foundation; either
 # version 2.1 of the License, or (at your option) any later version.
 
-import ctypes
-
 from pgi.clib.gir import GITypeTag, GIInfoType, GIStructInfo
-from pgi.clib.gobject import G_TYPE_FROM_INSTANCE, GTypeInstancePtr
 from pgi.clib import glib
 from pgi.gtype import PGType
 from pgi import foreign, _compat
 from pgi.util import import_attribute
+from pgi.wrapper import get_wrapper
 
 from .. import generate_callback_wrapper
 
@@ -70,6 +68,8 @@ class BaseInterface(BaseType):
 class Object(BaseInterface):
 
     def _check(self, name):
+        # passing the wrong object to C isn't memory safe, so this is
+        # needed even if checks are disabled
         if self.may_be_null:
             return self.parse("""
                 if $obj is not $none and not $_.isinstance($obj, $type_class):
@@ -100,23 +100,13 @@ class Object(BaseInterface):
     pack_in = pack_out
 
     def unpack_return(self, name):
-        def get_class_func(pointer):
-            instance = ctypes.cast(pointer, GTypeInstancePtr)
-            gtype = PGType(G_TYPE_FROM_INSTANCE(instance.contents))
-            pytype = gtype.pytype
-            if not pytype:
-                raise RuntimeError("Couldn't find python type for %r" % gtype)
-            return pytype
-
         return self.parse("""
             # unpack object
             if $value:
-                $pyclass = $get_class($value)
-                $obj = $_.object.__new__($pyclass)
-                $obj._obj = $value
+                $obj = $get_wrapper($value)
             else:
                 $obj = None
-            """, value=name, get_class=get_class_func)["obj"]
+            """, value=name, get_wrapper=get_wrapper)["obj"]
 
     unpack_out = unpack_return
 
@@ -211,6 +201,7 @@ class Struct(BaseInterface):
                         "$DESC: %r is not a %r" % ($obj, $struct_class))
                 """, struct_class=foreign_type, obj=name)["obj"]
 
+        # like for objects, this is needed even if checks are disabled
         struct_class = self._import_type()
         if not self.may_be_null:
             return self.parse("""
@@ -348,6 +339,9 @@ class Struct(BaseInterface):
 class Callback(BaseInterface):
 
     def check(self, name):
+        if not self.checks:
+            return name
+
         if self.may_be_null:
             return self.parse("""
                 if not $_.callable($py_cb) and $py_cb is not None:
@@ -372,6 +366,9 @@ class Callback(BaseInterface):
 class Enum(BaseInterface):
 
     def _check(self, name):
+        if not self.checks:
+            return name
+
         return self.parse("""
             if $value not in $base_type._allowed:
                 raise $_.TypeError("$DESC: Invalid enum: %r" % $value)
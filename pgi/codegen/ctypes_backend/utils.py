@@ -17,10 +17,10 @@ from pgi.clib.gobject import GType
 from pgi.clib.gir import GITypeTag, GIInfoType
 from pgi.clib.gobject import GCallback
 
-from ..utils import CodeBlock, TypeTagRegistry
+from ..utils import CodeBlock, TypeTagRegistry, VersionDispatchType
 
 
-class BaseType(object):
+class BaseType(_compat.with_metaclass(VersionDispatchType, object)):
     GI_TYPE_TAG = None
     py_type = None
 
@@ -44,14 +44,11 @@ class BaseType(object):
     def var(self):
         return self._gen.var()
 
-    def __getattribute__(self, name):
-        try:
-            if _compat.PY3:
-                return object.__getattribute__(self, name + "_py3")
-            else:
-                return object.__getattribute__(self, name + "_py2")
-        except AttributeError:
-            return object.__getattribute__(self, name)
+    @property
+    def checks(self):
+        """False if argument checks should be left out"""
+
+        return self._gen.checks
 
     @classmethod
     def get_class(cls, type_):
@@ -131,7 +128,7 @@ def typeinfo_to_ctypes(info, return_value=False):
                 return gpointer
             else:
                 return gchar_p
-        elif tag == GITypeTag.ARRAY:
+        elif tag in (GITypeTag.ARRAY, GITypeTag.GHASH):
             return gpointer
         elif tag == GITypeTag.ERROR:
             return GErrorPtr
@@ -148,7 +145,7 @@ def typeinfo_to_ctypes(info, return_value=False):
             iface_type = iface.type.value
             if iface_type == GIInfoType.ENUM:
                 return guint32
-            elif iface_type == GIInfoType.OBJECT:
+            elif iface_type in (GIInfoType.OBJECT, GIInfoType.INTERFACE):
                 return gpointer
             elif iface_type == GIInfoType.STRUCT:
                 return gpointer
@@ -8,8 +8,10 @@
 import traceback
 
 from .fields import get_field_class
-from .backend import list_backends
+from .backend import list_backends, acquire_backend, release_backend
 from .utils import CodeBlock
+from . import profile
+from . import stats
 
 
 def _generate_field_setter(info, info_type, backend):
@@ -72,25 +74,33 @@ def _generate_field_getter(info, info_type, backend):
 
 
 def _generate_field_access(info, setter=True):
+    profile.record_field(info, setter)
+
+    start = stats.start()
     info_type = info.get_type()
 
     func = None
     messages = []
     for backend in list_backends():
-        instance = backend()
+        instance = acquire_backend(backend)
         try:
             if setter:
                 func = _generate_field_setter(info, info_type, instance)
             else:
                 func = _generate_field_getter(info, info_type, instance)
         except NotImplementedError:
+            stats.fallback(info.namespace, backend.NAME)
             messages.append("%s: %s" % (backend.NAME, traceback.format_exc()))
         else:
             break
+        finally:
+            release_backend(instance)
 
     if func:
+        stats.stop(start, "field", info.namespace, backend.NAME)
         return func
 
+    stats.stop(start, "field", info.namespace, None)
     raise NotImplementedError("\n".join(messages))
 
 
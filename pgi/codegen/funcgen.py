@@ -7,9 +7,15 @@
 
 import re
 import traceback
+import collections
 
 from ..util import ResultTuple
 from .backend import list_backends, get_backend
+from .backend import acquire_backend, release_backend, get_checks
+from . import cache
+from . import profile
+from . import stats
+from .templates import template_cache, get_template_names
 from .utils import CodeBlock
 from pgi.util import escape_identifier, escape_parameter, cache_return
 from .arguments import get_argument_class, ErrorArgument
@@ -133,12 +139,39 @@ def build_docstring(func_name, args, ret, throws, signal_owner_type=None):
 
 
 def _generate_function(backend, info, arg_infos, arg_types,
-                       return_type, method):
+                       return_type, method, names=None):
+    """names can be a (func_name, arg_names) tuple which replaces the
+    names from the infos.
+    """
+
+    main, func_name, docstring = _build_function(
+        backend, info, arg_infos, arg_types, return_type, method, names)
+
+    func = main.compile()[func_name]
+    func._code = main
+    func.__doc__ = docstring
+    func.__module__ = info.namespace
+
+    return func
+
+
+def _build_function(backend, info, arg_infos, arg_types,
+                    return_type, method, names=None):
+    """Returns a (code_block, func_name, docstring) tuple"""
+
+    backend.checks = get_checks(info.namespace)
+
+    if names is None:
+        func_name = escape_identifier(info.name)
+        desc_name = info.name
+        arg_names = [escape_identifier(a.name) for a in arg_infos]
+    else:
+        func_name, arg_names = names
+        desc_name = func_name
 
     args = []
-    for arg_info, arg_type in zip(arg_infos, arg_types):
+    for name, arg_info, arg_type in zip(arg_names, arg_infos, arg_types):
         cls = get_argument_class(arg_type)
-        name = escape_identifier(arg_info.name)
         args.append(cls(name, args, backend, arg_info, arg_type))
 
     cls = get_return_class(return_type)
@@ -159,7 +192,7 @@ def _generate_function(backend, info, arg_infos, arg_types,
 
     # set description used for exceptions
     for i, arg in enumerate(in_args):
-        arg.desc = "%s() argument '%s'(%d)" % (info.name, arg.in_var, i + 1)
+        arg.desc = "%s() argument '%s'(%d)" % (desc_name, arg.in_var, i + 1)
 
     # if the last in argument is a user data, make it a var-positional argument
     if in_args and in_args[-1].is_userdata:
@@ -263,25 +296,131 @@ return $ntuple((%s))
 
     # build final function block
 
-    func_name = escape_identifier(info.name)
-
-    docstring = build_docstring(func_name, args, return_value, throws)
-
     main, var = backend.parse("""
 # backend: $backend_name
 def $func_name($func_args):
-    '''$docstring'''
-
     $func_body
-""", backend_name=backend.NAME, func_args=in_names, docstring=docstring,
-     func_body=body, func_name=func_name)
+""", backend_name=backend.NAME, func_args=in_names, func_body=body,
+         func_name=func_name)
 
-    func = main.compile()[func_name]
-    func._code = main
-    func.__doc__ = docstring
-    func.__module__ = info.namespace
+    docstring = build_docstring(func_name, args, return_value, throws)
+    return main, func_name, docstring
+
+
+def get_cache_name(backend, namespace):
+    """Returns the name the function cache uses for generated code,
+    which differs if argument checks are disabled.
+    """
+
+    if get_checks(namespace):
+        return backend.NAME
+    return backend.NAME + "-nochecks"
 
-    return func
+
+def generate_functions(items):
+    """Like generate_function, but takes a list of (info, method) tuples.
+    The code for all signatures without a template gets compiled in one go.
+
+    Returns a list of functions, or None for the ones which failed.
+    """
+
+    start = stats.start()
+    items = list(items)
+    backend = acquire_backend(list_backends()[0])
+    try:
+        funcs = _generate_functions(backend, items)
+    finally:
+        release_backend(backend)
+
+    # we can't tell how long each one took, use the average
+    if start is not None and items:
+        duration = stats.elapsed(start) / len(items)
+        for item in items:
+            if item is not None:
+                stats.add("function", item[0].namespace, backend.NAME,
+                          duration)
+
+    return funcs
+
+
+def _generate_functions(backend, items):
+    var_fac = backend.var
+
+    module = CodeBlock()
+    module_deps = module.get_dependencies()
+    blocks = collections.OrderedDict()
+    pending = []
+    funcs = [None] * len(items)
+    for index, (info, method) in enumerate(items):
+        profile.record_function(info, method)
+        func = cache.lookup_function(
+            info, method, get_cache_name(backend, info.namespace))
+        if func is not None:
+            funcs[index] = func
+            continue
+
+        arg_infos = list(info.get_args())
+        arg_types = [a.get_type() for a in arg_infos]
+        return_type = info.get_return_type()
+
+        key, ifaces = template_cache.get_key(
+            backend, info, arg_infos, arg_types, return_type, method)
+        pending.append((index, info, method, arg_infos, key, ifaces))
+        if key in template_cache or key in blocks:
+            continue
+
+        # all blocks share the variable factory so the global names are
+        # unique, the local ones only have to be unique per function
+        var_fac.clear_blacklist()
+        names = get_template_names(arg_infos, len(blocks))
+        try:
+            block = _build_function(backend, info, arg_infos, arg_types,
+                                    return_type, method, names)
+        except NotImplementedError:
+            block = None
+        else:
+            main = block[0]
+            deps = main.get_dependencies()
+            if not any(module_deps.get(n, o) is not o
+                       for n, o in deps.items()):
+                main.write_into(module)
+        blocks[key] = (info, ifaces, block)
+
+    global_dict = module.compile()
+    templates = {}
+    for key, (info, ifaces, block) in blocks.items():
+        func = None
+        if block is not None:
+            main, func_name, docstring = block
+            if func_name in global_dict:
+                func = global_dict[func_name]
+            else:
+                func = main.compile()[func_name]
+            func._code = main
+            func.__doc__ = docstring
+            func.__module__ = info.namespace
+        templates[key] = template_cache.add(key, func, backend, info, ifaces)
+
+    for index, info, method, arg_infos, key, ifaces in pending:
+        if key in templates:
+            func = template_cache.bind_template(
+                templates[key], backend, info, arg_infos, ifaces)
+        else:
+            func = template_cache.bind(key, backend, info, arg_infos, ifaces)
+
+        if func is not None:
+            cache.store_function(
+                info, method, get_cache_name(backend, info.namespace), func)
+        else:
+            # this one gets counted by generate_function()
+            items[index] = None
+            try:
+                func = generate_function(info, method)
+            except NotImplementedError:
+                pass
+        funcs[index] = func
+
+    return funcs
 
 
 def generate_function(info, method=False):
@@ -289,24 +428,73 @@ def generate_function(info, method=False):
 
     assert isinstance(info, GIFunctionInfo)
 
+    profile.record_function(info, method)
+
+    start = stats.start()
+    try:
+        func, backend_name = _generate_function_any(info, method)
+    except NotImplementedError:
+        stats.stop(start, "function", info.namespace, None)
+        raise
+    stats.stop(start, "function", info.namespace, backend_name)
+    return func
+
+
+def _generate_function_any(info, method):
+    """Returns a (function, backend_name) tuple using the first backend
+    which succeeds.
+    """
+
+    backends = list_backends()
+    cache_name = get_cache_name(backends[0], info.namespace)
+    func = cache.lookup_function(info, method, cache_name)
+    if func is not None:
+        return func, backends[0].NAME
+
     arg_infos = list(info.get_args())
     arg_types = [a.get_type() for a in arg_infos]
     return_type = info.get_return_type()
 
-    func = None
+    instance = acquire_backend(backends[0])
+    try:
+        func = template_cache.generate(
+            _generate_function, instance, info, arg_infos, arg_types,
+            return_type, method)
+    finally:
+        release_backend(instance)
+
+    if func is None:
+        try:
+            func, backend_name = _generate_with_backends(
+                info, arg_infos, arg_types, return_type, method)
+        except NotImplementedError as e:
+            cache.store_error(info, method, cache_name, str(e))
+            raise
+    else:
+        backend_name = backends[0].NAME
+
+    cache.store_function(info, method, cache_name, func)
+    return func, backend_name
+
+
+def _generate_with_backends(info, arg_infos, arg_types, return_type, method):
+    """Returns a (function, backend_name) tuple using the first backend
+    which succeeds. Raises NotImplementedError if all of them fail.
+    """
+
     messages = []
     for backend in list_backends():
-        instance = backend()
+        instance = acquire_backend(backend)
         try:
             func = _generate_function(instance, info, arg_infos, arg_types,
                                       return_type, method)
         except NotImplementedError:
+            stats.fallback(info.namespace, backend.NAME)
             messages.append("%s: %s" % (backend.NAME, traceback.format_exc()))
         else:
-            break
-
-    if func:
-        return func
+            return func, backend.NAME
+        finally:
+            release_backend(instance)
 
     raise NotImplementedError("\n".join(messages))
 
@@ -323,15 +511,29 @@ def generate_dummy_callable(info, func_name, method=False,
 
     assert isinstance(info, GICallableInfo)
 
+    start = stats.start()
+
+    # the null backend is good enough here
+    backend = acquire_backend(get_backend("null"))
+    try:
+        func = _generate_dummy_callable(
+            backend, info, func_name, method, signal_owner_type)
+    finally:
+        release_backend(backend)
+
+    stats.stop(start, "dummy", info.namespace, backend.NAME)
+
+    return func
+
+
+def _generate_dummy_callable(backend, info, func_name, method,
+                             signal_owner_type):
     # FIXME: handle out args and trailing user_data ?
 
     arg_infos = list(info.get_args())
     arg_types = [a.get_type() for a in arg_infos]
     return_type = info.get_return_type()
 
-    # the null backend is good enough here
-    backend = get_backend("null")()
-
     args = []
     for arg_info, arg_type in zip(arg_infos, arg_types):
         cls = get_argument_class(arg_type)
@@ -369,10 +571,8 @@ def generate_dummy_callable(info, func_name, method=False,
 
     main, var = backend.parse("""
 def $func_name($func_args):
-    '''$docstring'''
-
     raise NotImplementedError("This is just a dummy callback function")
-""", func_args=", ".join(in_names), docstring=docstring, func_name=func_name)
+""", func_args=", ".join(in_names), func_name=func_name)
 
     func = main.compile()[func_name]
     func._code = main
@@ -0,0 +1,205 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Recording and replaying of the set of generated functions.
+
+A profile is a text file with one tab separated record per line, in the
+order things were first generated:
+
+    function    Gio    File    get_path    1
+    constructor Gio    SimpleAction    name,enabled
+    getter      GLib   Date    day
+    setter      GLib   Date    day
+    signal      Gio    Application    activate
+
+Replaying a profile at startup generates exactly that set up front.
+"""
+
+import os
+import atexit
+import threading
+import collections
+
+from pgi.util import escape_identifier, import_attribute, import_module
+
+
+_HEADER = "# pgi profile 1"
+
+_recording = []
+
+
+class _Recording(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.records = collections.OrderedDict()
+        if os.path.exists(path):
+            for record in load_profile(path):
+                self.records[record] = None
+
+    def save(self):
+        lines = [_HEADER]
+        lines.extend("\t".join(r) for r in self.records)
+        with open(self.path, "w") as h:
+            h.write("\n".join(lines) + "\n")
+
+
+def _record(*args):
+    if _recording:
+        _recording[0].records[args] = None
+
+
+def _container_name(info):
+    container = info.get_container()
+    if container is None:
+        return ""
+    return container.name
+
+
+def record_function(info, method):
+    if _recording:
+        _record("function", info.namespace, _container_name(info),
+                info.name, str(int(method)))
+
+
+def record_constructor(cls, names):
+    if _recording:
+        # the class created from the typelib, not an override
+        for base in cls.__mro__:
+            if "_constructors" in vars(base):
+                cls = base
+                break
+        _record("constructor", cls.__module__, cls.__name__,
+                ",".join(names))
+
+
+def record_field(info, setter):
+    if _recording:
+        _record("setter" if setter else "getter", info.namespace,
+                _container_name(info), info.name)
+
+
+def record_signal(info):
+    if _recording:
+        _record("signal", info.namespace, _container_name(info), info.name)
+
+
+def record_profile(path):
+    """Records everything generated from now on and writes it to path at
+    exit, merged with the existing content. Pass None to stop recording and
+    write the file.
+    """
+
+    if _recording:
+        _recording.pop().save()
+
+    if path is not None:
+        _recording.append(_Recording(path))
+
+
+@atexit.register
+def _save_recording():
+    if _recording:
+        _recording[0].save()
+
+
+def load_profile(path):
+    """Returns a list of records. Raises EnvironmentError."""
+
+    records = []
+    with open(path, "r") as h:
+        for line in h:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            records.append(tuple(line.split("\t")))
+    return records
+
+
+def _get_class(namespace, name):
+    try:
+        return import_attribute(namespace, name)
+    except (ImportError, NotImplementedError):
+        return
+
+
+def _replay(records, batch):
+    from pgi.obj import MethodAttribute, _install_methods
+    from pgi.field import FieldAttribute
+    from .fieldgen import generate_field_getter, generate_field_setter
+    from .siggen import generate_signal_callback
+
+    methods = []
+    for record in records:
+        kind, namespace, container, name = record[:4]
+
+        if kind == "function" and not container:
+            try:
+                getattr(import_module(namespace), escape_identifier(name))
+            except Exception:
+                pass
+            continue
+
+        cls = _get_class(namespace, container)
+        if cls is None:
+            continue
+
+        try:
+            if kind == "function":
+                attr = vars(cls).get(escape_identifier(name))
+                if isinstance(attr, MethodAttribute):
+                    methods.append((attr, attr._is_method()))
+            elif kind == "constructor":
+                if getattr(cls, "_constructors", None) is not None:
+                    names = tuple(n for n in name.split(",") if n)
+                    cls._generate_constructor(names)
+            elif kind in ("getter", "setter"):
+                attr = vars(cls).get(escape_identifier(name))
+                if isinstance(attr, FieldAttribute):
+                    if kind == "getter" and not attr._getter:
+                        attr._getter = generate_field_getter(attr._info)
+                    elif kind == "setter" and not attr._setter:
+                        attr._setter = generate_field_setter(attr._info)
+            elif kind == "signal":
+                info = getattr(cls, "__sigs__", {}).get(name)
+                if info is not None:
+                    generate_signal_callback(info)
+        except NotImplementedError:
+            pass
+
+    _install_methods(methods, batch)
+
+
+def replay_profile(path, background=False):
+    """Generates everything recorded in the profile at path. With
+    background the work happens in a new thread, which gets returned.
+
+    Raises EnvironmentError in case the file can't be read.
+    """
+
+    records = load_profile(path)
+
+    # import in this thread, to keep the import lock out of the background
+    for namespace in set(r[1] for r in records if len(r) > 1):
+        try:
+            import_module(namespace)
+        except ImportError:
+            pass
+
+    records = [r for r in records if len(r) >= 4]
+    if not background:
+        _replay(records, batch=True)
+        return
+
+    thread = threading.Thread(target=_replay, args=(records, False))
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+if "PGI_RECORD_PROFILE" in os.environ:
+    record_profile(os.environ["PGI_RECORD_PROFILE"])
@@ -0,0 +1,128 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Generates getters and setters for GObject properties, once per
+GParamSpec.
+"""
+
+import ctypes
+
+from pgi.clib.glib import g_malloc0
+from pgi.clib.gobject import GValue, value_init, value_unset
+from pgi.clib.gobject import object_get_property, object_set_property
+from pgi.gvalue import get_packer, get_unpacker
+from .backend import get_backend
+from . import stats
+
+
+# Addresses of unset GValues shared by all accessors. Every access takes
+# its own, so nested or concurrent ones can't clash.
+_values = []
+
+
+def _new_value():
+    value = g_malloc0(ctypes.sizeof(GValue))
+    if not value:
+        raise MemoryError
+    return value
+
+
+def _decode(name):
+    if isinstance(name, bytes):
+        return name.decode("utf-8")
+    return name
+
+
+def _generate_property_getter(backend, name, gtype):
+    block, var = backend.parse("""
+def $getter(instance):
+    $obj = instance._object
+    if not $obj:
+        raise $_.TypeError("Object not initialized")
+    try:
+        $value = $pop()
+    except $_.IndexError:
+        $value = $new_value()
+    $init($value, $gtype)
+    try:
+        $get_property($obj, $name, $value)
+        return $unpack($value)
+    finally:
+        $unset($value)
+        $push($value)
+""", getter="getter", name=repr(name), gtype=str(gtype),
+        pop=_values.pop, push=_values.append, new_value=_new_value,
+        init=value_init, unset=value_unset,
+        get_property=object_get_property, unpack=get_unpacker(gtype))
+
+    func = block.compile()["getter"]
+    func._code = block
+    return func
+
+
+def _generate_property_setter(backend, name, gtype):
+    block, var = backend.parse("""
+def $setter(instance, $py_value):
+    $obj = instance._object
+    if not $obj:
+        raise $_.TypeError("Object not initialized")
+    try:
+        $value = $pop()
+    except $_.IndexError:
+        $value = $new_value()
+    $init($value, $gtype)
+    try:
+        try:
+            $pack($value, $py_value)
+        except $ctypes.ArgumentError as $error:
+            raise $_.TypeError($message + $_.str($error))
+        $set_property($obj, $name, $value)
+    finally:
+        $unset($value)
+        $push($value)
+""", setter="setter", name=repr(name), gtype=str(gtype),
+        pop=_values.pop, push=_values.append, new_value=_new_value,
+        init=value_init, unset=value_unset,
+        set_property=object_set_property, pack=get_packer(gtype),
+        message=repr("property %r: " % _decode(name)))
+
+    func = block.compile()["setter"]
+    func._code = block
+    return func
+
+
+def _generate_property_access(name, gtype, namespace, setter):
+    start = stats.start()
+    backend = get_backend("ctypes")()
+    try:
+        if setter:
+            func = _generate_property_setter(backend, name, gtype)
+        else:
+            func = _generate_property_getter(backend, name, gtype)
+    except NotImplementedError:
+        stats.stop(start, "property", namespace, None)
+        raise
+    stats.stop(start, "property", namespace, backend.NAME)
+    return func
+
+
+def generate_property_getter(name, gtype, namespace):
+    """Returns a function taking a GProps instance and returning the value
+    of the property name (bytes) which has a value type of gtype (int).
+
+    Raises NotImplementedError if the type isn't supported.
+    """
+
+    return _generate_property_access(name, gtype, namespace, False)
+
+
+def generate_property_setter(name, gtype, namespace):
+    """Like generate_property_getter() but the function takes the new
+    value as second argument.
+    """
+
+    return _generate_property_access(name, gtype, namespace, True)
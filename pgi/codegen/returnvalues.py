@@ -8,7 +8,6 @@
 from pgi.clib.gir import GITypeTag, GIInfoType, GITransfer, GIArrayType
 from pgi.gtype import PGType
 from pgi.gerror import PGError
-from pgi.util import import_attribute
 from pgi import _compat
 
 
@@ -122,25 +121,17 @@ class ArrayReturn(BaseArrayReturn):
         return None
 
     def post_call(self, name):
-        return None, name
-
-
-class ByteArrayReturn(BaseArrayReturn):
-
-    def pre_call(self):
-        return None
-
-    def post_call(self, name):
-        return None, name
+        var = self.get_type()
+        out = var.unpack(name, not self.transfer_nothing())
+        return var.block, out
 
 
-class PtrArrayReturn(BaseArrayReturn):
+class ByteArrayReturn(ArrayReturn):
+    pass
 
-    def pre_call(self):
-        return None
 
-    def post_call(self, name):
-        return None, name
+class PtrArrayReturn(ArrayReturn):
+    pass
 
 
 class CArrayReturn(BaseArrayReturn):
@@ -162,10 +153,11 @@ class CArrayReturn(BaseArrayReturn):
 
     def post_call(self, name):
         var = self.get_type()
+        own = not self.transfer_nothing()
         if self.type.array_length != -1:
-            out = var.unpack(name, self._length_var)
+            out = var.unpack(name, self._length_var, own)
         else:
-            out = var.unpack(name, None)
+            out = var.unpack(name, None, own)
         return var.block, out
 
 
@@ -274,8 +266,8 @@ class GHashReturn(ReturnValue):
 
     def post_call(self, name):
         var = self.get_type()
-        # FIXME
-        return var.block, name
+        out = var.unpack(name, not self.transfer_nothing())
+        return var.block, out
 
 
 class GListReturn(ReturnValue):
@@ -287,27 +279,13 @@ class GListReturn(ReturnValue):
 
     def post_call(self, name):
         var = self.get_type()
-        out = var.unpack(name)
-        if self.transfer_container():
-            var.free(name)
-        elif self.transfer_everything():
-            #FIXME: leaking
-            var.free(name)
-
+        out = var.unpack(
+            name, not self.transfer_nothing(), self.transfer_everything())
         return var.block, out
 
 
-class GSListReturn(ReturnValue):
+class GSListReturn(GListReturn):
     TAG = GITypeTag.GSLIST
-    py_type = list
-
-    def setup(self):
-        self.py_type = [self.get_param_type(0).py_type]
-
-    def post_call(self, name):
-        # FIXME
-        var = self.get_type()
-        return var.block, name
 
 
 class FilenameReturnValue(Utf8ReturnValue):
@@ -320,12 +298,10 @@ class BaseInterfaceReturn(ReturnValue):
     py_type = object
 
     def setup(self):
+        # only used for docs, use the name so we don't have to import
+        # the class here
         iface = self.type.get_interface()
-        try:
-            self.py_type = import_attribute(iface.namespace, iface.name)
-        except ImportError:
-            # fall back to object
-            pass
+        self.py_type = "%s.%s" % (iface.namespace, iface.name)
 
     @classmethod
     def get_class(cls, type_):
@@ -9,9 +9,26 @@ from .backend import get_backend
 from .utils import CodeBlock
 from .cbargs import get_cbarg_class
 from .cbreturn import get_cbreturn_class
+from . import profile
+from . import stats
 from pgi.util import escape_identifier, escape_parameter
 
 
+# (namespace, container, name) -> result, for signal and callback infos
+_signal_cache = {}
+_callback_cache = {}
+
+
+def _get_cache_key(info):
+    """Returns a hashable key for info or None if it has no name"""
+
+    if not info.name:
+        return
+    container = info.get_container()
+    container_name = container.name if container is not None else ""
+    return (info.namespace, container_name, info.name)
+
+
 def build_docstring(cb_name, args):
     parts = []
     for arg in args:
@@ -24,8 +41,24 @@ def build_docstring(cb_name, args):
 
 
 def generate_callback_wrapper(info):
+    key = _get_cache_key(info)
+    if key in _callback_cache:
+        return _callback_cache[key]
+
+    start = stats.start()
     backend = get_backend("ctypes")()
+    try:
+        result = _generate_callback_wrapper(backend, info)
+    except NotImplementedError:
+        stats.stop(start, "callback", info.namespace, None)
+        raise
+    stats.stop(start, "callback", info.namespace, backend.NAME)
+    if key is not None:
+        result = _callback_cache.setdefault(key, result)
+    return result
 
+
+def _generate_callback_wrapper(backend, info):
     args = list(info.get_args())
     arg_types = [a.get_type() for a in args]
 
@@ -68,24 +101,33 @@ def generate_callback_wrapper(info):
 
     docstring = build_docstring(func_name, cb_args)
 
+    factory_name = backend.var()
+
     block, var = backend.parse("""
-def $cb_wrapper($args):
-    $body
-    # $docstring
-    $ret = $callback($out_args)
-    $post
-    return $out
+def $factory($callback):
+    def $cb_wrapper($args):
+        $body
+        # $docstring
+        $ret = $callback($out_args)
+        $post
+        return $out
+    return $cb_wrapper
 """, args=argument_list, out_args=forward_arguments, cb_wrapper=func_name,
      callback=cb_name, body=body, docstring=docstring, ret=return_var,
-     out=out_var, post=return_block)
+     out=out_var, post=return_block, factory=factory_name)
+
+    factory = block.compile()[factory_name]
 
     def create_cb_for_func(real_func):
+        start = stats.start()
         if real_func is not None:
-            # binds the callback to the block and compiles it
-            func = block.compile(**{cb_name: real_func})[func_name]
+            # binds the callback through the closure of the wrapper
+            func = factory(real_func)
         else:
             func = None
-        return backend.get_callback(func, cb_args, return_value)
+        cb = backend.get_callback(func, cb_args, return_value)
+        stats.stop(start, "callback-closure", info.namespace, backend.NAME)
+        return cb
 
     return create_cb_for_func, docstring
 
@@ -126,32 +168,59 @@ def _generate_signal_callback(backend, info, args, arg_types):
     return_block, out_var = return_value.process(return_var)
     return_block = return_block or CodeBlock()
 
+    factory_name = backend.var()
+
     block, var = backend.parse("""
-def $cb_wrapper($dummy, $args):
-    $body
-    $ret = $callback($out_args)
-    $post
-    return $out
+def $factory($callback):
+    def $cb_wrapper($instance, $args):
+        $body
+        $ret = $callback($instance, $out_args)
+        $post
+        return $out
+    return $cb_wrapper
 """, args=argument_list, out_args=forward_arguments, cb_wrapper=func_name,
      callback=cb_name, body=body, post=return_block, out=out_var,
-     ret=return_var)
+     ret=return_var, factory=factory_name)
+
+    factory = block.compile()[factory_name]
 
     def create_sig_for_func(real_func):
-        f = block.compile(**{cb_name: real_func})[func_name]
-        return backend.get_callback(f, sig_args, return_value, is_signal=True)
+        start = stats.start()
+        f = factory(real_func)
+        stats.stop(start, "signal-closure", info.namespace, backend.NAME)
+        return f
 
     return create_sig_for_func
 
 
 def generate_signal_callback(info):
+    """Returns a function which takes a Python callable and returns
+    a function converting the ctypes level signal arguments. The callable
+    gets the instance address followed by the converted arguments.
+
+    The wrapper code gets compiled once per signal, connecting only
+    creates a new closure.
+    """
+
+    profile.record_signal(info)
+
+    key = _get_cache_key(info)
+    if key in _signal_cache:
+        return _signal_cache[key]
+
     args = list(info.get_args())
     arg_types = [a.get_type() for a in args]
     backend = get_backend("ctypes")()
 
+    start = stats.start()
     cb_func = None
     try:
         cb_func = _generate_signal_callback(backend, info, args, arg_types)
     except NotImplementedError:
+        stats.stop(start, "signal", info.namespace, None)
         raise
+    stats.stop(start, "signal", info.namespace, backend.NAME)
 
+    if key is not None:
+        cb_func = _signal_cache.setdefault(key, cb_func)
     return cb_func
@@ -0,0 +1,95 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Counters and timings for the code generation entry points.
+
+Disabled by default; start() returns None in that case and stop() and
+fallback() return right away.
+"""
+
+import time
+import threading
+
+from pgi.util import encode_cache
+
+
+_timer = getattr(time, "perf_counter", time.time)
+
+_enabled = []
+_lock = threading.Lock()
+# (kind, namespace, backend) -> [count, seconds]
+_counters = {}
+# (namespace, backend) -> count
+_fallbacks = {}
+
+
+def set_enabled(enabled):
+    del _enabled[:]
+    if enabled:
+        _enabled.append(True)
+    encode_cache.set_counting(enabled)
+
+
+def start():
+    """Returns a start time or None if disabled"""
+
+    if _enabled:
+        return _timer()
+
+
+def elapsed(start):
+    return _timer() - start
+
+
+def stop(start, kind, namespace, backend_name):
+    """Adds a measurement started with start(). backend_name is None in case
+    generating failed.
+    """
+
+    if start is not None:
+        add(kind, namespace, backend_name, elapsed(start))
+
+
+def add(kind, namespace, backend_name, duration):
+    key = (kind, namespace, backend_name or "failed")
+    with _lock:
+        entry = _counters.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+
+
+def fallback(namespace, backend_name):
+    """Counts a backend which failed, making us try the next one"""
+
+    if not _enabled:
+        return
+
+    key = (namespace, backend_name)
+    with _lock:
+        _fallbacks[key] = _fallbacks.get(key, 0) + 1
+
+
+def get_stats():
+    """Returns a dict with all measurements, see pgi.debug.stats()"""
+
+    result = {}
+    with _lock:
+        for (kind, namespace, backend_name), entry in _counters.items():
+            per_ns = result.setdefault(kind, {}).setdefault(namespace, {})
+            per_ns[backend_name] = {"count": entry[0], "time": entry[1]}
+
+        fallbacks = result["fallbacks"] = {}
+        for (namespace, backend_name), count in _fallbacks.items():
+            fallbacks.setdefault(namespace, {})[backend_name] = count
+
+    return result
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _fallbacks.clear()
@@ -0,0 +1,352 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Sharing of generated code between functions with the same signature.
+
+Many functions only differ in their name, their argument names, the C
+function they call and the classes of their object/enum/flags arguments.
+For each signature shape we generate the code once, using placeholder
+names, and create new functions from it by replacing the placeholders and
+binding the C function and the classes.
+"""
+
+import re
+import ctypes
+import types
+import threading
+
+from pgi.clib.gir import GITypeTag, GIInfoType, GIFunctionInfoFlags
+from pgi.clib.gir import GIDirection
+from pgi.util import escape_identifier, import_attribute
+from pgi import _compat
+
+from .backend import get_checks
+
+
+_FUNC_NAME = "_pgi_f%s_"
+_ARG_NAME = "_pgi_a%d_"
+_IFACE_NAME = "_pgi_i%d_"
+_TOKEN_RE = re.compile(r"_pgi_[fai]\d*_")
+
+# interfaces which only reference their class in the generated code.
+# For all other ones the interface itself becomes part of the key.
+_BOUND_IFACE_TYPES = (GIInfoType.OBJECT, GIInfoType.INTERFACE,
+                      GIInfoType.ENUM, GIInfoType.FLAGS)
+
+
+def _get_type_key(type_, ifaces):
+    tag = type_.tag.value
+    key = [tag, type_.is_pointer]
+
+    if tag == GITypeTag.INTERFACE:
+        iface = type_.get_interface()
+        iface_type = iface.type.value
+        key.append(iface_type)
+        if iface_type in _BOUND_IFACE_TYPES:
+            ifaces.append(iface)
+        else:
+            key.extend([iface.namespace, iface.name])
+    elif tag == GITypeTag.ARRAY:
+        key.extend([type_.array_type.value, type_.array_length,
+                    type_.array_fixed_size, type_.is_zero_terminated,
+                    _get_type_key(type_.get_param_type(0), ifaces)])
+    elif tag in (GITypeTag.GLIST, GITypeTag.GSLIST):
+        key.append(_get_type_key(type_.get_param_type(0), ifaces))
+    elif tag == GITypeTag.GHASH:
+        key.extend([_get_type_key(type_.get_param_type(0), ifaces),
+                    _get_type_key(type_.get_param_type(1), ifaces)])
+
+    return tuple(key)
+
+
+def get_signature_key(info, arg_infos, arg_types, return_type, method):
+    """Returns a hashable key describing everything the generated code
+    depends on, except the names, the C function and the classes of the
+    interfaces in the returned list.
+    """
+
+    ifaces = []
+    key = [method, bool(info.flags.value & GIFunctionInfoFlags.THROWS)]
+
+    outs = []
+    for arg_info, arg_type in zip(arg_infos, arg_types):
+        direction = arg_info.direction.value
+        key.append((
+            _get_type_key(arg_type, ifaces), direction,
+            arg_info.ownership_transfer.value, arg_info.may_be_null,
+            arg_info.is_caller_allocates, arg_info.closure,
+            arg_info.destroy))
+        if direction != GIDirection.IN:
+            outs.append(escape_identifier(arg_info.name))
+
+    key.append((_get_type_key(return_type, ifaces),
+                info.caller_owns.value, info.may_return_null))
+
+    # out argument names end up in the result tuple type
+    if len(outs) > 1 or (outs and return_type.tag.value != GITypeTag.VOID):
+        key.append(tuple(outs))
+
+    # which interfaces are the same, they share a variable
+    names = [(i.namespace, i.name) for i in ifaces]
+    key.append(tuple(names.index(n) for n in names))
+
+    return tuple(key), ifaces
+
+
+def _rename_code(code, mapping, replace):
+    """Returns a new code object with all variable names replaced according
+    to mapping and all string constants passed through replace().
+    """
+
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            const = _rename_code(const, mapping, replace)
+        elif isinstance(const, str) and "_pgi_" in const:
+            const = replace(const)
+        consts.append(const)
+
+    kwargs = {
+        "co_consts": tuple(consts),
+        "co_varnames": tuple(mapping.get(n, n) for n in code.co_varnames),
+        "co_cellvars": tuple(mapping.get(n, n) for n in code.co_cellvars),
+        "co_freevars": tuple(mapping.get(n, n) for n in code.co_freevars),
+        "co_name": mapping.get(code.co_name, code.co_name),
+    }
+    if hasattr(code, "co_qualname"):
+        kwargs["co_qualname"] = _TOKEN_RE.sub(
+            lambda m: mapping.get(m.group(), m.group()), code.co_qualname)
+    return code.replace(**kwargs)
+
+
+class _Template(object):
+
+    def __init__(self, func_name, code, deps, source, doc, handle_name,
+                 iface_names, reserved):
+        self.func_name = func_name
+        self.code = code
+        self.deps = deps
+        self.source = source
+        self.doc = doc
+        self.handle_name = handle_name
+        self.iface_names = iface_names
+        self.reserved = reserved
+
+    def bind(self, backend, info, arg_infos, ifaces):
+        """Returns a new function or None if the names clash with the
+        template.
+        """
+
+        from .cache import _source_block
+
+        mapping = {self.func_name: escape_identifier(info.name)}
+        for i, arg_info in enumerate(arg_infos):
+            name = escape_identifier(arg_info.name)
+            if name in self.reserved or name in mapping:
+                return
+            mapping[_ARG_NAME % i] = name
+
+        deps = dict(self.deps)
+        lib = backend.get_library(info.namespace)
+        deps[self.handle_name] = backend.rebind_function(
+            self.deps[self.handle_name], lib, info.symbol)
+
+        doc_mapping = dict(mapping)
+        for i, iface in enumerate(ifaces):
+            doc_mapping[_IFACE_NAME % i] = "%s.%s" % (
+                iface.namespace, iface.name)
+
+        # only import the classes the code references
+        for name, index in self.iface_names.items():
+            iface = ifaces[index]
+            try:
+                deps[name] = import_attribute(iface.namespace, iface.name)
+            except ImportError:
+                return
+
+        # error messages use the unescaped name
+        str_mapping = dict(mapping)
+        str_mapping[self.func_name] = info.name
+
+        def replace(s):
+            return _TOKEN_RE.sub(
+                lambda m: str_mapping.get(m.group(), m.group()), s)
+
+        global_dict = dict(deps)
+        global_dict["__builtins__"] = _compat.builtins
+        code = _rename_code(self.code, mapping, replace)
+        func = types.FunctionType(code, global_dict, code.co_name)
+        source = self.source.replace(
+            "def %s(" % self.func_name, "def %s(" % mapping[self.func_name],
+            1)
+        func._code = _source_block(replace(source), deps)
+        func.__doc__ = _TOKEN_RE.sub(
+            lambda m: doc_mapping.get(m.group(), m.group()), self.doc)
+        func.__module__ = info.namespace
+        return func
+
+
+def get_template_names(arg_infos, index=None):
+    """Returns the (func_name, arg_names) placeholders to generate a
+    template function with. Functions compiled together need a different
+    index each.
+    """
+
+    func_name = _FUNC_NAME % ("" if index is None else index)
+    return func_name, [_ARG_NAME % i for i in range(len(arg_infos))]
+
+
+def _create_template(func, backend, info, ifaces):
+    """Takes a function generated with placeholder names and returns a
+    _Template or None if functions with this signature can't share code.
+    """
+
+    deps = func._code.get_dependencies()
+
+    handle_name = None
+    for name, obj in deps.items():
+        if isinstance(obj, ctypes._CFuncPtr) and \
+                getattr(obj, "__name__", None) == info.symbol:
+            handle_name = name
+            break
+    else:
+        return
+
+    try:
+        lib = backend.get_library(info.namespace)
+        backend.rebind_function(deps[handle_name], lib, info.symbol)
+    except NotImplementedError:
+        return
+
+    doc = func.__doc__
+    iface_names = {}
+    for i, iface in enumerate(ifaces):
+        try:
+            cls = import_attribute(iface.namespace, iface.name)
+        except ImportError:
+            pass
+        else:
+            for name, obj in deps.items():
+                if obj is cls:
+                    iface_names.setdefault(name, i)
+
+        type_name = "%s.%s" % (iface.namespace, iface.name)
+        doc = re.sub(r"(?<![\w.])%s(?!\w)" % re.escape(type_name),
+                     _IFACE_NAME % i, doc)
+
+    code = func.__code__
+    reserved = set(deps)
+    reserved.update(n for n in code.co_varnames if not _TOKEN_RE.match(n))
+
+    return _Template(code.co_name, code, deps, str(func._code), doc,
+                     handle_name, iface_names, reserved)
+
+
+class TemplateCache(object):
+    """Maps signature keys to templates"""
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, backend, info, arg_infos, arg_types, return_type,
+                method):
+        """Returns a (key, ifaces) tuple, to be passed to bind() and add()"""
+
+        key, ifaces = get_signature_key(
+            info, arg_infos, arg_types, return_type, method)
+        return (backend.NAME, get_checks(info.namespace), key), ifaces
+
+    def __contains__(self, key):
+        return key in self._templates
+
+    def bind(self, key, backend, info, arg_infos, ifaces):
+        """Returns a new function created from the template for key or None
+        in case the signature doesn't support sharing.
+
+        Raises KeyError if there is no template for key.
+        """
+
+        template = self._templates[key]
+        with self._lock:
+            self.hits += 1
+        return self.bind_template(template, backend, info, arg_infos, ifaces)
+
+    def bind_template(self, template, backend, info, arg_infos, ifaces):
+        """Like bind() but takes a template returned by add()"""
+
+        if template is not None:
+            try:
+                return template.bind(backend, info, arg_infos, ifaces)
+            except NotImplementedError:
+                return
+
+    def add(self, key, func, backend, info, ifaces):
+        """Creates a template for key from a function generated with the
+        names from get_template_names(). func can be None in case
+        generating failed.
+
+        Returns the template.
+        """
+
+        template = None
+        if func is not None:
+            template = _create_template(func, backend, info, ifaces)
+
+        with self._lock:
+            self.misses += 1
+            self._templates[key] = template
+        return template
+
+    def generate(self, generate, backend, info, arg_infos, arg_types,
+                 return_type, method):
+        """Returns a new function created from a shared template or None in
+        case the signature doesn't support sharing.
+
+        generate is the function used for creating new templates.
+        """
+
+        key, ifaces = self.get_key(
+            backend, info, arg_infos, arg_types, return_type, method)
+
+        try:
+            return self.bind(key, backend, info, arg_infos, ifaces)
+        except KeyError:
+            pass
+
+        try:
+            func = generate(backend, info, arg_infos, arg_types, return_type,
+                            method, names=get_template_names(arg_infos))
+        except NotImplementedError:
+            func = None
+
+        template = self.add(key, func, backend, info, ifaces)
+        return self.bind_template(template, backend, info, arg_infos, ifaces)
+
+    def info(self):
+        """Returns a dict containing hit/miss counters and the number
+        of templates.
+        """
+
+        templates = list(self._templates.values())
+        shared = len([t for t in templates if t is not None])
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "templates": shared,
+            "unsupported": len(templates) - shared,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = 0
+
+
+template_cache = TemplateCache()
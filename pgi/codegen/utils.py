@@ -28,6 +28,26 @@ class TypeTagRegistry(dict):
         raise LookupError("type: %r", type_.tag)
 
 
+class VersionDispatchType(type):
+    """Metaclass which makes attributes with a "_py2" or "_py3" suffix,
+    matching the running Python version, available without the suffix.
+
+    The suffixed attribute wins over an unsuffixed one anywhere in the MRO.
+    """
+
+    def __init__(cls, name, bases, dict_):
+        super(VersionDispatchType, cls).__init__(name, bases, dict_)
+
+        suffix = "_py3" if _compat.PY3 else "_py2"
+        for attr in dir(cls):
+            if not attr.endswith(suffix):
+                continue
+            for base in cls.__mro__:
+                if attr in vars(base):
+                    setattr(cls, attr[:-len(suffix)], vars(base)[attr])
+                    break
+
+
 class VariableFactory(object):
     """A callable the produces unique variable names"""
 
@@ -65,6 +85,20 @@ class VariableFactory(object):
         self._blacklist.add(res)
         return res
 
+    def reset(self):
+        """Reset to the initial state"""
+
+        self._count = 0
+        self._blacklist.clear()
+        self._obj_cache.clear()
+
+    def clear_blacklist(self):
+        """Forget all reserved and requested names. Generated names stay
+        unique.
+        """
+
+        self._blacklist.clear()
+
     def request_name(self, name):
         """Request a name, might return the name or a similar one if already
         used or reserved
@@ -0,0 +1,162 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Ahead-of-time generation of namespace functions.
+
+pgi-compile Gtk-3.0 Gio-2.0
+
+writes a Python module for each namespace containing all functions and
+methods pgi can generate for it. If such a module is found on sys.path
+when the namespace gets imported and it was created for the installed
+typelib, the importer uses it instead of generating the code on demand.
+
+Modules get created for the active backend and checks mode (see
+set_checks()) and get ignored with other settings. Startup is about as
+fast as with a warm on-disk cache (PGI_CACHE_DIR), but without the slow
+first run and without a writable cache directory.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import argparse
+import importlib
+import py_compile
+import importlib.util
+
+from .clib.gir import GIRepository, GIInfoType, GIFunctionInfoFlags
+from .codegen import generate_function
+from .codegen.backend import list_backends, set_backend
+from .codegen.cache import get_namespace_key, entry_from_function
+from .codegen.cache import add_compiled_entries
+from .codegen.funcgen import get_cache_name
+
+
+def get_module_name(namespace, version):
+    """The module name used for the compiled namespace, e.g. _pgi_Gtk_3_0"""
+
+    return "_pgi_%s_%s" % (namespace, version.replace(".", "_"))
+
+
+def _iter_functions(namespace):
+    """Yields (info, is_method) for all functions and methods"""
+
+    repo = GIRepository()
+    with_methods = (GIInfoType.OBJECT, GIInfoType.INTERFACE,
+                    GIInfoType.STRUCT, GIInfoType.BOXED, GIInfoType.UNION)
+
+    for info in repo.get_infos(namespace):
+        info_type = info.type.value
+        if info_type == GIInfoType.FUNCTION:
+            yield info, False
+        elif info_type in with_methods:
+            for method_info in info.get_methods():
+                flags = method_info.flags.value
+                yield method_info, bool(flags & GIFunctionInfoFlags.IS_METHOD)
+
+
+def compile_namespace(namespace):
+    """Generates all functions of a loaded namespace.
+
+    Returns the source of a Python module.
+    """
+
+    cache_name = get_cache_name(list_backends()[0], namespace)
+    key = get_namespace_key(namespace, cache_name)
+
+    entries = {}
+    for info, method in _iter_functions(namespace):
+        try:
+            func = generate_function(info, method=method)
+        except NotImplementedError as e:
+            entry = str(e)
+        else:
+            entry = entry_from_function(func)
+            if entry is None:
+                continue
+        entries[(info.symbol, method)] = entry
+
+    lines = [
+        "# Generated by pgi-compile, do not edit.",
+        "",
+        "KEY = %r" % (key,),
+        "",
+        "ENTRIES = {",
+    ]
+    for key in sorted(entries):
+        lines.append("    %r: %r," % (key, entries[key]))
+    lines.append("}")
+    lines.append("")
+
+    return "\n".join(lines)
+
+
+def load_compiled_module(namespace):
+    """Makes the functions of a compiled module available, if one exists
+    for the loaded namespace and matches the installed typelib.
+
+    Returns True if a module was used.
+    """
+
+    repo = GIRepository()
+    name = get_module_name(namespace, repo.get_version(namespace))
+
+    try:
+        if importlib.util.find_spec(name) is None:
+            return False
+        module = importlib.import_module(name)
+    except Exception:
+        return False
+
+    cache_name = get_cache_name(list_backends()[0], namespace)
+    if getattr(module, "KEY", None) != \
+            get_namespace_key(namespace, cache_name):
+        return False
+
+    add_compiled_entries(namespace, cache_name, module.ENTRIES)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="pgi-compile",
+        description="Writes a Python module with all pre-generated "
+                    "functions for each namespace")
+    parser.add_argument(
+        "namespaces", metavar="NAMESPACE-VERSION", nargs="+",
+        help="e.g. Gtk-3.0")
+    parser.add_argument(
+        "-o", "--output", default=os.curdir,
+        help="output directory, needs to be in sys.path at runtime")
+    parser.add_argument(
+        "-b", "--backend", default="ctypes",
+        help="the backend to generate code for")
+    args = parser.parse_args(argv)
+
+    from .importer import require_version
+    set_backend(args.backend)
+
+    for spec in args.namespaces:
+        namespace, sep, version = spec.partition("-")
+        if not sep:
+            parser.error("Version missing: %r" % spec)
+        require_version(namespace, version)
+        importlib.import_module("pgi.repository." + namespace)
+
+        path = os.path.join(
+            args.output, get_module_name(namespace, version) + ".py")
+        with open(path, "w") as h:
+            h.write(compile_namespace(namespace))
+        # the modules are large, so don't depend on the first import
+        # being allowed to write the bytecode
+        py_compile.compile(path, doraise=True)
+        print("%s: %s" % (spec, path))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,9 @@ def pprint(obj, file_=None):
 
     # functions, methods
     if callable(obj) and hasattr(obj, "_code"):
+        # the docstring isn't part of the generated code
+        if obj.__doc__:
+            file_.write("# %s\n" % obj.__doc__)
         obj._code.pprint(file_)
         return
 
@@ -29,3 +32,60 @@ def pprint(obj, file_=None):
         return
 
     raise TypeError("unkown type")
+
+
+def template_cache_info():
+    """Returns a dict with the hit/miss counters of the signature template
+    cache and the number of templates it contains.
+    """
+
+    from .codegen.templates import template_cache
+
+    return template_cache.info()
+
+
+def encode_cache_info():
+    """Returns a dict with the hit/miss counters of the cache for encoded
+    strings and the number of strings it contains. Hits only get counted
+    while stats are enabled, see enable_stats().
+    """
+
+    from .util import encode_cache
+
+    return encode_cache.info()
+
+
+def enable_stats(enabled=True):
+    """Enables or disables collecting code generation statistics, see
+    stats(). Disabled by default.
+    """
+
+    from .codegen import stats
+
+    stats.set_enabled(enabled)
+
+
+def reset_stats():
+    """Removes all collected statistics"""
+
+    from .codegen import stats
+
+    stats.reset()
+
+
+def stats():
+    """Returns counters and cumulative timings (in seconds) for all code
+    generation entry points since enable_stats() was called::
+
+        {kind: {namespace: {backend: {"count": int, "time": float}}},
+         "fallbacks": {namespace: {backend: int}}}
+
+    kind is one of "function", "constructor", "field", "property",
+    "callback", "callback-closure", "signal", "signal-closure" and "dummy".
+    Failed attempts are listed under the "failed" backend. "fallbacks"
+    counts how often a backend failed and the next one was tried.
+    """
+
+    from .codegen import stats
+
+    return stats.get_stats()
@@ -18,6 +18,8 @@ class PGType(object):
 
     _PYTYPES = {}
     _REGISTRY = {}
+    # GType value -> class, filled on class creation and looked at first
+    _CLASSES = {}
 
     def __init__(self, type_):
         if isinstance(type_, _compat.integer_types):
@@ -104,6 +106,17 @@ class PGType(object):
 
     @cached_property
     def pytype(self):
+        try:
+            return self._CLASSES[self._type.value]
+        except KeyError:
+            pass
+
+        cls = self._get_pytype()
+        if cls is None:
+            return None
+        return self._CLASSES.setdefault(self._type.value, cls)
+
+    def _get_pytype(self):
         type_ = self._type
         if type_.value == 0:
             return None
@@ -149,6 +162,22 @@ class PGType(object):
     def __repr__(self):
         return "<GType %s (%d)>" % (self.name, self._type.value)
 
+
+def set_pytype(gtype, cls):
+    """Makes cls the class for gtype, returned by PGType.pytype"""
+
+    PGType._CLASSES[gtype._type.value] = cls
+
+
+def get_pytype(value):
+    """Returns the class for a GType value or None"""
+
+    try:
+        return PGType._CLASSES[value]
+    except KeyError:
+        return PGType(value).pytype
+
+
 PGType.__name__ = "GType"
 PGType.__module__ = "GObject"
 
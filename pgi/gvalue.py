@@ -0,0 +1,222 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Converters between Python values and GValues of a given GType.
+
+The returned functions work on GValue addresses, so they can be looked up
+once and used by signal emission and property access without any type
+dispatch at call time.
+"""
+
+import ctypes
+
+from .clib.glib import gchar_p
+from .clib.gobject import GType, GParamSpecPtr
+from .clib.gobject import value_getters, value_setters, value_peek_pointer
+from .clib.gobject import value_get_gtype, value_set_gtype
+from .clib.gobject import value_dup_boxed, value_dup_variant
+from .gtype import PGType
+from .wrapper import get_wrapper
+from ._compat import PY3, text_type, integer_types
+
+
+def _check_instance(value, pytype):
+    if value is not None and not isinstance(value, pytype):
+        raise TypeError("Expected %s, got %s" % (
+            pytype.__name__, type(value).__name__))
+
+
+def _pack_strv(address, value):
+    if value is None:
+        value_setters["GBoxed"](address, None)
+        return
+
+    items = []
+    for item in value:
+        if isinstance(item, text_type):
+            item = item.encode("utf-8")
+        items.append(item)
+    array = (gchar_p * (len(items) + 1))(*items)
+    # copies the array
+    value_setters["GBoxed"](address, ctypes.cast(array, ctypes.c_void_p))
+
+
+def _unpack_strv(address):
+    pointer = value_peek_pointer(address)
+    if not pointer:
+        return []
+
+    array = ctypes.cast(pointer, ctypes.POINTER(gchar_p))
+    result = []
+    i = 0
+    while array[i] is not None:
+        item = array[i]
+        if PY3:
+            item = item.decode("utf-8")
+        result.append(item)
+        i += 1
+    return result
+
+
+def get_packer(gtype):
+    """Returns a function which takes a GValue address initialized for
+    gtype and a Python value and sets the value.
+
+    Raises NotImplementedError if gtype isn't supported.
+    """
+
+    pgtype = PGType(GType(gtype))
+    name = pgtype.fundamental.name
+    try:
+        setter = value_setters[name]
+    except KeyError:
+        raise NotImplementedError("%r not supported" % pgtype.name)
+
+    if name in ("gchar", "guchar"):
+        def pack(address, value):
+            if not isinstance(value, integer_types):
+                value = ord(value)
+            setter(address, value)
+        return pack
+    elif name in ("GEnum", "GFlags"):
+        return lambda address, value: setter(address, int(value))
+    elif name == "gchararray":
+        def pack(address, value):
+            if isinstance(value, text_type):
+                value = value.encode("utf-8")
+            setter(address, value)
+        return pack
+    elif name in ("GObject", "GInterface"):
+        pytype = pgtype.pytype
+        if pytype is None:
+            raise NotImplementedError("%r not supported" % pgtype.name)
+
+        def pack(address, value):
+            _check_instance(value, pytype)
+            setter(address, value and value._obj)
+        return pack
+    elif name == "GBoxed":
+        if pgtype.name == "GStrv":
+            return _pack_strv
+
+        pytype = pgtype.pytype
+        if pytype is None:
+            raise NotImplementedError("%r not supported" % pgtype.name)
+
+        def pack(address, value):
+            _check_instance(value, pytype)
+            setter(address, value and value._obj)
+        return pack
+    elif name == "GVariant":
+        pytype = pgtype.pytype
+        if pytype is None:
+            raise NotImplementedError("%r not supported" % pgtype.name)
+
+        def pack(address, value):
+            _check_instance(value, pytype)
+            setter(address, value and value._obj)
+        return pack
+    elif name == "GParam":
+        from .properties import GParamSpec
+
+        def pack(address, value):
+            _check_instance(value, GParamSpec)
+            spec = value and ctypes.cast(value._spec, ctypes.c_void_p)
+            setter(address, spec)
+        return pack
+    elif name == "gpointer" and pgtype.name == "GType":
+        def pack(address, value):
+            value_set_gtype(address, PGType(value)._type)
+        return pack
+    return setter
+
+
+def get_unpacker(gtype):
+    """Returns a function which takes a GValue address and returns a new
+    Python value for it. Returns None for a void gtype.
+
+    Raises NotImplementedError if gtype isn't supported.
+    """
+
+    pgtype = PGType(GType(gtype))
+    if pgtype.name == "void":
+        return
+
+    name = pgtype.fundamental.name
+    if name in ("GObject", "GInterface"):
+        def unpack(address):
+            value = value_peek_pointer(address)
+            if value:
+                obj = get_wrapper(value)
+                obj._ref()
+                return obj
+        return unpack
+    elif name == "GBoxed":
+        if pgtype.name == "GStrv":
+            return _unpack_strv
+
+        pytype = pgtype.pytype
+        if pytype is None:
+            raise NotImplementedError("%r not supported" % pgtype.name)
+
+        def unpack(address):
+            value = value_dup_boxed(address)
+            if value:
+                obj = object.__new__(pytype)
+                obj._obj = value
+                return obj
+        return unpack
+    elif name == "GVariant":
+        pytype = pgtype.pytype
+        if pytype is None:
+            raise NotImplementedError("%r not supported" % pgtype.name)
+
+        def unpack(address):
+            value = value_dup_variant(address)
+            if value:
+                obj = object.__new__(pytype)
+                obj._obj = value
+                return obj
+        return unpack
+    elif name == "GParam":
+        from .properties import GParamSpec
+
+        def unpack(address):
+            value = value_peek_pointer(address)
+            if value:
+                spec = ctypes.cast(value, GParamSpecPtr)
+                return GParamSpec(spec, spec.name, None)
+        return unpack
+    elif name == "gpointer" and pgtype.name == "GType":
+        return lambda address: PGType(value_get_gtype(address))
+
+    try:
+        getter = value_getters[name]
+    except KeyError:
+        raise NotImplementedError("%r not supported" % pgtype.name)
+
+    if name == "gchar":
+        return lambda address: chr(getter(address) & 0xff)
+    elif name == "guchar":
+        if PY3:
+            return lambda address: bytes([getter(address)])
+        return lambda address: chr(getter(address))
+    elif name == "gboolean":
+        return lambda address: bool(getter(address))
+    elif name in ("GEnum", "GFlags"):
+        pytype = pgtype.pytype
+        if pytype is None:
+            return getter
+        return lambda address: pytype(getter(address))
+    elif name == "gchararray" and PY3:
+        def unpack(address):
+            value = getter(address)
+            if value is not None:
+                value = value.decode("utf-8")
+            return value
+        return unpack
+    return getter
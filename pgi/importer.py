@@ -17,6 +17,7 @@ from .clib.gir import GIRepository
 from . import const, overrides
 from .util import PyGIWarning
 from .module import get_introspection_module
+from .compiler import load_compiled_module
 
 _versions = {}
 
@@ -172,6 +173,9 @@ class Importer(object):
         with _check_require_version(namespace, stacklevel=stacklevel):
             introspection_module = get_introspection_module(namespace)
 
+            # Use pre-generated functions from pgi-compile if available
+            load_compiled_module(namespace)
+
             # Import all dependencies first so their init functions
             # (gdk_init, ..) in overrides get called.
             # https://bugzilla.gnome.org/show_bug.cgi?id=656314
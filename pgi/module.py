@@ -86,7 +86,8 @@ class _Module(types.ModuleType):
         cls = _attr_list[info.type.value]
         if cls:
             attr = cls(info)
-            setattr(self, name, attr)
+            # in case another thread was faster, use the same attribute
+            attr = self.__dict__.setdefault(name, attr)
         else:
             raise NotImplementedError(
                 "%r attribute type not supported" % info.type)
@@ -8,22 +8,104 @@
 import itertools
 from ctypes import cast, addressof
 import weakref
+import threading
 
 from .clib import gobject
-from .clib.gobject import GClosureNotify, signal_connect_data
+from .clib.gobject import GSignalFlags, GSignalQuery
+from .clib.gobject import signal_connect_closure_by_id
+from .clib.gobject import signal_lookup, signal_query
+from .clib.gobject import signal_handler_is_connected
 from .clib.gobject import signal_handler_unblock, signal_handler_block
 from .clib.gobject import GConnectFlags, signal_handler_disconnect
-from .clib.gir import GIFunctionInfoFlags
+from .clib.gir import GIFunctionInfoFlags, GIInfoType, GIRepository
 
-from .util import import_attribute, escape_identifier
-from .gtype import PGType
+from .util import import_attribute, escape_identifier, import_module
+from .util import encode_cache
+from .gtype import PGType, set_pytype
 from .properties import PropertyAttribute, PROPS_NAME
+from .properties import get_properties, set_properties
 from .field import FieldAttribute
 from .constant import ConstantAttribute
 from .signals import SignalsAttribute
+from .wrapper import register_wrapper, get_wrapper
+from .closure import new_closure, get_marshaller, emit
 from .codegen import generate_function, generate_constructor
+from .codegen import generate_functions
 from .codegen import generate_signal_callback, generate_dummy_callable
-from ._compat import PY3
+from .clib.glib import GQuark
+from ._compat import string_types
+
+
+class SignalTable(dict):
+    """Maps signal names of a class to (info, signal_id, detailed) tuples.
+
+    Entries get resolved on first access and include signals of
+    implemented interfaces and ones only known to the type system, for
+    which info is None. Both the "-" and "_" spelling of a name can be
+    used as key. Raises KeyError for unknown signals.
+    """
+
+    def __init__(self, cls):
+        super(SignalTable, self).__init__()
+        self._cls = cls
+
+    def _find_info(self, name, itype):
+        for base in self._cls.__mro__:
+            sigs = base.__dict__.get("__sigs__")
+            if sigs and name in sigs:
+                return sigs[name]
+
+        # signal added by a type we don't have in our MRO
+        owner = PGType(itype).pytype
+        if owner is not None:
+            return getattr(owner, "__sigs__", {}).get(name)
+
+    def __missing__(self, name):
+        key = name.replace("_", "-")
+        if key != name:
+            entry = self[key]
+        else:
+            gtype = self._cls.__gtype__
+            # signals get registered in class/interface init
+            if gtype.is_interface():
+                iface = gtype._type.default_interface_ref()
+                signal_id = signal_lookup(encode_cache[key], gtype._type)
+                gtype._type.default_interface_unref(iface)
+            else:
+                klass = gtype._type.class_ref()
+                signal_id = signal_lookup(encode_cache[key], gtype._type)
+                gtype._type.class_unref(klass)
+            if not signal_id:
+                raise KeyError(name)
+
+            query = GSignalQuery()
+            signal_query(signal_id, query)
+            info = self._find_info(key, query.itype)
+            detailed = bool(query.signal_flags.value & GSignalFlags.DETAILED)
+            entry = (info, signal_id, detailed)
+
+        self[name] = entry
+        return entry
+
+
+def get_signal_table(cls):
+    """Returns the SignalTable of cls, creates it on first use"""
+
+    table = cls.__dict__.get("_signal_table")
+    if table is None:
+        table = cls._signal_table = SignalTable(cls)
+    return table
+
+
+class _FreezeNotifyManager(object):
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.obj.thaw_notify()
 
 
 class Object(object):
@@ -32,7 +114,6 @@ class Object(object):
     _obj = 0
     __weak = {}
     _constructors = None
-    __signal_cb_ref = {}
 
     def __init__(self, **kwargs):
         gtype = self.__gtype__
@@ -50,6 +131,7 @@ class Object(object):
 
         self.__weak[weakref.ref(self, self.__destroy)] = obj
         self._obj = obj
+        register_wrapper(self)
 
     @classmethod
     def _generate_constructor(cls, names):
@@ -85,6 +167,26 @@ class Object(object):
             raise TypeError("Unknown property: %r" % name)
         return getattr(self.props, name)
 
+    def get_properties(self, *names):
+        """get_properties(*property_names: str) -> tuple
+
+        Retrieves the values of multiple properties at once.
+        """
+
+        return get_properties(self, names)
+
+    def set_properties(self, **kwargs):
+        """set_properties(**kwargs) -> None
+
+        Set multiple properties at once, e.g.::
+
+            obj.set_properties(name="foo", enabled=False)
+
+        "notify" gets emitted after all of them are set.
+        """
+
+        set_properties(self, list(kwargs.items()))
+
     def _ref(self):
         gobject.ref_sink(self._obj)
 
@@ -96,33 +198,48 @@ class Object(object):
     def __grefcount__(self):
         return cast(self._obj, gobject.GObjectPtr).contents.ref_count
 
-    def __get_signal(self, name):
-        name = name.replace("_", "-")
-        for base in type(self).__mro__[:-1]:
-            if base is InterfaceBase:
-                continue
-            if "__sigs__" in base.__dict__:
-                if name in base.__sigs__:
-                    return base.__sigs__[name]
+    def __lookup_signal(self, name):
+        """Returns (info, signal_id, detail quark) for a detailed signal
+        name or raises TypeError.
+        """
+
+        signal_name, sep, detail = name.partition("::")
+        try:
+            info, signal_id, detailed = \
+                get_signal_table(type(self))[signal_name]
+        except KeyError:
+            raise TypeError("unknown signal name %r" % name)
+
+        if sep:
+            if not detailed or not detail:
+                raise TypeError("invalid signal detail %r" % name)
+            detail = GQuark.from_string(encode_cache[detail])
+        else:
+            detail = 0
+
+        return info, signal_id, detail
 
     def __connect(self, flags, name, callback, *user_args):
         if not callable(callback):
             raise TypeError("second argument must be callable")
 
-        info = self.__get_signal(name)
-        if not info:
-            raise TypeError("unknown signal name %r" % name)
+        info, signal_id, detail = self.__lookup_signal(name)
 
-        def _add_self(*args):
-            return callback(self, *itertools.chain(args, user_args))
-        cb = generate_signal_callback(info)(_add_self)
+        # the instance gets passed by the marshaller, so the closure
+        # doesn't keep us alive
+        def _add_self(instance, *args):
+            return callback(
+                get_wrapper(instance), *itertools.chain(args, user_args))
+        if info is None:
+            # the marshaller converts all arguments
+            func = _add_self
+        else:
+            func = generate_signal_callback(info)(_add_self)
 
-        destroy = GClosureNotify()
-        if PY3:
-            name = name.encode("ascii")
-        id_ = signal_connect_data(self._obj, name, cb, None, destroy, flags)
-        self.__signal_cb_ref[id_] = (cb, destroy)
-        return id_
+        closure = new_closure(func, get_marshaller(signal_id, info))
+        after = bool(flags & GConnectFlags.CONNECT_AFTER)
+        return signal_connect_closure_by_id(
+            self._obj, signal_id, detail, closure, after)
 
     def connect(self, detailed_signal, handler, *args):
         """connect(detailed_signal: str, handler: function, *args) -> handler_id: int
@@ -168,9 +285,8 @@ class Object(object):
         return self.__connect(flags, detailed_signal, handler, *args)
 
     def disconnect(self, id_):
-        if id_ in self.__signal_cb_ref:
+        if signal_handler_is_connected(self._obj, id_):
             signal_handler_disconnect(self._obj, id_)
-            del self.__signal_cb_ref[id_]
 
     def handler_block(self, handler_id):
         """handler_block(handler_id: int) -> None
@@ -199,15 +315,18 @@ class Object(object):
         signal_handler_unblock(self._obj, handler_id)
 
     def emit(self, signal_name, *args):
-        """emit(signal_name: str, *args) -> None
+        """emit(signal_name: str, *args) -> object
 
         Emit signal *signal_name*. Signal arguments must follow, e.g. if your
         signal is of type ``(int,)``, it must be emitted with::
 
             self.emit(signal_name, 42)
+
+        Returns the return value of the emission or None.
         """
 
-        raise NotImplementedError
+        info, signal_id, detail = self.__lookup_signal(signal_name)
+        return emit(self._obj, signal_id, detail, args)
 
     def freeze_notify(self):
         """freeze_notify() -> None
@@ -225,7 +344,8 @@ class Object(object):
                 ...
         """
 
-        raise NotImplementedError
+        gobject.freeze_notify(self._obj)
+        return _FreezeNotifyManager(self)
 
     def thaw_notify(self):
         """thaw_notify() -> None
@@ -237,7 +357,7 @@ class Object(object):
         :meth:`freeze_notify` together with the *with* statement.
         """
 
-        raise NotImplementedError
+        gobject.thaw_notify(self._obj)
 
     def __hash__(self):
         return hash(self._obj)
@@ -261,29 +381,39 @@ class MethodAttribute(object):
         self._name = name
         self._real_owner = real_owner
 
-    def __get__(self, instance, owner):
-        info = self._info
-        real_owner = self._real_owner
-        flags = info.flags
-        func_flags = flags.value
-        name = self._name
+    def _is_method(self):
+        """If the function takes an instance. Raises NotImplementedError
+        for unsupported ones.
+        """
 
-        func_flags = func_flags & (~GIFunctionInfoFlags.THROWS)
+        flags = self._info.flags
+        func_flags = flags.value & (~GIFunctionInfoFlags.THROWS)
 
         if func_flags & GIFunctionInfoFlags.IS_METHOD:
-            func = generate_function(info, method=True)
-            setattr(real_owner, name, func)
-            return getattr(instance or owner, name)
+            return True
         elif not func_flags or func_flags & GIFunctionInfoFlags.IS_CONSTRUCTOR:
-            func = generate_function(info, method=False)
-            func = staticmethod(func)
-            setattr(real_owner, name, func)
-            result_func = getattr(instance or owner, name)
-            result_func._is_static = True
-            return result_func
+            return False
         else:
             raise NotImplementedError("%r not supported" % flags)
 
+    def _install(self, func, method):
+        """Replace the attribute with the generated function"""
+
+        # in case another thread was faster, keep the existing one
+        if vars(self._real_owner).get(self._name) is not self:
+            return
+
+        if not method:
+            func._is_static = True
+            func = staticmethod(func)
+        setattr(self._real_owner, self._name, func)
+
+    def __get__(self, instance, owner):
+        method = self._is_method()
+        func = generate_function(self._info, method=method)
+        self._install(func, method)
+        return getattr(instance or owner, self._name)
+
 
 class VirtualMethodAttribute(object):
 
@@ -322,6 +452,107 @@ def add_method(info, target_cls, virtual=False, dont_replace=False):
     setattr(target_cls, name, attr)
 
 
+_warm_classes = weakref.WeakSet()
+
+
+def _get_method_attributes(bases):
+    """Returns a list of (attr, method) for all not yet generated methods"""
+
+    attrs = []
+    for base in bases:
+        for attr in list(vars(base).values()):
+            if not isinstance(attr, MethodAttribute):
+                continue
+            try:
+                attrs.append((attr, attr._is_method()))
+            except NotImplementedError:
+                pass
+    return attrs
+
+
+def warmup(cls):
+    """Generates all methods of the class and its base classes at once
+    instead of on first access. Everything which isn't cached gets compiled
+    in one go.
+    """
+
+    if not isinstance(cls, type):
+        raise TypeError("%r is not a class" % cls)
+
+    _warmup_class(cls, batch=True)
+
+
+def _install_methods(attrs, batch):
+    """Generates and installs the methods for a list of (attr, method).
+
+    Without batch they get generated one by one, so we never hold the GIL
+    for long.
+    """
+
+    if batch:
+        funcs = generate_functions([(a._info, m) for a, m in attrs])
+        for (attr, method), func in zip(attrs, funcs):
+            if func is not None:
+                attr._install(func, method)
+        return
+
+    for attr, method in attrs:
+        try:
+            func = generate_function(attr._info, method=method)
+        except NotImplementedError:
+            continue
+        attr._install(func, method)
+
+
+def _warmup_class(cls, batch):
+    bases = [b for b in cls.__mro__ if b not in _warm_classes]
+    _install_methods(_get_method_attributes(bases), batch)
+    # what's left failed, no need to try again for sub classes
+    _warm_classes.update(bases)
+
+
+def _warmup_thread(classes, modules):
+    repo = GIRepository()
+    info_types = (GIInfoType.OBJECT, GIInfoType.INTERFACE,
+                  GIInfoType.STRUCT, GIInfoType.UNION, GIInfoType.FUNCTION)
+
+    for cls in classes:
+        _warmup_class(cls, batch=False)
+
+    for module in modules:
+        namespace = module.__name__.rsplit(".", 1)[-1]
+        for info in repo.get_infos(namespace):
+            if info.type.value not in info_types:
+                continue
+            try:
+                attr = getattr(module, escape_identifier(info.name))
+            except Exception:
+                continue
+            if isinstance(attr, type):
+                _warmup_class(attr, batch=False)
+
+
+def start_warmup(namespaces, priority_list=None):
+    """Generates all functions and methods of the passed namespaces in a
+    background thread. Classes in priority_list get handled first.
+
+    namespaces can contain module names or modules, priority_list classes.
+    Returns the started thread.
+    """
+
+    modules = []
+    for namespace in namespaces:
+        if isinstance(namespace, string_types):
+            namespace = import_module(namespace)
+        modules.append(namespace)
+
+    thread = threading.Thread(
+        target=_warmup_thread, args=(list(priority_list or []), modules))
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
 class InterfaceBase(object):
 
     @classmethod
@@ -347,6 +578,7 @@ def InterfaceAttribute(iface_info):
 
     # GType
     cls.__gtype__ = PGType(iface_info.g_type)
+    set_pytype(cls.__gtype__, cls)
 
     # Properties
     cls.props = PropertyAttribute(iface_info)
@@ -368,7 +600,9 @@ def InterfaceAttribute(iface_info):
     for vfunc_info in iface_info.get_vfuncs():
         add_method(vfunc_info, cls, virtual=True)
 
-    cls._sigs = {}
+    cls.__sigs__ = {}
+    for sig_info in iface_info.get_signals():
+        cls.__sigs__[sig_info.name] = sig_info
 
     is_info = iface_info.get_iface_struct()
     if is_info:
@@ -404,6 +638,7 @@ def new_class_from_gtype(gtype):
 
         cls = type(gtype.name, bases, dict())
         cls.__gtype__ = gtype
+        set_pytype(gtype, cls)
 
         return cls
     elif gtype.is_a(PGType.from_name("GEnum")):
@@ -457,6 +692,7 @@ def ObjectAttribute(obj_info):
 
     # GType
     cls.__gtype__ = PGType(obj_info.g_type)
+    set_pytype(cls.__gtype__, cls)
 
     if not obj_info.fundamental:
         # Constructor cache
@@ -14,6 +14,7 @@ from pkgutil import get_loader
 
 from pgi import const
 from pgi.util import PyGIDeprecationWarning
+from pgi.gtype import set_pytype
 
 
 # namespace -> (attr, replacement)
@@ -182,6 +183,11 @@ def override(klass):
 
     setattr(module, name, klass)
 
+    # returned instances should use the override
+    gtype = getattr(klass, "__gtype__", None)
+    if gtype is not None and gtype is getattr(old_klass, "__gtype__", None):
+        set_pytype(gtype, klass)
+
     return klass
 
 
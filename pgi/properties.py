@@ -5,22 +5,29 @@
 # License as published by the Free Software Foundation; either
 # version 2.1 of the License, or (at your option) any later version.
 
-from warnings import warn
 import ctypes
 
-from .clib import gobject
+from .clib.glib import gchar_p
 from .clib.gobject import GValue, GValuePtr, G_TYPE_FROM_INSTANCE
-from .clib.gobject import GObjectClassPtr
-from .clib.gir import GIInfoType, GITypeTag
+from .clib.gobject import GObjectClassPtr, GParamFlags
+from .clib.gobject import value_init, value_unset
+from .clib.gobject import object_get_property, object_set_property
+from .clib.gobject import object_getv, object_setv
+from .clib.gobject import freeze_notify, thaw_notify
+from .clib.gir import GIInfoType
 
 from .util import escape_parameter, unescape_parameter, InfoIterWrapper
-from .util import import_attribute, set_gvalue_from_py
+from .util import encode_cache
 from .gtype import PGType
+from .codegen import generate_property_getter, generate_property_setter
+from .gvalue import get_packer, get_unpacker
 from ._compat import PY3
 
 
 PROPS_NAME = "props"
 
+_VALUE_SIZE = ctypes.sizeof(GValue)
+
 
 class GParamSpec(object):
     _spec = None
@@ -81,86 +88,48 @@ class GParamSpec(object):
         return "<%s %r>" % (self.__gtype__.name, self.name)
 
 
+def _check_access(spec, setter):
+    flags = spec.flags
+    if setter:
+        if not flags & GParamFlags.WRITABLE or \
+                flags & GParamFlags.CONSTRUCT_ONLY:
+            raise TypeError("property %r is not writable" % spec.name)
+    else:
+        if not flags & GParamFlags.READABLE:
+            raise TypeError("property %r is not readable" % spec.name)
+
+
 class Property(object):
     def __init__(self, spec):
         self.__spec = spec
-        type_ = spec._info.get_type()
-        self.__tag = type_.tag.value
-
-        self.__interface = False
-        if self.__tag == GITypeTag.INTERFACE:
-            iface_info = type_.get_interface()
-            self.__tag = iface_info.type.value
-            name = iface_info.name
-            namespace = iface_info.namespace
-            self.__iclass = import_attribute(namespace, name)
-            self.__interface = True
+        self.__getter = None
+        self.__setter = None
+
+    def __generate(self, setter):
+        spec = self.__spec
+        _check_access(spec, setter)
+        if setter:
+            generate = generate_property_setter
+        else:
+            generate = generate_property_getter
 
-        self.__value_type = spec.value_type._type.value
+        return generate(
+            spec._name, spec.value_type._type.value, spec._info.namespace)
 
     def __get__(self, instance, owner):
-        ptr = GValuePtr(GValue())
-        ptr.init(self.__value_type)
-
-        tag = self.__tag
-
-        func = None
-        if not self.__interface:
-            if tag == GITypeTag.UTF8:
-                func = lambda: ptr.string
-            elif tag == GITypeTag.INT32:
-                func = lambda: ptr.int
-            elif tag == GITypeTag.BOOLEAN:
-                func = lambda: ptr.boolean
-            elif tag == GITypeTag.FLOAT:
-                func = lambda: ptr.float
-        else:
-            if tag == GIInfoType.ENUM:
-                func = lambda: self.__iclass(ptr.enum)
-            elif tag == GIInfoType.OBJECT:
-                def func():
-                    adr = ptr.get_object()
-                    if adr:
-                        new = object.__new__(self.__iclass)
-                        new._obj = ptr.get_object()
-                        return new
-                    else:
-                        return None
-
-        if func is None:
-            ptr.unset()
-            name = self.__spec.name
-            warn("Property %r unhandled. Type not supported" % name, Warning)
-            return None
-
-        if not instance._object:
-            ptr.unset()
-            raise TypeError("Object not initialized")
-
-        name = self.__spec.name
-        if PY3:
-            name = name.encode("ascii")
+        if instance is None:
+            return self
 
-        gobject.get_property(instance._object, name, ptr)
-        return func()
+        getter = self.__getter
+        if getter is None:
+            getter = self.__getter = self.__generate(False)
+        return getter(instance)
 
     def __set__(self, instance, value):
-        ptr = GValuePtr(GValue())
-        ptr.init(self.__value_type)
-
-        tag = self.__tag
-
-        if not set_gvalue_from_py(ptr, self.__interface, tag, value):
-            ptr.unset()
-            name = self.__spec.name
-            warn("Property %r unhandled. Type not supported" % name, Warning)
-            return
-
-        name = self.__spec.name
-        if PY3:
-            name = name.encode("ascii")
-
-        gobject.set_property(instance._object, name, ptr)
+        setter = self.__setter
+        if setter is None:
+            setter = self.__setter = self.__generate(True)
+        setter(instance, value)
 
 
 class _GProps(object):
@@ -211,17 +180,18 @@ class _ObjectClassProp(object):
         return list(set(base + names))
 
     def __getattr__(self, name):
-        for props in self.__get_base_props():
-            try:
-                return getattr(props, name)
-            except AttributeError:
-                pass
-
         info = self._info
         gname = unescape_parameter(name)
         prop_info = self._wrapper.lookup_name(gname)
+        if not prop_info:
+            for props in self.__get_base_props():
+                try:
+                    return getattr(props, name)
+                except AttributeError:
+                    pass
+
         if PY3:
-            gname = gname.encode("utf-8")
+            gname = encode_cache[gname]
         if prop_info:
             gtype = info.g_type
             if info.type.value == GIInfoType.OBJECT:
@@ -279,6 +249,109 @@ class _PropsDescriptor(object):
         return attr
 
 
+# (GParamSpec, setter) -> (name, value type, packer or unpacker)
+_converters = {}
+
+
+def _get_converter(instance, name, setter):
+    specs = type(instance).props
+    spec = getattr(specs, name, None)
+    if not isinstance(spec, GParamSpec):
+        raise TypeError("Unknown property: %r" % name)
+
+    try:
+        return _converters[(spec, setter)]
+    except KeyError:
+        pass
+
+    _check_access(spec, setter)
+    gtype = spec.value_type._type
+    if setter:
+        convert = get_packer(gtype.value)
+    else:
+        convert = get_unpacker(gtype.value)
+    return _converters.setdefault((spec, setter), (spec._name, gtype, convert))
+
+
+def get_properties(instance, names):
+    """Returns a tuple with the values of the properties names (str) of
+    the Python GObject instance.
+
+    All values get fetched with one g_object_getv() call if available.
+    Raises TypeError for unknown or non-readable properties.
+    """
+
+    obj = instance._obj
+    if not obj:
+        raise TypeError("Object not initialized")
+
+    entries = [_get_converter(instance, n, False) for n in names]
+    count = len(entries)
+    values = (GValue * count)()
+    base = ctypes.addressof(values)
+    try:
+        if object_getv is not None:
+            gnames = (gchar_p * count)(*[e[0] for e in entries])
+            object_getv(obj, count, gnames, base)
+        else:
+            for i, (gname, gtype, unpack) in enumerate(entries):
+                address = base + i * _VALUE_SIZE
+                value_init(address, gtype)
+                object_get_property(obj, gname, address)
+
+        return tuple([unpack(base + i * _VALUE_SIZE)
+                      for i, (gname, gtype, unpack) in enumerate(entries)])
+    finally:
+        for i, value in enumerate(values):
+            if value.g_type.value:
+                value_unset(base + i * _VALUE_SIZE)
+
+
+def set_properties(instance, items):
+    """Sets the properties of the Python GObject instance given by items,
+    a list of (name, value) pairs.
+
+    All values get packed first and then set with one g_object_setv()
+    call if available, so "notify" gets emitted once everything is set.
+    Raises TypeError for unknown or non-writable properties or values
+    which can't be converted, in which case nothing gets set.
+    """
+
+    obj = instance._obj
+    if not obj:
+        raise TypeError("Object not initialized")
+
+    entries = [_get_converter(instance, n, True) for n, v in items]
+    count = len(entries)
+    values = (GValue * count)()
+    base = ctypes.addressof(values)
+    try:
+        for i, ((gname, gtype, pack), (name, value)) in \
+                enumerate(zip(entries, items)):
+            address = base + i * _VALUE_SIZE
+            value_init(address, gtype)
+            try:
+                pack(address, value)
+            except ctypes.ArgumentError as e:
+                raise TypeError("property %r: %s" % (name, e))
+
+        if object_setv is not None:
+            # freezes notify by itself
+            gnames = (gchar_p * count)(*[e[0] for e in entries])
+            object_setv(obj, count, gnames, base)
+        else:
+            freeze_notify(obj)
+            try:
+                for i, (gname, gtype, pack) in enumerate(entries):
+                    object_set_property(obj, gname, base + i * _VALUE_SIZE)
+            finally:
+                thaw_notify(obj)
+    finally:
+        for i, value in enumerate(values):
+            if value.g_type.value:
+                value_unset(base + i * _VALUE_SIZE)
+
+
 def list_properties(type):
     """
     :param type: a Python GObject instance or type that the signal is associated with
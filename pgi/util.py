@@ -5,6 +5,7 @@
 # License as published by the Free Software Foundation; either
 # version 2.1 of the License, or (at your option) any later version.
 
+import sys
 import keyword
 import re
 from operator import itemgetter
@@ -220,6 +221,68 @@ def encode(string):
     return string
 
 
+class EncodeCache(dict):
+    """Maps str to their UTF-8 encoding, encode_cache[string].
+
+    Meant for short strings which get passed over and over, like signal and
+    property names. Longer strings get encoded but not stored and once
+    MAX_SIZE entries are reached the cache starts over.
+
+    Misses are always counted, hits only after set_counting(True) since
+    counting them slows down lookups.
+    """
+
+    MAX_LENGTH = 64
+    MAX_SIZE = 1024
+
+    def __init__(self):
+        super(EncodeCache, self).__init__()
+        self.hits = 0
+        self.misses = 0
+
+    def __missing__(self, string):
+        self.misses += 1
+        encoded = string.encode("utf-8")
+        # subclasses can't be interned and might not compare like a str
+        if type(string) is str and len(string) <= self.MAX_LENGTH:
+            if len(self) >= self.MAX_SIZE:
+                self.clear()
+            # keys used by generated code or as literals are likely interned
+            # already, this makes other equal strings share them
+            self[sys.intern(string)] = encoded
+        return encoded
+
+    def set_counting(self, enabled):
+        """Enables counting cache hits"""
+
+        if enabled:
+            self.__class__ = _CountingEncodeCache
+        else:
+            self.__class__ = EncodeCache
+
+    def info(self):
+        """Returns a dict containing hit/miss counters and the number of
+        cached strings.
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def reset(self):
+        self.clear()
+        self.hits = self.misses = 0
+
+
+class _CountingEncodeCache(EncodeCache):
+
+    def __getitem__(self, string):
+        if string in self:
+            self.hits += 1
+        return super(_CountingEncodeCache, self).__getitem__(string)
+
+
+encode_cache = EncodeCache()
+
+
 KWD_RE = re.compile("^(%s)$" % "|".join(keyword.kwlist + ["print", "exec"]))
 
 
@@ -309,6 +372,7 @@ class ResultTuple(tuple):
 
     __slots__ = ()
     _fformat = ()
+    _fnames = ()
 
     def __repr__(self):
         return self._fformat % self
@@ -333,6 +397,7 @@ class ResultTuple(tuple):
         class _ResultTuple(cls):
             __slots__ = ()
             _fformat = fformat
+            _fnames = tuple(args)
             if args:
                 for i, a in enumerate(args):
                     if a is not None:
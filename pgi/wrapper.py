@@ -0,0 +1,107 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+"""Maps GObject instance pointers to their Python wrappers.
+
+Returning the same GObject twice gives the same wrapper as long as the
+first one is alive. Entries go away with the wrapper (weak values) or
+with the GObject (qdata destroy notify), so a new object at a reused
+address never gets an old wrapper.
+"""
+
+import ctypes
+import weakref
+import threading
+
+from .clib import gobject
+from .clib.gobject import GTypeClass, GDestroyNotify
+from .clib.glib import GQuark
+from .gtype import PGType, get_pytype
+
+
+# address -> wrapper
+_wrappers = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+_quark = GQuark.from_string(b"pgi-wrapper")
+
+
+def _keep_alive(obj):
+    # GObjects can get finalized at exit after this module was cleared,
+    # so the callbacks passed to C must never be freed
+    pythonapi = getattr(ctypes, "pythonapi", None)
+    if pythonapi is not None:
+        pythonapi.Py_IncRef(ctypes.py_object(obj))
+    return obj
+
+
+def _forget(address, _pop=_wrappers.pop):
+    # the GObject gets finalized, maybe after the module globals are cleared
+    _pop(address, None)
+
+
+_forget = _keep_alive(GDestroyNotify(_forget))
+
+
+_G_TYPE_OBJECT = 20 << 2
+
+# class -> if its instances are GObjects and can have qdata
+_is_gobject = {}
+
+
+def get_class_from_instance(pointer):
+    """Returns the Python class for a GTypeInstance pointer"""
+
+    g_class = ctypes.c_void_p.from_address(pointer).value
+    value = GTypeClass.from_address(g_class).g_type.value
+    pytype = get_pytype(value)
+    if not pytype:
+        raise RuntimeError(
+            "Couldn't find python type for %r" % PGType(value))
+    return pytype
+
+
+def _has_qdata(cls):
+    try:
+        return _is_gobject[cls]
+    except KeyError:
+        gtype = cls.__gtype__
+        result = gtype is not None and \
+            gtype.fundamental._type.value == _G_TYPE_OBJECT
+        return _is_gobject.setdefault(cls, result)
+
+
+def register_wrapper(obj):
+    """Makes obj the wrapper returned for its GObject. Returns the wrapper
+    which was registered before in case there is one.
+    """
+
+    if not _has_qdata(type(obj)):
+        return obj
+
+    address = obj._obj
+    with _lock:
+        existing = _wrappers.get(address)
+        if existing is not None:
+            return existing
+        if not gobject.get_qdata(address, _quark):
+            gobject.set_qdata_full(address, _quark, address, _forget)
+        _wrappers[address] = obj
+    return obj
+
+
+def get_wrapper(address):
+    """Returns the wrapper for a GTypeInstance address, creating one
+    if needed.
+    """
+
+    obj = _wrappers.get(address)
+    if obj is not None:
+        return obj
+
+    obj = object.__new__(get_class_from_instance(address))
+    obj._obj = address
+    return register_wrapper(obj)
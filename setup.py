@@ -207,6 +207,18 @@ class BenchmarkCommand(Command):
             else:
                 exit(benchmarks.run(is_gi, backend))
 
+        from benchmarks import startup
+        startup.run("ctypes")
+
+        from benchmarks import codegen
+        codegen.run("ctypes")
+
+        from benchmarks import checks
+        checks.run("ctypes")
+
+        from benchmarks import signals
+        signals.run("ctypes")
+
 
 setup(name='pgi',
       version='0.0.12',
@@ -240,6 +252,9 @@ setup(name='pgi',
         'Programming Language :: Python :: Implementation :: CPython',
         'Programming Language :: Python :: Implementation :: PyPy',
       ],
+      entry_points={
+            'console_scripts': ['pgi-compile = pgi.compiler:main'],
+      },
       cmdclass={
             'test': TestCommand,
             'coverage': CoverageCommand,
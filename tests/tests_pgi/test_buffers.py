@@ -0,0 +1,151 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import gc
+import array
+import ctypes
+import unittest
+
+import pgi
+from pgi.clib import glib
+from pgi.codegen.ctypes_backend.types_container import get_buffer_pointer, \
+    LazyPtrArray, pack_garray, unpack_garray, pack_ptr_array
+from pgi.repository import GLib
+
+
+class TBuffers(unittest.TestCase):
+
+    def tearDown(self):
+        pgi.set_array_return("list")
+
+    def test_get_buffer_pointer(self):
+        self.assertTrue(get_buffer_pointer([1, 2], ctypes.c_uint8) is None)
+        self.assertTrue(get_buffer_pointer(object(), ctypes.c_uint8) is None)
+        self.assertEqual(
+            get_buffer_pointer(b"abc", ctypes.c_uint8), (b"abc", 3))
+
+        data = bytearray(b"abc")
+        ptr, length = get_buffer_pointer(data, ctypes.c_uint8)
+        self.assertEqual(length, 3)
+        self.assertEqual(ctypes.string_at(ptr._obj, 3), b"abc")
+        # shares memory with the bytearray
+        data[0:1] = b"x"
+        self.assertEqual(ctypes.string_at(ptr._obj, 3), b"xbc")
+
+        ints = array.array("i", [1, 2, 3])
+        self.assertEqual(get_buffer_pointer(ints, ctypes.c_int)[1], 3)
+        self.assertTrue(get_buffer_pointer(ints, ctypes.c_uint8) is None)
+        self.assertTrue(get_buffer_pointer(ints, ctypes.c_float) is None)
+        floats = array.array("d", [1.0])
+        self.assertTrue(get_buffer_pointer(floats, ctypes.c_double))
+        self.assertTrue(get_buffer_pointer(floats, ctypes.c_int64) is None)
+
+        view = memoryview(b"abcd")[::2]
+        self.assertTrue(get_buffer_pointer(view, ctypes.c_uint8) is None)
+
+    def test_function(self):
+        md5 = GLib.ChecksumType.MD5
+        expected = GLib.compute_checksum_for_data(md5, [97, 98, 99])
+        for value in [b"abc", bytearray(b"abc"), memoryview(b"abc"),
+                      array.array("B", [97, 98, 99]), (97, 98, 99),
+                      memoryview(b"xaxbxc")[1::2]]:
+            self.assertEqual(
+                GLib.compute_checksum_for_data(md5, value), expected)
+
+        self.assertEqual(GLib.base64_encode(bytearray(b"abc")), "YWJj")
+
+    def test_array_return(self):
+        self.assertEqual(GLib.base64_decode("YWJj"), [97, 98, 99])
+
+        pgi.set_array_return("memoryview")
+        view = GLib.base64_decode("YWJj")
+        self.assertTrue(isinstance(view, memoryview))
+        self.assertTrue(view.readonly)
+        gc.collect()
+        self.assertEqual(bytes(view), b"abc")
+        self.assertEqual(bytes(GLib.base64_decode("")), b"")
+
+        pgi.set_array_return("array")
+        self.assertEqual(
+            GLib.base64_decode("YWJj"), array.array("B", b"abc"))
+
+        self.assertRaises(ValueError, pgi.set_array_return, "foo")
+
+    def test_byte_array(self):
+        array = GLib.ByteArray.new()
+        self.assertTrue(isinstance(array, memoryview))
+        self.assertEqual(bytes(array), b"")
+
+        array = GLib.ByteArray.new_take(bytearray(b"abc"))
+        self.assertTrue(array.readonly)
+        self.assertEqual(bytes(array), b"abc")
+
+        array = GLib.Bytes.new(b"xyz").unref_to_array()
+        gc.collect()
+        self.assertEqual(bytes(array), b"xyz")
+
+        for value in [b"foo", bytearray(b"foo"), [102, 111, 111]]:
+            bytes_ = GLib.ByteArray.free_to_bytes(value)
+            self.assertEqual(bytes(bytearray(bytes_.get_data())), b"foo")
+
+    def test_garray(self):
+        for value in [[1.5, 2.5], array.array("d", [1.5, 2.5])]:
+            garray = pack_garray(value, ctypes.c_double)
+            view = unpack_garray(
+                garray, glib.GArrayPtr, ctypes.c_double, True)
+            self.assertEqual(view.format, "d")
+            self.assertEqual(view.tolist(), [1.5, 2.5])
+
+    def test_garray_not_owned(self):
+        garray = pack_garray([1.5, 2.5], ctypes.c_double)
+        view = unpack_garray(garray, glib.GArrayPtr, ctypes.c_double, False)
+        items = (ctypes.c_double * 2).from_address(garray.contents.data)
+        items[0] = 4.5
+        more = (ctypes.c_double * 1000)()
+        garray.append_vals(more, 1000)
+        garray.unref()
+        gc.collect()
+        self.assertEqual(view.tolist(), [1.5, 2.5])
+
+    def test_pack_ptr_array(self):
+        array = pack_ptr_array(
+            [b"foo", b"bar"], glib.g_strdup, glib.g_free_ptr)
+        self.assertEqual(array.contents.len, 2)
+        self.assertEqual(
+            ctypes.c_char_p(array.contents.pdata[1]).value, b"bar")
+        seq = LazyPtrArray(
+            array, lambda ptr: ctypes.c_char_p(ptr).value, True)
+        self.assertEqual(seq, [b"foo", b"bar"])
+
+        def pack_item(item):
+            if item is None:
+                raise TypeError
+            return glib.g_strdup(item)
+
+        self.assertRaises(
+            TypeError, pack_ptr_array, [b"foo", None], pack_item,
+            glib.g_free_ptr)
+
+    def test_lazy_ptr_array(self):
+        array = glib.GPtrArray.sized_new(2)
+        array.add(1)
+        array.add(2)
+        calls = []
+
+        def unpack_item(ptr):
+            calls.append(ptr)
+            return ptr * 10
+
+        seq = LazyPtrArray(array, unpack_item, True)
+        self.assertEqual(len(seq), 2)
+        self.assertFalse(calls)
+        self.assertEqual(seq[-1], 20)
+        self.assertEqual(calls, [2])
+        self.assertEqual(seq, [10, 20])
+        self.assertEqual(seq[:1], [10])
+        self.assertEqual(calls, [2, 1])
+        self.assertRaises(IndexError, lambda: seq[2])
@@ -0,0 +1,65 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pgi.clib.gir import GIRepository
+from pgi.codegen.cache import FunctionCache
+from pgi.codegen import generate_function
+from pgi.repository import GLib
+
+
+class TFunctionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.info = GIRepository().find_by_name("GLib", "markup_escape_text")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_roundtrip(self):
+        cache = FunctionCache(self.dir)
+        func = generate_function(self.info)
+        cache.store(self.info, False, "ctypes", func)
+        cache.save()
+        self.assertTrue(os.listdir(self.dir))
+
+        cache = FunctionCache(self.dir)
+        self.assertTrue(cache.lookup(self.info, True, "ctypes") is None)
+        self.assertTrue(cache.lookup(self.info, False, "cffi") is None)
+        new = cache.lookup(self.info, False, "ctypes")
+        self.assertTrue(new is not func)
+        self.assertEqual(new.__doc__, func.__doc__)
+        self.assertEqual(new.__module__, "GLib")
+        self.assertEqual(new("<a>", -1), GLib.markup_escape_text("<a>", -1))
+        self.assertTrue("markup_escape_text" in str(new._code))
+
+    def test_error(self):
+        cache = FunctionCache(self.dir)
+        cache.store_error(self.info, False, "ctypes", "nope")
+        cache.save()
+
+        cache = FunctionCache(self.dir)
+        self.assertRaises(
+            NotImplementedError, cache.lookup, self.info, False, "ctypes")
+
+    def test_invalid_file(self):
+        cache = FunctionCache(self.dir)
+        func = generate_function(self.info)
+        cache.store(self.info, False, "ctypes", func)
+        cache.save()
+
+        for name in os.listdir(self.dir):
+            with open(os.path.join(self.dir, name), "wb") as h:
+                h.write(b"foo")
+
+        cache = FunctionCache(self.dir)
+        self.assertTrue(cache.lookup(self.info, False, "ctypes") is None)
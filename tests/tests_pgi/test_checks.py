@@ -0,0 +1,62 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import ctypes
+import unittest
+
+import pgi
+from pgi.clib.gir import GIRepository
+from pgi.codegen import generate_function
+from pgi.codegen.backend import get_checks
+from pgi.repository import Gio
+
+
+class TChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.info = GIRepository().find_by_name("GLib", "random_int_range")
+
+    def tearDown(self):
+        pgi.set_checks(True)
+        pgi.set_checks(True, "GLib")
+
+    def test_default(self):
+        func = generate_function(self.info)
+        self.assertTrue("OverflowError" in str(func._code))
+        self.assertRaises(TypeError, func, "foo", 2)
+
+    def test_disabled(self):
+        pgi.set_checks(False, "GLib")
+        self.assertFalse(get_checks("GLib"))
+        self.assertTrue(get_checks("Gio"))
+
+        func = generate_function(self.info)
+        self.assertFalse("OverflowError" in str(func._code))
+        self.assertEqual(func(3, 4), 3)
+        self.assertRaises(ctypes.ArgumentError, func, "foo", 2)
+
+    def test_namespace_overrides_default(self):
+        pgi.set_checks(False)
+        pgi.set_checks(True, "GLib")
+        self.assertTrue(get_checks("GLib"))
+        self.assertFalse(get_checks("Gio"))
+
+    def test_disabled_object(self):
+        pgi.set_checks(False)
+        info = GIRepository().find_by_name("Gio", "ActionMap")
+        func = generate_function(info.find_method(b"add_action"), True)
+        group = Gio.SimpleActionGroup()
+        self.assertRaises(TypeError, func, group, Gio.Menu())
+        func(group, Gio.SimpleAction(name="foo"))
+        self.assertTrue(group.has_action("foo"))
+
+    def test_disabled_struct(self):
+        pgi.set_checks(False)
+        info = GIRepository().find_by_name("Gio", "SimpleAction")
+        func = generate_function(info.find_method(b"new"), False)
+        self.assertRaises(TypeError, func, "foo", Gio.Menu())
+        self.assertEqual(func("foo", None).props.name, "foo")
@@ -0,0 +1,69 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from pgi.compiler import get_module_name, compile_namespace, \
+    load_compiled_module
+from pgi.codegen import cache
+from pgi.codegen.backend import list_backends, set_checks
+from pgi.clib.gir import GIRepository
+from pgi.repository import GLib
+
+
+class TCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        sys.path.insert(0, self.dir)
+        self.name = get_module_name("GLib", "2.0")
+
+    def tearDown(self):
+        sys.path.remove(self.dir)
+        sys.modules.pop(self.name, None)
+        set_checks(True, "GLib")
+        name = list_backends()[0].NAME
+        cache._compiled.pop(("GLib", name), None)
+        cache._compiled.pop(("GLib", name + "-nochecks"), None)
+        shutil.rmtree(self.dir)
+
+    def test_module_name(self):
+        self.assertEqual(get_module_name("Gtk", "3.0"), "_pgi_Gtk_3_0")
+
+    def test_missing(self):
+        self.assertFalse(load_compiled_module("GLib"))
+
+    def test_compile(self):
+        path = os.path.join(self.dir, self.name + ".py")
+        with open(path, "w") as h:
+            h.write(compile_namespace("GLib"))
+
+        self.assertTrue(load_compiled_module("GLib"))
+        info = GIRepository().find_by_name("GLib", "markup_escape_text")
+        func = cache.lookup_function(info, False, list_backends()[0].NAME)
+        self.assertEqual(func("<", -1), GLib.markup_escape_text("<", -1))
+
+    def test_outdated(self):
+        path = os.path.join(self.dir, self.name + ".py")
+        with open(path, "w") as h:
+            h.write("KEY = None\nENTRIES = {}\n")
+        self.assertFalse(load_compiled_module("GLib"))
+
+    def test_checks_mode(self):
+        set_checks(True, "GLib")
+        path = os.path.join(self.dir, self.name + ".py")
+        with open(path, "w") as h:
+            h.write(compile_namespace("GLib"))
+
+        set_checks(False, "GLib")
+        self.assertFalse(load_compiled_module("GLib"))
+        set_checks(True, "GLib")
+        self.assertTrue(load_compiled_module("GLib"))
@@ -0,0 +1,141 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import gc
+import unittest
+
+import pgi
+from pgi.clib import glib
+from pgi.clib.gir import GIRepository
+from pgi.codegen.backend import get_backend
+from pgi.codegen.ctypes_backend.types_container import LazyList
+from pgi.repository import GLib, Gio
+
+
+class THashTable(unittest.TestCase):
+
+    def _parse(self, params):
+        return GLib.uri_parse_params(
+            params, -1, "&", GLib.UriParamsFlags.NONE)
+
+    def test_unpack(self):
+        table = self._parse("a=1&b=2&c=%20x")
+        gc.collect()
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table["a"], "1")
+        self.assertEqual(table.get("c"), " x")
+        self.assertRaises(KeyError, lambda: table["d"])
+        self.assertFalse(42 in table)
+        self.assertEqual(sorted(table), ["a", "b", "c"])
+
+        expected = {"a": "1", "b": "2", "c": " x"}
+        self.assertEqual(table.to_dict(), expected)
+        self.assertEqual(dict(table), expected)
+        self.assertEqual(table, expected)
+
+    def test_empty(self):
+        table = self._parse("")
+        self.assertEqual(len(table), 0)
+        self.assertEqual(dict(table), {})
+
+    def test_unpack_not_owned(self):
+        info = GIRepository().find_by_name("GLib", "uri_parse_params")
+        backend = get_backend("ctypes")()
+        var = backend.get_type(info.get_return_type())
+        out = var.unpack("value", False)
+        block = backend.parse("""
+def unpack(value):
+    $block
+    return $out
+""", block=var.block, out=out)[0]
+        unpack = block.compile()["unpack"]
+
+        table = glib.GHashTable.new_full(
+            glib.g_str_hash, glib.g_str_equal, glib.g_free_ptr,
+            glib.g_free_ptr)
+        table.insert(glib.g_strdup(b"a"), glib.g_strdup(b"1"))
+        result = unpack(table)
+        table.unref()
+        self.assertEqual(type(result), dict)
+        self.assertEqual(result, {"a": "1"})
+
+    def test_pack(self):
+        self.assertEqual(GLib.hash_table_size({}), 0)
+        self.assertEqual(GLib.hash_table_size({1: 2, 3: 4}), 2)
+        self.assertTrue(GLib.hash_table_contains({1: 2, 3: 4}, 3))
+        self.assertFalse(GLib.hash_table_contains({1: 2}, 3))
+
+
+class TLists(unittest.TestCase):
+
+    def tearDown(self):
+        pgi.set_lazy_lists(False)
+
+    def test_eager(self):
+        types = Gio.content_types_get_registered()
+        self.assertTrue(isinstance(types, list))
+        self.assertTrue(types)
+
+    def test_lazy(self):
+        expected = Gio.content_types_get_registered()
+        pgi.set_lazy_lists(True)
+        types = Gio.content_types_get_registered()
+        self.assertTrue(isinstance(types, LazyList))
+        self.assertEqual(len(types), len(expected))
+        self.assertEqual(types[0], expected[0])
+        self.assertEqual(types[-1], expected[-1])
+        self.assertEqual(types, expected)
+
+    def test_lazy_gslist(self):
+        head = glib.GSListPtr()
+        for value in [3, 2, 1]:
+            head = head.prepend(value)
+        calls = []
+
+        def unpack_item(ptr):
+            calls.append(ptr)
+            return ptr * 10
+
+        seq = LazyList(head, unpack_item)
+        self.assertEqual(seq[1], 20)
+        self.assertEqual(calls, [2])
+        self.assertEqual(seq[1], 20)
+        self.assertEqual(calls, [2])
+        self.assertEqual(len(seq), 3)
+        self.assertEqual(list(seq), [10, 20, 30])
+        self.assertRaises(IndexError, lambda: seq[3])
+        self.assertEqual(seq[:-1], [10, 20])
+        del seq
+        gc.collect()
+
+    def test_lazy_free_items(self):
+        head = glib.GListPtr()
+        for value in [3, 2, 1]:
+            head = head.prepend(value)
+        freed = []
+
+        seq = LazyList(head, lambda ptr: ptr * 10, freed.append)
+        self.assertEqual(seq[1], 20)
+        del seq
+        gc.collect()
+        self.assertEqual(freed, [1, 3])
+
+    def test_lazy_objects(self):
+        expected = Gio.AppInfo.get_all()
+        pgi.set_lazy_lists(True)
+        infos = Gio.AppInfo.get_all()
+        self.assertTrue(isinstance(infos, LazyList))
+        self.assertEqual(len(infos), len(expected))
+        if infos:
+            self.assertTrue(infos[0].get_id())
+        del infos
+        gc.collect()
+
+    def test_empty(self):
+        seq = LazyList(glib.GListPtr(), None)
+        self.assertEqual(len(seq), 0)
+        self.assertEqual(list(seq), [])
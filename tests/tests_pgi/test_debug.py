@@ -7,9 +7,11 @@
 
 import unittest
 
-from pgi.debug import pprint
+from pgi.debug import pprint, stats, enable_stats, reset_stats
 from pgi._compat import StringIO
-from pgi.repository import Gtk
+from pgi.clib.gir import GIRepository
+from pgi.codegen import generate_function
+from pgi.repository import Gtk, GLib
 
 
 class TDebug(unittest.TestCase):
@@ -27,3 +29,23 @@ class TDebug(unittest.TestCase):
         pprint(Gtk.Window, file_)
         docstring = "Gtk.Window(type: Gtk.WindowType) -> Gtk.Window"
         self.assertTrue(docstring in file_.getvalue())
+
+    def test_stats(self):
+        info = GIRepository().find_by_name("GLib", "get_host_name")
+        generate_function(info)
+        self.assertFalse(stats().get("function"))
+
+        enable_stats()
+        try:
+            func = generate_function(info)
+        finally:
+            enable_stats(False)
+
+        entry = stats()["function"]["GLib"]
+        self.assertEqual(list(entry.values())[0]["count"], 1)
+        self.assertTrue(list(entry.values())[0]["time"] >= 0)
+        self.assertTrue("fallbacks" in stats())
+        self.assertEqual(func(), GLib.get_host_name())
+
+        reset_stats()
+        self.assertFalse(stats().get("function"))
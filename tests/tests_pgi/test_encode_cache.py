@@ -0,0 +1,82 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import unittest
+
+import pgi
+from pgi.clib.gir import GIRepository
+from pgi.codegen.funcgen import generate_function
+from pgi.debug import encode_cache_info, enable_stats
+from pgi.util import EncodeCache, encode_cache
+from pgi.repository import GLib
+
+
+class TEncodeCache(unittest.TestCase):
+
+    def test_cache(self):
+        cache = EncodeCache()
+        self.assertEqual(cache[u"\xe4"], b"\xc3\xa4")
+        self.assertEqual(cache[u"\xe4"], b"\xc3\xa4")
+        self.assertEqual(cache.info(), {"hits": 0, "misses": 1, "size": 1})
+
+        cache.set_counting(True)
+        cache[u"\xe4"]
+        self.assertEqual(cache.info()["hits"], 1)
+        cache.set_counting(False)
+        cache[u"\xe4"]
+        self.assertEqual(cache.info()["hits"], 1)
+
+        cache.reset()
+        self.assertEqual(cache.info(), {"hits": 0, "misses": 0, "size": 0})
+
+    def test_bounded(self):
+        cache = EncodeCache()
+        self.assertEqual(cache[u"x" * 100], b"x" * 100)
+        self.assertEqual(len(cache), 0)
+
+        for i in range(cache.MAX_SIZE + 1):
+            cache[str(i)]
+        self.assertTrue(len(cache) <= cache.MAX_SIZE)
+
+    def test_subclass(self):
+        class S(str):
+            pass
+
+        cache = EncodeCache()
+        self.assertEqual(cache[S(u"\xe4")], b"\xc3\xa4")
+        self.assertEqual(len(cache), 0)
+
+        GLib.setenv(S("PGI_TEST_SUBCLASS"), S("v"), True)
+        self.assertEqual(GLib.getenv("PGI_TEST_SUBCLASS"), "v")
+        GLib.unsetenv("PGI_TEST_SUBCLASS")
+
+    def test_no_checks(self):
+        class Text(object):
+            __hash__ = None
+
+            def encode(self, encoding):
+                return b"<"
+
+        info = GIRepository().find_by_name("GLib", "markup_escape_text")
+        pgi.set_checks(False, "GLib")
+        try:
+            func = generate_function(info)
+        finally:
+            pgi.set_checks(True, "GLib")
+        self.assertEqual(func(Text(), -1), "&lt;")
+        self.assertEqual(func(u"\xe4", -1), u"\xe4")
+
+    def test_generated(self):
+        enable_stats()
+        try:
+            for i in range(3):
+                GLib.markup_escape_text("<pgi-test>", -1)
+            info = encode_cache_info()
+        finally:
+            enable_stats(False)
+        self.assertTrue(info["hits"] >= 2)
+        self.assertEqual(encode_cache[u"<pgi-test>"], b"<pgi-test>")
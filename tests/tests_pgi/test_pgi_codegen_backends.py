@@ -98,6 +98,15 @@ class TBackendCFFI(_TBackend):
 class TBackendCTypes(_TBackend):
     Backend = CTypesBackend
 
+    def test_shared_prototype(self):
+        lib = self.backend.get_library("GLib")
+        block, h1 = self.backend.get_function(lib, "g_get_host_name", [], None)
+        block, h2 = self.backend.get_function(lib, "g_get_user_name", [], None)
+        self.assertTrue(type(h1) is type(h2))
+        self.assertEqual(h1.__name__, "g_get_host_name")
+        # the library attributes stay untouched
+        self.assertFalse("g_get_host_name" in vars(lib))
+
 
 class TNullBackend(unittest.TestCase):
 
@@ -0,0 +1,69 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import os
+import types
+import tempfile
+import unittest
+
+import pgi
+from pgi.codegen.profile import load_profile
+from pgi.repository import Gio, GLib
+
+
+class TProfile(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        pgi.record_profile(None)
+        os.remove(self.path)
+
+    def test_record(self):
+        pgi.record_profile(self.path)
+        GLib.utf8_strreverse("ab", -1)
+        Gio.SimpleAction(name="foo", enabled=False)
+        Gio.SimpleAction(name="bar", enabled=False)
+        pgi.record_profile(None)
+
+        records = load_profile(self.path)
+        self.assertTrue(
+            ("function", "GLib", "", "utf8_strreverse", "0") in records)
+        self.assertEqual(records.count(
+            ("constructor", "Gio", "SimpleAction", "name,enabled")), 1)
+
+    def test_merge(self):
+        with open(self.path, "w") as h:
+            h.write("# pgi profile 1\nfunction\tGio\tFile\tget_uri\t1\n")
+        pgi.record_profile(self.path)
+        GLib.utf8_strup("a", -1)
+        pgi.record_profile(None)
+
+        records = load_profile(self.path)
+        self.assertEqual(
+            records[0], ("function", "Gio", "File", "get_uri", "1"))
+        self.assertTrue(len(records) > 1)
+
+    def test_replay(self):
+        with open(self.path, "w") as h:
+            h.write("# pgi profile 1\n"
+                    "function\tGio\tFileInfo\tget_size\t1\n"
+                    "function\tGio\tFoobar\tget_size\t1\n"
+                    "constructor\tGio\tSimpleActionGroup\t\n")
+        pgi.replay_profile(self.path)
+        self.assertTrue(
+            isinstance(vars(Gio.FileInfo)["get_size"], types.FunctionType))
+        self.assertTrue(() in Gio.SimpleActionGroup._constructors)
+
+    def test_replay_background(self):
+        with open(self.path, "w") as h:
+            h.write("function\tGio\tFileInfo\tget_name\t1\n")
+        pgi.replay_profile(self.path, background=True).join()
+        self.assertTrue(
+            isinstance(vars(Gio.FileInfo)["get_name"], types.FunctionType))
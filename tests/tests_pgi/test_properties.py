@@ -0,0 +1,99 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import unittest
+
+from pgi.codegen import generate_property_getter
+from pgi.repository import Gio, GLib
+
+
+class TProperties(unittest.TestCase):
+
+    def test_basic(self):
+        action = Gio.SimpleAction(name="foo")
+        self.assertEqual(action.props.name, "foo")
+        self.assertTrue(action.props.enabled is True)
+        action.props.enabled = False
+        self.assertTrue(action.props.enabled is False)
+        self.assertTrue(action.props.state is None)
+
+    def test_not_writable(self):
+        action = Gio.SimpleAction(name="foo")
+        self.assertRaises(TypeError, setattr, action.props, "name", "bar")
+
+    def test_flags(self):
+        app = Gio.Application(application_id="org.example.Test")
+        app.props.flags = Gio.ApplicationFlags.NON_UNIQUE
+        self.assertEqual(app.props.flags, Gio.ApplicationFlags.NON_UNIQUE)
+        self.assertTrue(
+            isinstance(app.props.flags, Gio.ApplicationFlags))
+
+    def test_strv(self):
+        icon = Gio.ThemedIcon.new_from_names(["foo", "bar"])
+        self.assertEqual(icon.props.names, ["foo", "bar"])
+
+    def test_variant(self):
+        action = Gio.SimpleAction.new_stateful(
+            "foo", None, GLib.Variant.new_int32(3))
+        self.assertEqual(action.props.state.get_int32(), 3)
+        action.props.state = GLib.Variant.new_int32(5)
+        self.assertEqual(action.props.state.get_int32(), 5)
+        self.assertRaises(TypeError, setattr, action.props, "state", 5)
+
+    def test_boxed(self):
+        action = Gio.SimpleAction(
+            name="foo", parameter_type=GLib.VariantType.new("s"))
+        self.assertEqual(action.props.parameter_type.dup_string(), "s")
+
+    def test_invalid(self):
+        action = Gio.SimpleAction(name="foo")
+        self.assertRaises(
+            TypeError, setattr, action.props, "enabled", object())
+
+    def test_generate(self):
+        getter = generate_property_getter(
+            b"name", Gio.SimpleAction.props.name.value_type._type.value, "Gio")
+        action = Gio.SimpleAction(name="foo")
+        self.assertEqual(getter(action.props), "foo")
+
+    def test_get_properties(self):
+        action = Gio.SimpleAction(name="foo")
+        self.assertEqual(
+            action.get_properties("name", "enabled", "parameter-type"),
+            ("foo", True, None))
+        self.assertEqual(action.get_properties(), ())
+        self.assertRaises(TypeError, action.get_properties, "nope")
+
+    def test_set_properties(self):
+        action = Gio.SimpleAction.new_stateful(
+            "foo", None, GLib.Variant.new_int32(3))
+        notified = []
+        action.connect("notify", lambda o, spec: notified.append(spec.name))
+        action.set_properties(enabled=False, state=GLib.Variant.new_int32(5))
+        self.assertEqual(sorted(notified), ["enabled", "state"])
+        enabled, state = action.get_properties("enabled", "state")
+        self.assertTrue(enabled is False)
+        self.assertEqual(state.get_int32(), 5)
+
+    def test_set_properties_invalid(self):
+        action = Gio.SimpleAction.new_stateful(
+            "foo", None, GLib.Variant.new_int32(3))
+        self.assertRaises(TypeError, action.set_properties, name="bar")
+        self.assertRaises(TypeError, action.set_properties, nope=1)
+        self.assertRaises(
+            TypeError, action.set_properties,
+            state=GLib.Variant.new_int32(5), enabled=object())
+        self.assertEqual(action.props.state.get_int32(), 3)
+
+    def test_freeze_notify(self):
+        action = Gio.SimpleAction(name="foo")
+        notified = []
+        action.connect("notify", lambda o, spec: notified.append(spec.name))
+        with action.freeze_notify():
+            action.props.enabled = False
+            self.assertEqual(notified, [])
+        self.assertEqual(notified, ["enabled"])
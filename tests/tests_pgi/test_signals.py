@@ -0,0 +1,171 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import gc
+import ctypes
+import unittest
+import weakref
+
+from pgi.obj import get_signal_table
+from pgi.codegen import generate_signal_callback
+from pgi import closure
+from pgi.clib import gobject
+from pgi.repository import Gio, GLib, GObject
+
+
+class TSignalTable(unittest.TestCase):
+
+    def test_table(self):
+        Gio.Menu()
+        table = get_signal_table(Gio.Menu)
+        self.assertTrue(get_signal_table(Gio.Menu) is table)
+        self.assertFalse(get_signal_table(Gio.MenuModel) is table)
+
+        info, signal_id, detailed = table["items-changed"]
+        self.assertEqual(info.name, "items-changed")
+        self.assertTrue(signal_id)
+        self.assertFalse(detailed)
+        self.assertTrue(table["items_changed"] is table["items-changed"])
+        self.assertRaises(KeyError, table.__getitem__, "nope")
+
+        self.assertTrue(get_signal_table(Gio.SimpleAction)["notify"][2])
+
+    def test_interface(self):
+        Gio.ListStore.new(Gio.Menu.__gtype__)
+        info = get_signal_table(Gio.ListStore)["items-changed"][0]
+        self.assertEqual(info.get_container().name, "ListModel")
+
+    def test_no_info(self):
+        # a signal only known to the type system
+        signal_newv = gobject._gobject["g_signal_newv"]
+        signal_newv.argtypes = [
+            ctypes.c_char_p, gobject.GType, ctypes.c_int, ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, gobject.GType,
+            ctypes.c_uint, ctypes.POINTER(gobject.GType)]
+        signal_newv.restype = ctypes.c_uint
+        gtype = Gio.SimpleActionGroup.__gtype__._type
+        int_type = GObject.TYPE_INT._type
+        params = (gobject.GType * 2)(GObject.TYPE_VARIANT._type, int_type)
+        self.assertTrue(signal_newv(
+            b"pgi-test-no-info", gtype, gobject.GSignalFlags.RUN_LAST,
+            None, None, None, None, int_type, 2, params))
+
+        group = Gio.SimpleActionGroup()
+        info, signal_id, detailed = \
+            get_signal_table(Gio.SimpleActionGroup)["pgi_test_no_info"]
+        self.assertTrue(info is None)
+
+        calls = []
+
+        def handler(instance, variant, value):
+            calls.append((instance, variant.get_int32(), value))
+            return value * 2
+
+        group.connect("pgi-test-no-info", handler)
+        result = group.emit(
+            "pgi-test-no-info", GLib.Variant.new_int32(3), 21)
+        self.assertEqual(result, 42)
+        self.assertEqual(calls, [(group, 3, 21)])
+
+    def test_connect(self):
+        menu = Gio.Menu()
+        called = []
+        menu.connect("items_changed", lambda *args: called.append(args[1:]))
+        menu.append("foo", None)
+        self.assertEqual(called, [(0, 0, 1)])
+
+    def test_connect_detail(self):
+        action = Gio.SimpleAction(name="foo")
+        called = []
+        action.connect("notify::enabled", lambda *args: called.append(1))
+        action.connect("notify::name", lambda *args: called.append(2))
+        action.set_enabled(False)
+        self.assertEqual(called, [1])
+
+        self.assertRaises(TypeError, action.connect, "activate::x", print)
+        self.assertRaises(TypeError, action.connect, "notify::", print)
+        self.assertRaises(TypeError, action.connect, "nope", print)
+
+    def test_callback_cached(self):
+        info = get_signal_table(Gio.Menu)["items-changed"][0]
+        func = generate_signal_callback(info)
+        self.assertTrue(generate_signal_callback(info) is func)
+        self.assertTrue(func(lambda *args: None))
+
+    def test_disconnect(self):
+        menu = Gio.Menu()
+        gc.collect()
+        before = set(closure._handlers)
+        ids = [menu.connect("items-changed", lambda *x: None)
+               for i in range(10)]
+        # closures of other tests can get finalized meanwhile, so only
+        # look at ours
+        ours = set(closure._handlers) - before
+        self.assertEqual(len(ours), 10)
+
+        def alive():
+            return len(ours.intersection(closure._handlers))
+
+        for id_ in ids[:5]:
+            menu.disconnect(id_)
+        menu.disconnect(ids[0])
+        self.assertEqual(alive(), 5)
+
+        ref = weakref.ref(menu)
+        del menu
+        gc.collect()
+        self.assertTrue(ref() is None)
+        self.assertEqual(alive(), 0)
+
+    def test_return_value(self):
+        app = Gio.Application(
+            application_id="org.example.Test",
+            flags=Gio.ApplicationFlags.NON_UNIQUE)
+        called = []
+
+        def handler(app, options, data):
+            called.append(data)
+            return 3
+
+        app.connect("handle-local-options", handler, 42)
+        self.assertEqual(app.run([]), 3)
+        self.assertEqual(called, [42])
+
+    def test_emit(self):
+        menu = Gio.Menu()
+        called = []
+        menu.connect("items-changed", lambda *args: called.append(args[1:]))
+        self.assertTrue(menu.emit("items_changed", 1, 2, 3) is None)
+        self.assertEqual(called, [(1, 2, 3)])
+
+        self.assertRaises(TypeError, menu.emit, "items-changed", 1)
+        self.assertRaises(TypeError, menu.emit, "nope")
+
+    def test_emit_detail(self):
+        action = Gio.SimpleAction(name="foo")
+        called = []
+        action.connect("notify::enabled", lambda *args: called.append(1))
+        action.connect("notify::name", lambda *args: called.append(2))
+        action.emit("notify::name", None)
+        self.assertEqual(called, [2])
+        self.assertRaises(TypeError, action.emit, "notify::name", 42)
+
+    def test_emit_variant(self):
+        action = Gio.SimpleAction(name="foo")
+        called = []
+        action.connect("activate", lambda action, value: called.append(1))
+        self.assertRaises(TypeError, action.emit, "activate", 42)
+        action.emit("activate", None)
+        self.assertEqual(called, [1])
+
+    def test_emit_return(self):
+        app = Gio.Application(
+            application_id="org.example.Test",
+            flags=Gio.ApplicationFlags.NON_UNIQUE)
+        options = GLib.VariantDict.new(None)
+        app.connect("handle-local-options", lambda *args: 5)
+        self.assertEqual(app.emit("handle-local-options", options), 5)
@@ -0,0 +1,69 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import unittest
+
+from pgi.clib.gir import GIRepository
+from pgi.codegen.funcgen import _generate_function
+from pgi.codegen.templates import TemplateCache, get_signature_key
+from pgi.codegen.ctypes_backend import CTypesBackend
+from pgi.repository import GLib
+
+
+def get_infos(info):
+    arg_infos = list(info.get_args())
+    arg_types = [a.get_type() for a in arg_infos]
+    return info, arg_infos, arg_types, info.get_return_type(), False
+
+
+class TTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        repo = GIRepository()
+        self.user = get_infos(repo.find_by_name("GLib", "get_user_name"))
+        self.real = get_infos(repo.find_by_name("GLib", "get_real_name"))
+        self.escape = get_infos(
+            repo.find_by_name("GLib", "markup_escape_text"))
+
+    def generate(self, cache, infos):
+        return cache.generate(_generate_function, CTypesBackend(), *infos)
+
+    def test_key(self):
+        self.assertEqual(get_signature_key(*self.user)[0],
+                         get_signature_key(*self.real)[0])
+        self.assertNotEqual(get_signature_key(*self.user)[0],
+                            get_signature_key(*self.escape)[0])
+
+    def test_shared(self):
+        cache = TemplateCache()
+        user = self.generate(cache, self.user)
+        real = self.generate(cache, self.real)
+        self.assertEqual(cache.info(), {
+            "hits": 1, "misses": 1, "templates": 1, "unsupported": 0})
+
+        self.assertEqual(user.__name__, "get_user_name")
+        self.assertEqual(real.__name__, "get_real_name")
+        self.assertEqual(user(), GLib.get_user_name())
+        self.assertEqual(real(), GLib.get_real_name())
+        self.assertTrue(real.__doc__.startswith("get_real_name()"))
+        self.assertTrue("get_real_name" in str(real._code))
+
+        cache.clear()
+        self.assertEqual(cache.info()["templates"], 0)
+
+    def test_arg_names(self):
+        cache = TemplateCache()
+        escape = self.generate(cache, self.escape)
+        self.assertEqual(escape(text="<", length=-1), "&lt;")
+        self.assertEqual(escape.__code__.co_varnames[:2], ("text", "length"))
+        self.assertTrue("text: str" in escape.__doc__)
+        try:
+            escape(None, -1)
+        except TypeError as e:
+            self.assertTrue("markup_escape_text() argument 'text'" in str(e))
+        else:
+            self.fail()
@@ -0,0 +1,59 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import types
+import unittest
+
+import pgi
+from pgi.obj import MethodAttribute
+from pgi.codegen import generate_functions
+from pgi.clib.gir import GIRepository
+from pgi.repository import Gio, GLib
+
+
+class TWarmup(unittest.TestCase):
+
+    def test_class(self):
+        pgi.warmup(Gio.SimpleAction)
+        for base in Gio.SimpleAction.__mro__:
+            for name, attr in vars(base).items():
+                self.assertFalse(isinstance(attr, MethodAttribute), name)
+
+        self.assertTrue(isinstance(
+            vars(Gio.SimpleAction)["set_enabled"], types.FunctionType))
+        self.assertTrue(isinstance(
+            vars(Gio.SimpleAction)["new"], staticmethod))
+        self.assertTrue(Gio.SimpleAction.new._is_static)
+
+        action = Gio.SimpleAction.new("foo", None)
+        self.assertEqual(action.get_name(), "foo")
+        action.set_enabled(False)
+        self.assertFalse(action.get_enabled())
+
+    def test_no_class(self):
+        self.assertRaises(TypeError, pgi.warmup, Gio)
+
+    def test_background(self):
+        pgi.require_version("GModule", "2.0")
+        thread = pgi.start_warmup(["GModule"], [Gio.SimpleActionGroup])
+        thread.join()
+        self.assertTrue(isinstance(
+            vars(Gio.SimpleActionGroup)["lookup"], types.FunctionType))
+
+        from pgi.repository import GModule
+        self.assertTrue(isinstance(
+            vars(GModule.Module)["name"], types.FunctionType))
+
+    def test_generate_functions(self):
+        repo = GIRepository()
+        names = ["markup_escape_text", "get_user_name", "get_real_name"]
+        infos = [(repo.find_by_name("GLib", n), False) for n in names]
+        escape, user, real = generate_functions(infos)
+        self.assertEqual(escape("<", -1), "&lt;")
+        self.assertEqual(user(), GLib.get_user_name())
+        self.assertEqual(real.__name__, "get_real_name")
+        self.assertTrue(real.__doc__.startswith("get_real_name()"))
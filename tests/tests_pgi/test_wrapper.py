@@ -0,0 +1,51 @@
+# Copyright 2016 Christoph Reiter
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+
+import gc
+import unittest
+
+from pgi import wrapper
+from pgi.gtype import get_pytype
+from pgi.repository import Gio
+
+
+class TWrapper(unittest.TestCase):
+
+    def test_identity(self):
+        group = Gio.SimpleActionGroup()
+        action = Gio.SimpleAction(name="foo")
+        group.insert(action)
+        self.assertTrue(group.lookup("foo") is action)
+        self.assertTrue(group.lookup("foo") is group.lookup("foo"))
+
+    def test_new_wrapper(self):
+        group = Gio.SimpleActionGroup()
+        group.insert(Gio.SimpleAction(name="foo"))
+        gc.collect()
+        action = group.lookup("foo")
+        self.assertTrue(isinstance(action, Gio.SimpleAction))
+        self.assertEqual(action.get_name(), "foo")
+        self.assertTrue(group.lookup("foo") is action)
+
+    def test_forget(self):
+        action = Gio.SimpleAction(name="foo")
+        address = action._obj
+        self.assertTrue(wrapper._wrappers.get(address) is action)
+        del action
+        gc.collect()
+        self.assertFalse(address in wrapper._wrappers)
+
+    def test_class_table(self):
+        # not in the typelib
+        file_ = Gio.File.new_for_path("/")
+        cls = type(file_)
+        self.assertTrue(get_pytype(cls.__gtype__._type.value) is cls)
+        self.assertTrue(issubclass(cls, Gio.File))
+
+        # overrides replace the introspected class
+        value = Gio.MenuItem.__gtype__._type.value
+        self.assertTrue(get_pytype(value) is Gio.MenuItem)